@@ -5,7 +5,12 @@ Streamlit Web Uygulaması - Ana Dosya
 
 import streamlit as st
 import pandas as pd
-from data_processor import EnergyDataProcessor
+from config import Config
+from database import MaterializedRollups
+from data_processor import FEE_DETAIL_COLUMNS, EnergyDataProcessor, build_monthly_cube, build_term_table
+from duckdb_analytics import DUCKDB_AVAILABLE, SnapshotAnalytics
+from instrumentation import profile_frame, read_last_run
+from snapshot import SnapshotStore
 from predictor import EnergyPredictor
 from visualizer import EnergyVisualizer
 import warnings
@@ -42,27 +47,181 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
-@st.cache_data
-def load_and_process_data():
+@st.cache_resource
+def get_data_processor():
     """
-    Verileri veritabanından yükle ve işle (cache'lenir, tekrar yüklemeyi önler)
+    Veri işleyiciyi oluştur ve ilk yüklemeyi yap (tüm oturumlarda tek instance).
+    Yenilemede sadece yeni kayıtlar yüklenebilsin diye işleyici cache'te tutulur.
     """
     processor = EnergyDataProcessor()
+    processor.load_and_process()
+    loaded_processor()['processor'] = processor
+    return processor
+
 
-    if processor.load_data():
-        processor.clean_and_prepare()
-        processor.merge_data()
-        return processor.get_processed_data()
-    return None
+@st.cache_resource
+def loaded_processor():
+    """
+    Bu süreçte yüklenmiş işleyiciyi tutan kap (süreç boyunca kalır).
+    Uygulama betiği her çalıştırmada baştan yürütüldüğü için modül değişkeni kullanılamaz;
+    işleyicinin kurulup kurulmadığını yüklemeyi tetiklemeden öğrenmek için kullanılır.
+    """
+    return {}
 
 
 @st.cache_resource
-def train_prediction_model(df):
+def get_shared_dataset():
+    """
+    Paylaşılan veri dosyasını süreç başında bir kez doğrula.
+    Dosya yoksa ya da kaynak tablolar değiştiyse bu süreç veriyi yükleyip yeniden yayınlar.
+    """
+    if not Config.SHARED_DATASET_ENABLED:
+        return None
+
+    processor = EnergyDataProcessor()
+    if processor.shared_dataset is None or not processor.shared_dataset.available:
+        return None
+
+    if not processor.is_shared_dataset_current():
+        get_data_processor()
+    return processor.shared_dataset
+
+
+@st.cache_resource(max_entries=2)
+def open_shared_dataset(version):
+    """
+    Paylaşılan veri dosyasını memory-map ile aç (sürüm başına bir kez, kopyalamadan).
+    Başka bir süreç veriyi yenilediğinde sürüm değişir ve yeni dosya açılır.
+    """
+    dataset = get_shared_dataset()
+    df = dataset.read() if dataset is not None else None
+    if df is None or df.empty:
+        return None
+    return df
+
+
+@st.cache_resource(max_entries=4)
+def derive_shared_stage(version, name):
+    """
+    Paylaşılan veriden term tablosunu veya aylık küpü oluştur (sürüm başına bir kez).
+    Sadece gereken sütunların sayfaları okunur.
+    """
+    df = open_shared_dataset(version)
+    if df is None:
+        return None
+    return build_term_table(df) if name == 'term_table' else build_monthly_cube(df)
+
+
+@st.cache_resource(max_entries=2)
+def open_analytics(version):
+    """
+    Snapshot'taki tabloları DuckDB ile bağla (snapshot sürümü başına bir kez).
+    Yenilemeden sonra yeni snapshot sürümü yazılır ve yeni sürüm açılır.
+    """
+    analytics = SnapshotAnalytics()
+    return analytics if analytics.open() else None
+
+
+@st.cache_resource
+def open_rollups():
+    """
+    PostgreSQL materialized view'larını oluştur/yenile ve aç (süreç başına bir kez).
+    Kaynak tablolar değiştiyse view'lar açılırken yenilenir; sonrası "Verileri Yenile" ile.
+    """
+    rollups = MaterializedRollups()
+    return rollups if rollups.open() else None
+
+
+def get_analytics():
+    """
+    Config.ANALYTICS_ENGINE 'duckdb' ise güncel snapshot'ın analitik motorunu,
+    'postgres' ise materialized view'ları döndür (ham veri yüklenmez)
+
+    Returns:
+        SnapshotAnalytics, MaterializedRollups veya None (kapalı, motor yok ya da veri yok)
+    """
+    if Config.ANALYTICS_ENGINE == 'postgres':
+        return open_rollups()
+
+    if Config.ANALYTICS_ENGINE != 'duckdb' or not DUCKDB_AVAILABLE or not Config.SNAPSHOT_ENABLED:
+        return None
+
+    # Snapshot'ın kaynak tablolarla güncel olduğundan emin ol (gerekirse veri yüklenir)
+    if get_shared_dataset() is None:
+        get_data_processor()
+
+    meta = SnapshotStore().read_meta()
+    return open_analytics(meta['version']) if meta is not None else None
+
+
+@st.cache_resource(max_entries=6)
+def derive_analytics_stage(version, name):
+    """
+    DuckDB ile aylık küpü, term tablosunu veya tarife maliyetlerini hesapla
+    ya da materialized view'lardan oku (sürüm başına bir kez)
+    """
+    analytics = open_rollups() if Config.ANALYTICS_ENGINE == 'postgres' else open_analytics(version)
+    if analytics is None:
+        return None
+    value = getattr(analytics, name)()
+    return None if value.empty else value
+
+
+@st.cache_data
+def load_processed_stage(name):
+    """
+    İşleyiciden bir veri aşamasını al (cache'lenir, tekrar yüklemeyi önler).
+    Snapshot güncelse sadece istenen aşamanın dosyası okunur. Out-of-core modda
+    fee seviyesindeki veri diskten sadece sayfaların kullandığı sütunlarla okunur.
+
+    Returns:
+        Aşama veya None (veri yok)
+    """
+    processor = get_data_processor()
+    getters = {
+        'joined': (lambda: processor.get_fee_detail(FEE_DETAIL_COLUMNS)) if processor.out_of_core
+        else processor.get_processed_data,
+        'term_table': processor.get_term_table,
+        'monthly_cube': processor.get_monthly_cube,
+    }
+    value = getters[name]()
+    return None if value.empty else value
+
+
+def load_stage(name):
+    """
+    Sayfanın ihtiyaç duyduğu veri aşamasını döndür:
+    'joined' (fee seviyesi veri), 'term_table' (her term için tek satır) veya
+    'monthly_cube' (aylık küp). Config.ANALYTICS_ENGINE 'duckdb' ise küp ve term tablosu
+    snapshot tablolarından DuckDB ile hesaplanır, 'postgres' ise materialized view'lardan
+    okunur; değilse paylaşılan veriden, o da yoksa işleyiciden alınır.
+    st.cache_data her çağrıda kopya ürettiği için paylaşılan veri cache_resource ile tutulur.
+
+    Returns:
+        Aşama veya None (veri yok)
+    """
+    analytics = get_analytics() if name != 'joined' else None
+    if analytics is not None:
+        return derive_analytics_stage(analytics.version, name)
+
+    dataset = get_shared_dataset()
+    version = dataset.version() if dataset is not None else None
+    if version is None:
+        return load_processed_stage(name)
+
+    if name == 'joined':
+        return open_shared_dataset(version)
+    return derive_shared_stage(version, name)
+
+
+@st.cache_resource
+def train_prediction_model(df, df_terms, _cube):
     """
 ML modelini eğit (cache'lenir, tekrar eğitmeyi önler)
+Küp df'ten türetildiği için cache anahtarına katılmaz (_ önekli parametre).
     """
     predictor = EnergyPredictor()
-    metrics = predictor.train_models(df)
+    metrics = predictor.train_models(df, df_terms, _cube)
     return predictor, metrics
 
 
@@ -82,11 +241,11 @@ def main():
         label_visibility="collapsed"  # "Menü" yazısını gizle
     )
     
-    # Veri yükleme durumu
+    # Veri yükleme durumu (sayfalar fee seviyesi veriyi ve term tablosunu ihtiyaç duyunca ister)
     with st.spinner('📂 Veriler yükleniyor...'):
-        df = load_and_process_data()
+        cube = load_stage('monthly_cube')
     
-    if df is None:
+    if cube is None:
         st.error("❌ Veri yüklenemedi!")
         st.warning("""
         🗄️ **Veritabanı Bağlantısı**
@@ -117,7 +276,7 @@ def main():
         """)
         
         # Özet metrikler
-        metrics = visualizer.create_summary_metrics(df)
+        metrics = visualizer.create_summary_metrics(cube)
         
         st.subheader("📊 Genel Özet")
         
@@ -172,11 +331,11 @@ def main():
         col1, col2 = st.columns(2)
         
         with col1:
-            fig_trend = visualizer.plot_consumption_trend(df)
+            fig_trend = visualizer.plot_consumption_trend(cube)
             st.plotly_chart(fig_trend, width='stretch')
 
         with col2:
-            fig_yearly = visualizer.plot_yearly_comparison(df)
+            fig_yearly = visualizer.plot_yearly_comparison(cube)
             st.plotly_chart(fig_yearly, width='stretch')
     
     # ========================
@@ -187,12 +346,12 @@ def main():
         
         # Tüketim trendi
         st.subheader("Tüketim Trendi (Aylık Veriler)")
-        fig_trend = visualizer.plot_consumption_trend(df)
+        fig_trend = visualizer.plot_consumption_trend(cube)
         st.plotly_chart(fig_trend, width='stretch')
 
         # Mevsimsel Analiz
         st.subheader("Mevsimsel Analiz")
-        fig_seasonal = visualizer.plot_seasonal_analysis(df)
+        fig_seasonal = visualizer.plot_seasonal_analysis(load_stage('term_table'))
         st.plotly_chart(fig_seasonal, width='stretch')
     
     # ========================
@@ -203,27 +362,22 @@ def main():
         
         # Maliyet grafiği
         st.subheader("Aylık Maliyet Trendi")
-        fig_cost = visualizer.plot_cost_analysis(df)
+        fig_cost = visualizer.plot_cost_analysis(cube)
         st.plotly_chart(fig_cost, width='stretch')
 
         # Yıllık karşılaştırma
         st.subheader("Yıllık Karşılaştırma")
-        fig_yearly = visualizer.plot_yearly_comparison(df)
+        fig_yearly = visualizer.plot_yearly_comparison(cube)
         st.plotly_chart(fig_yearly, width='stretch')
         
         # Maliyet özeti tablosu
         st.subheader("📊 Yıllık Maliyet Özeti")
 
-        # Unique term bazında hesaplama
-        df_unique = df.drop_duplicates(subset=['accrual_term_id'])
-
-        # term_total_cost varsa onu kullan
-        cost_column = 'term_total_cost' if 'term_total_cost' in df_unique.columns else 'amount'
-
-        yearly_cost = df_unique.groupby('year').agg({
-            cost_column: 'sum',
-            'total_consumption': 'sum'
-        }).reset_index()
+        # Yıllık toplamlar aylık küpten (her term bir kez sayılır)
+        yearly_cost = cube.by_year().rename(
+            columns={'consumption': 'total_consumption', 'cost': 'term_total_cost'}
+        )
+        cost_column = 'term_total_cost'
 
         # Birim fiyat hesapla (TL/kWh) - sıfıra bölmeyi ve NaN'i önle, 2 ondalık yuvarlama
         yearly_cost['unit_price'] = yearly_cost.apply(
@@ -310,7 +464,15 @@ def main():
         """)
 
         # Tarife kategorileri pasta grafiği
-        fig_pie = visualizer.plot_tariff_categories_pie(df)
+        # (DuckDB açıksa kategori maliyetleri tablolardan hesaplanır, değilse term tablosundan;
+        # fee seviyesi veri yüklenmez)
+        analytics = get_analytics()
+        if analytics is not None:
+            fig_pie = visualizer.plot_tariff_categories_pie(
+                category_costs=derive_analytics_stage(analytics.version, 'tariff_costs')
+            )
+        else:
+            fig_pie = visualizer.plot_tariff_categories_pie(load_stage('term_table'))
         st.plotly_chart(fig_pie, width='stretch')
 
     # ========================
@@ -321,7 +483,9 @@ def main():
 
         # Model eğitimi
         with st.spinner('🤖 Machine Learning modeli eğitiliyor... Bu birkaç saniye sürebilir.'):
-            predictor, metrics = train_prediction_model(df)
+            predictor, metrics = train_prediction_model(
+                load_stage('joined'), load_stage('term_table'), cube
+            )
 
         # Eğitim hatası kontrolü
         if metrics and 'error' in metrics:
@@ -430,16 +594,11 @@ def main():
         if report_type == "Aylık Detay Raporu":
             st.subheader("📅 Aylık Detay Raporu")
 
-            # Unique term bazında hesaplama
-            df_unique = df.drop_duplicates(subset=['accrual_term_id'])
-
-            # term_total_cost varsa onu kullan
-            cost_column = 'term_total_cost' if 'term_total_cost' in df_unique.columns else 'amount'
-
-            monthly_detail = df_unique.groupby(['year', 'month']).agg({
-                'total_consumption': 'sum',
-                cost_column: 'sum'
-            }).reset_index()
+            # Yıl-ay toplamları aylık küpten (her term bir kez sayılır)
+            monthly_detail = cube.by_month().rename(
+                columns={'consumption': 'total_consumption', 'cost': 'term_total_cost'}
+            )
+            cost_column = 'term_total_cost'
 
             # Tarih sütunu oluştur (YYYY-MM formatında)
             monthly_detail['Tarih'] = monthly_detail.apply(
@@ -574,8 +733,8 @@ def main():
         elif report_type == "Yıllık Özet Raporu":
             st.subheader("📊 Yıllık Özet Raporu")
 
-            # Unique term bazında hesaplama
-            df_unique = df.drop_duplicates(subset=['accrual_term_id'])
+            # Ortalama/min/max term bazında olduğu için term tablosu kullanılır
+            df_unique = load_stage('term_table')
 
             # term_total_cost varsa onu kullan
             cost_column = 'term_total_cost' if 'term_total_cost' in df_unique.columns else 'amount'
@@ -606,12 +765,58 @@ def main():
     # Veri Yenileme Butonu
     st.sidebar.markdown("---")
     if st.sidebar.button("🔄 Verileri Yenile", width='stretch'):
-        # Cache'leri temizle
+        # Sadece yeni/değişen kayıtları yükle, sonra türetilmiş cache'leri temizle
+        # (paylaşılan veri yeniden yayınlanır, diğer süreçler yeni sürümü kendiliğinden açar)
+        with st.spinner('🔄 Yeni kayıtlar yükleniyor...'):
+            refreshed = get_data_processor().refresh_data()
+            # Materialized view'lar kaynak tablolar değiştiyse yenilenir (yeni sürüm = yeni cache anahtarı)
+            if Config.ANALYTICS_ENGINE == 'postgres':
+                rollups = open_rollups()
+                if rollups is None:
+                    open_rollups.clear()  # açılamamıştı, bir sonraki çalıştırmada tekrar denenir
+                else:
+                    refreshed = rollups.open() and refreshed
         st.cache_data.clear()
-        st.cache_resource.clear()
-        st.success("✅ Veriler yenilendi! Sayfa yeniden yükleniyor...")
+        train_prediction_model.clear()
+        if refreshed:
+            st.success("✅ Veriler yenilendi! Sayfa yeniden yükleniyor...")
+        else:
+            st.error("❌ Veriler yenilenemedi!")
         st.rerun()
 
+    # Yükleme penceresi: varsayılan olarak son LOAD_WINDOW_YEARS yıl yüklenir,
+    # daha eski yıllar sadece istendiğinde (eksik aralık okunup mevcut veriye eklenir)
+    if Config.LOAD_WINDOW_YEARS > 0:
+        with st.sidebar.expander("📅 Veri Dönemi"):
+            first_year = pd.Timestamp.now().year - Config.LOAD_WINDOW_YEARS + 1
+            st.caption(f"Varsayılan olarak {first_year} ve sonrası yüklenir.")
+            options = ["Tüm geçmiş"] + [str(year) for year in range(first_year - 1, first_year - 11, -1)]
+            choice = st.selectbox("Başlangıç yılı", options, index=1)
+            if st.button("⏪ Eski Yılları Yükle", width='stretch'):
+                start = None if choice == "Tüm geçmiş" else pd.Timestamp(year=int(choice), month=1, day=1)
+                with st.spinner('⏪ Eski yıllar yükleniyor...'):
+                    loaded = get_data_processor().load_window(start)
+                st.cache_data.clear()
+                train_prediction_model.clear()
+                if not loaded:
+                    st.error("❌ Eski yıllar yüklenemedi!")
+                st.rerun()
+
+    # Son yükleme/yenilemenin aşama ölçümleri
+    # (bu süreç yükleme yapmadıysa, paylaşılan veriyi yayınlayan sürecin log kayıtları gösterilir)
+    if Config.PROFILE_ENABLED:
+        with st.sidebar.expander("⏱️ İşlem Süreleri"):
+            # İşleyici sadece ölçüm göstermek için yüklenmez: bu süreçte kurulmadıysa
+            # log'daki son çalıştırma (paylaşılan veriyi yayınlayan süreç) gösterilir
+            processor = loaded_processor().get('processor')
+            records = (processor.profiler.last_run() if processor is not None else None) or read_last_run()
+            if records:
+                st.caption(f"Son çalıştırma: {records[0]['started_at']} "
+                           f"(bellek: {records[0]['memory_mode']})")
+                st.dataframe(profile_frame(records), hide_index=True, width='stretch')
+            else:
+                st.caption("Henüz ölçüm yok.")
+
     # Footer - Minimal
     st.sidebar.markdown("---")
     st.sidebar.markdown("""
@@ -0,0 +1,527 @@
+"""
+Performans Karşılaştırma Modülü
+Veri yükleme ve işleme yollarını aynı veri üzerinde karşılaştırır.
+
+Kullanım:
+    python benchmark.py loaders [--repeat 3] [--loaders read_sql,stream,copy]
+    python benchmark.py dates [--rows 1000000] [--unique 20000] [--repeat 3]
+    python benchmark.py backends [--accruals 20000] [--repeat 3]
+    python benchmark.py aggregates [--accruals 20000] [--repeat 3]
+    python benchmark.py shards [--accruals 20000] [--shards 2,4] [--repeat 3]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config import Config
+
+
+def measure(func: Callable, repeat: int = 1) -> Tuple[float, float, object]:
+    """
+    Bir fonksiyonun en iyi süresini ve bellek tepe değerini ölç.
+    tracemalloc süreyi etkilediği için bellek ayrı bir çalıştırmada ölçülür.
+
+    Args:
+        func: Ölçülecek fonksiyon (argümansız)
+        repeat: Süre için tekrar sayısı (en iyi süre raporlanır)
+
+    Returns:
+        (En iyi süre (sn), tracemalloc tepe belleği (MB), son çalıştırmanın sonucu)
+    """
+    best = float('inf')
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        result = func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return best, peak / 1024 / 1024, result
+
+
+def frame_memory_mb(df: pd.DataFrame) -> float:
+    """DataFrame'in derin bellek kullanımı (MB)."""
+    return df.memory_usage(deep=True).sum() / 1024 / 1024
+
+
+def print_table(rows: List[Dict], columns: List[str]):
+    """Sonuçları hizalı tablo olarak yazdır."""
+    if not rows:
+        print("  (sonuc yok)")
+        return
+
+    widths = {col: max(len(col), *(len(str(row[col])) for row in rows)) for col in columns}
+    print("  " + "  ".join(col.ljust(widths[col]) for col in columns))
+    print("  " + "  ".join("-" * widths[col] for col in columns))
+    for row in rows:
+        print("  " + "  ".join(str(row[col]).ljust(widths[col]) for col in columns))
+
+
+def benchmark_loaders(loaders: List[str], repeat: int):
+    """
+    Tablo okuma yöntemlerini (read_sql, stream, copy) aynı tablolarda karşılaştır.
+    Her yöntemin sonucu ilk yöntemin sonucuyla (değerler ve tipler) karşılaştırılır.
+
+    Args:
+        loaders: Karşılaştırılacak Config.DB_LOADER değerleri
+        repeat: Her ölçüm için tekrar sayısı
+    """
+    from data_processor import EnergyDataProcessor
+
+    print(f"[BENCH] Yukleyiciler karsilastiriliyor: {', '.join(loaders)} (tekrar: {repeat})\n")
+
+    processor = EnergyDataProcessor()
+    original_loader = Config.DB_LOADER
+    rows = []
+
+    try:
+        for table_name in Config.REQUIRED_DB_TABLES:
+            baseline = None
+            expected = None
+            for loader in loaders:
+                Config.DB_LOADER = loader
+                # stream/copy dönüşümleri okurken yapar; karşılaştırma adil olsun diye
+                # her yöntemde _prepare_table uygulanır (dönüştürülmüş sütunları atlar)
+                seconds, peak_mb, result = measure(
+                    lambda: processor._prepare_table(table_name, processor._read_table(table_name)[0]),
+                    repeat
+                )
+                df = result if isinstance(result, pd.DataFrame) else pd.DataFrame()
+
+                if baseline is None:
+                    baseline, expected = seconds, df
+
+                rows.append({
+                    'tablo': table_name,
+                    'yontem': loader,
+                    'kayit': len(df),
+                    'sure_sn': f"{seconds:.3f}",
+                    'hiz': f"{baseline / seconds:.2f}x" if seconds > 0 else "-",
+                    'tepe_bellek_mb': f"{peak_mb:.1f}",
+                    'veri_mb': f"{frame_memory_mb(df):.1f}",
+                    # equals eksik değerleri (None/NaN) eşit sayar, sütun tiplerinin aynı olmasını ister
+                    'ayni_sonuc': 'evet' if df.equals(expected) else 'HAYIR',
+                })
+    finally:
+        Config.DB_LOADER = original_loader
+
+    print_table(rows, ['tablo', 'yontem', 'kayit', 'sure_sn', 'hiz', 'tepe_bellek_mb', 'veri_mb', 'ayni_sonuc'])
+    print()
+
+
+def make_compact_dates(rows: int, unique: int, seed: int = 42) -> np.ndarray:
+    """
+    YYYYMMDDHHMMSS formatında, tekrar eden ve arada hatalı değerler içeren tarih üret
+
+    Args:
+        rows: Kayıt sayısı
+        unique: Farklı tarih sayısı (yaklaşık)
+        seed: Rastgelelik tohumu
+
+    Returns:
+        int64 dizisi
+    """
+    rng = np.random.default_rng(seed)
+    pool = pd.date_range('2018-01-01', '2026-01-01', freq='s')[
+        rng.integers(0, 8 * 365 * 86400, unique)
+    ]
+    values = pool.strftime(Config.DATE_FORMAT_INPUT).astype(np.int64).to_numpy()
+
+    # Gerçek veride görülen hatalı değerler: 31 Şubat ve eksik haneli tarih
+    values[: max(1, unique // 100)] = 20250231000000
+    values[max(1, unique // 100): max(2, unique // 50)] //= 10
+
+    return values[rng.integers(0, len(values), rows)]
+
+
+def benchmark_dates(rows: int, unique: int, repeat: int):
+    """
+    YYYYMMDDHHMMSS tarih ayrıştırıcısını pd.to_datetime ile karşılaştır.
+    Her girdi tipinde sonuçların birebir aynı olduğu da kontrol edilir.
+
+    Args:
+        rows: Kayıt sayısı
+        unique: Farklı tarih sayısı
+        repeat: Her ölçüm için tekrar sayısı
+    """
+    from data_processor import parse_compact_datetime
+
+    print(f"[BENCH] Tarih ayristirma: {rows} kayit, ~{unique} farkli deger (tekrar: {repeat})\n")
+
+    values = make_compact_dates(rows, unique)
+    inputs = {
+        'int64': pd.Series(values),
+        'float64 (NULL)': pd.Series(np.where(np.arange(rows) % 10 == 0, np.nan, values)),
+        'metin': pd.Series(values.astype(str), dtype=object),
+    }
+
+    rows_out = []
+    for name, series in inputs.items():
+        pandas_seconds, _, expected = measure(
+            lambda: pd.to_datetime(series, format=Config.DATE_FORMAT_INPUT, errors='coerce'), repeat
+        )
+        fast_seconds, _, result = measure(lambda: parse_compact_datetime(series), repeat)
+
+        rows_out.append({
+            'girdi': name,
+            'pandas_sn': f"{pandas_seconds:.3f}",
+            'hizli_sn': f"{fast_seconds:.3f}",
+            'hiz': f"{pandas_seconds / fast_seconds:.1f}x" if fast_seconds > 0 else "-",
+            'ayni_sonuc': 'evet' if result.equals(expected) else 'HAYIR',
+        })
+
+    print_table(rows_out, ['girdi', 'pandas_sn', 'hizli_sn', 'hiz', 'ayni_sonuc'])
+    print()
+
+
+def make_source_tables(accruals: int, seed: int = 42) -> Dict[str, pd.DataFrame]:
+    """
+    Birleştirme karşılaştırması için tipli tablolar üret (term başına ~4 fee, fee başına ~2 tüketim)
+
+    Args:
+        accruals: Accrual (fatura) sayısı
+        seed: Rastgelelik tohumu
+
+    Returns:
+        Tablo adı -> DataFrame (Config.OPTIMIZE_DTYPES açıksa tipleri küçültülmüş)
+    """
+    from data_processor import optimize_dtypes
+
+    rng = np.random.default_rng(seed)
+    terms, fees, consumptions = accruals * 3, accruals * 12, accruals * 24
+
+    term_dates = pd.Timestamp('2020-01-01') + pd.to_timedelta(rng.integers(0, 6 * 365, terms), unit='D')
+    tables = {
+        Config.DB_TABLE_ACCRUALS: pd.DataFrame({
+            'id': np.arange(1, accruals + 1),
+            'accrual_date': term_dates[:accruals],
+        }),
+        Config.DB_TABLE_ACCRUAL_TERMS: pd.DataFrame({
+            'id': np.arange(1, terms + 1),
+            # Bazı term'lerin accrual'ı yok (inner join bunları eler)
+            'accrual_id': rng.integers(1, int(accruals * 1.02) + 1, terms),
+            'term_date': term_dates,
+            'year': term_dates.year,
+            'month': term_dates.month,
+        }),
+        Config.DB_TABLE_ACCRUAL_FEES: pd.DataFrame({
+            'id': np.arange(1, fees + 1),
+            'accrual_term_id': rng.integers(1, terms + 1, fees),
+            'fee_code': rng.choice(['4AG_GUNDUZ', '4OG_PUANT', 'URT_GECE', 'KAG', 'SABIT'], fees),
+            'amount': rng.random(fees) * 1000,
+            'unit_price': rng.random(fees) * 6,
+            'consumption': np.where(rng.random(fees) < 0.2, 0.0, rng.random(fees) * 500),
+        }),
+        Config.DB_TABLE_ACCRUAL_FEE_CONSUMPTIONS: pd.DataFrame({
+            'id': np.arange(1, consumptions + 1),
+            # Bazı fee'lerin tüketimi yok (left join eksik değer üretir)
+            'accrual_fee_id': rng.integers(1, int(fees * 1.1) + 1, consumptions),
+            'channel_key': rng.choice(['T1', 'T2', 'T3', None], consumptions),
+            'billable_channel_consumption': rng.random(consumptions) * 100,
+        }),
+    }
+
+    if Config.OPTIMIZE_DTYPES:
+        for df in tables.values():
+            optimize_dtypes(df)
+    return tables
+
+
+def benchmark_backends(accruals: int, repeat: int) -> bool:
+    """
+    Birleştirme ve term toplamlarını pandas ve Polars motorlarıyla karşılaştır.
+    Polars sonucunun pandas sonucuyla aynı olduğu da kontrol edilir
+    (sütunlar, tipler ve satır sırası birebir; toplamlar toplama sırası farkı kadar).
+
+    Args:
+        accruals: Accrual (fatura) sayısı
+        repeat: Her ölçüm için tekrar sayısı
+
+    Returns:
+        bool: Tüm motorların sonucu aynıysa True (komut satırında False ise çıkış kodu 1)
+    """
+    from data_processor import EnergyDataProcessor
+    from polars_backend import POLARS_MIN_VERSION, POLARS_SUPPORTED
+
+    tables = make_source_tables(accruals)
+    print(f"[BENCH] Birlestirme motorlari: {accruals} accrual, "
+          f"{len(tables[Config.DB_TABLE_ACCRUAL_FEES])} fee (tekrar: {repeat})\n")
+
+    backends = ['pandas'] + (['polars'] if POLARS_SUPPORTED else [])
+    if not POLARS_SUPPORTED:
+        print(f"  [UYARI] Polars yuklu degil ya da {'.'.join(map(str, POLARS_MIN_VERSION))}'dan eski, "
+              "sadece pandas olculuyor")
+
+    processor = EnergyDataProcessor()
+    processor.profiler.enabled = False
+
+    def run() -> pd.DataFrame:
+        # Hesaplanan sütunlar yerinde eklendiği için her çalıştırma tabloların kopyasıyla başlar
+        copies = {name: df.copy() for name, df in tables.items()}
+        with contextlib.redirect_stdout(io.StringIO()):
+            return processor._merge_tables(
+                copies[Config.DB_TABLE_ACCRUALS],
+                copies[Config.DB_TABLE_ACCRUAL_TERMS],
+                copies[Config.DB_TABLE_ACCRUAL_FEES],
+                copies[Config.DB_TABLE_ACCRUAL_FEE_CONSUMPTIONS],
+            )
+
+    rows, baseline, expected = [], None, None
+    for backend in backends:
+        processor.backend = backend
+        seconds, peak_mb, result = measure(run, repeat)
+
+        if expected is None:
+            baseline, expected, same = seconds, result, 'evet'
+        else:
+            same = 'evet' if frames_equivalent(expected, result) else 'HAYIR'
+
+        rows.append({
+            'motor': backend,
+            'kayit': len(result),
+            'sure_sn': f"{seconds:.3f}",
+            'hiz': f"{baseline / seconds:.2f}x" if seconds > 0 else "-",
+            'tepe_bellek_mb': f"{peak_mb:.1f}",
+            'ayni_sonuc': same,
+        })
+
+    print_table(rows, ['motor', 'kayit', 'sure_sn', 'hiz', 'tepe_bellek_mb', 'ayni_sonuc'])
+    print()
+
+    if any(row['ayni_sonuc'] != 'evet' for row in rows):
+        print("[HATA] Polars sonucu pandas sonucuyla ayni degil!")
+        return False
+    return True
+
+
+def benchmark_shards(accruals: int, shards: List[int], repeat: int):
+    """
+    Birleştirmeyi tek süreçle ve accrual bazında parçalı (process pool) olarak karşılaştır.
+    Parçalı sonucun tek süreçli sonuçla aynı olduğu da kontrol edilir (pandas motorunda
+    birebir; Polars motorunda term toplamları toplama sırası farkı kadar).
+
+    Args:
+        accruals: Accrual (fatura) sayısı
+        shards: Denenecek parça sayıları (1 = tek süreç)
+        repeat: Her ölçüm için tekrar sayısı
+    """
+    from data_processor import EnergyDataProcessor
+
+    tables = make_source_tables(accruals)
+    print(f"[BENCH] Parcali birlestirme: {accruals} accrual, "
+          f"{len(tables[Config.DB_TABLE_ACCRUAL_FEES])} fee, {os.cpu_count()} CPU (tekrar: {repeat})\n")
+
+    processor = EnergyDataProcessor()
+    processor.profiler.enabled = False
+    # Küçük denemelerde de parçalı yol kullanılsın
+    Config.PROCESSING_SHARD_MIN_ROWS = 0
+
+    def run() -> pd.DataFrame:
+        copies = {name: df.copy() for name, df in tables.items()}
+        with contextlib.redirect_stdout(io.StringIO()):
+            return processor._merge_tables(
+                copies[Config.DB_TABLE_ACCRUALS],
+                copies[Config.DB_TABLE_ACCRUAL_TERMS],
+                copies[Config.DB_TABLE_ACCRUAL_FEES],
+                copies[Config.DB_TABLE_ACCRUAL_FEE_CONSUMPTIONS],
+            )
+
+    rows, baseline, expected = [], None, None
+    for count in [1] + [count for count in shards if count != 1]:
+        processor.shards = count
+        seconds, peak_mb, result = measure(run, repeat)
+
+        if expected is None:
+            baseline, expected, same = seconds, result, 'evet'
+        else:
+            same = 'evet' if frames_equivalent(expected, result) else 'HAYIR'
+
+        rows.append({
+            'parca': count,
+            'kayit': len(result),
+            'sure_sn': f"{seconds:.3f}",
+            'hiz': f"{baseline / seconds:.2f}x" if seconds > 0 else "-",
+            'tepe_bellek_mb': f"{peak_mb:.1f}",
+            'ayni_sonuc': same,
+        })
+
+    print_table(rows, ['parca', 'kayit', 'sure_sn', 'hiz', 'tepe_bellek_mb', 'ayni_sonuc'])
+    print("  (tepe bellek sadece ana surecin Python ayirmalarini olcer)")
+    print()
+
+
+def frames_equivalent(expected: pd.DataFrame, result: pd.DataFrame) -> bool:
+    """
+    İki motorun birleştirilmiş verisi aynı mı? Sütunlar, tipler ve satırlar birebir
+    karşılaştırılır; term toplamlarında toplama sırasından gelen farklara izin verilir.
+    """
+    if list(expected.columns) != list(result.columns) or not expected.dtypes.equals(result.dtypes):
+        return False
+
+    totals = ['total_consumption', 'term_total_cost']
+    exact = [col for col in expected.columns if col not in totals]
+    if not expected[exact].equals(result[exact]):
+        return False
+
+    return all(
+        np.allclose(expected[col].to_numpy(), result[col].to_numpy(), rtol=1e-9, equal_nan=True)
+        for col in totals if col in expected.columns
+    )
+
+
+def benchmark_aggregates(accruals: int, repeat: int):
+    """
+    Grafik/rapor toplamlarını (aylık küp, term tablosu, tarife maliyetleri) pandas ve
+    DuckDB ile karşılaştır. pandas yolu tabloları birleştirip toplar; DuckDB aynı
+    tabloları bellekte yerel bir veritabanı olarak sorgular (ağ bağlantısı gerekmez).
+
+    Args:
+        accruals: Accrual (fatura) sayısı
+        repeat: Her ölçüm için tekrar sayısı
+    """
+    from data_processor import EnergyDataProcessor, build_monthly_cube, build_term_table
+    from duckdb_analytics import DUCKDB_AVAILABLE, SnapshotAnalytics
+    from visualizer import EnergyVisualizer
+
+    if not DUCKDB_AVAILABLE:
+        print("[UYARI] DuckDB yuklu degil. 'pip install duckdb' ile yukleyebilirsiniz.")
+        return
+
+    tables = make_source_tables(accruals)
+    print(f"[BENCH] Grafik/rapor toplamlari: {accruals} accrual, "
+          f"{len(tables[Config.DB_TABLE_ACCRUAL_FEES])} fee (tekrar: {repeat})\n")
+
+    processor = EnergyDataProcessor()
+    processor.profiler.enabled = False
+    visualizer = EnergyVisualizer()
+
+    def pandas_aggregates() -> Tuple:
+        copies = {name: df.copy() for name, df in tables.items()}
+        with contextlib.redirect_stdout(io.StringIO()):
+            df_merged = processor._merge_tables(
+                copies[Config.DB_TABLE_ACCRUALS],
+                copies[Config.DB_TABLE_ACCRUAL_TERMS],
+                copies[Config.DB_TABLE_ACCRUAL_FEES],
+                copies[Config.DB_TABLE_ACCRUAL_FEE_CONSUMPTIONS],
+            )
+        df_terms = build_term_table(df_merged)
+        return build_monthly_cube(df_merged), df_terms, visualizer.tariff_category_costs(df_terms)
+
+    analytics = SnapshotAnalytics.from_frames(tables)
+
+    def duckdb_aggregates() -> Tuple:
+        return analytics.monthly_cube(), analytics.term_table(), analytics.tariff_costs()
+
+    rows, baseline, expected = [], None, None
+    for name, func in (('pandas', pandas_aggregates), ('duckdb', duckdb_aggregates)):
+        seconds, peak_mb, result = measure(func, repeat)
+        if expected is None:
+            baseline, expected, same = seconds, result, 'evet'
+        else:
+            same = 'evet' if aggregates_equivalent(expected, result) else 'HAYIR'
+
+        rows.append({
+            'motor': name,
+            'kup_hucre': len(result[0].cells),
+            'term': len(result[1]),
+            'sure_sn': f"{seconds:.3f}",
+            'hiz': f"{baseline / seconds:.2f}x" if seconds > 0 else "-",
+            'tepe_bellek_mb': f"{peak_mb:.1f}",
+            'ayni_sonuc': same,
+        })
+
+    analytics.close()
+    print_table(rows, ['motor', 'kup_hucre', 'term', 'sure_sn', 'hiz', 'tepe_bellek_mb', 'ayni_sonuc'])
+    print("  (tepe bellek sadece Python ayirmalarini olcer; DuckDB'nin kendi bellegi dahil degildir)")
+    print()
+
+
+def aggregates_equivalent(expected: Tuple, result: Tuple) -> bool:
+    """
+    İki motorun küp, term tablosu ve tarife maliyetleri aynı mı?
+    Hücre sırası ve veri tipleri önemsenmez; toplamlarda toplama sırası farkına izin verilir.
+    """
+    (cube_a, terms_a, tariff_a), (cube_b, terms_b, tariff_b) = expected, result
+
+    keys = ['year', 'month', 'fee_prefix', 'channel_key']
+    cells = []
+    for cube in (cube_a, cube_b):
+        df = cube.cells.astype({'fee_prefix': object, 'channel_key': object})
+        cells.append(df.sort_values(keys, na_position='last').reset_index(drop=True))
+    if len(cells[0]) != len(cells[1]):
+        return False
+    if not all(cells[0][col].astype(str).equals(cells[1][col].astype(str)) for col in keys):
+        return False
+    if not all(np.array_equal(cells[0][col], cells[1][col]) for col in ('record_count', 'term_count')):
+        return False
+
+    if not np.array_equal(terms_a['accrual_term_id'].to_numpy(), terms_b['accrual_term_id'].to_numpy()):
+        return False
+    if not tariff_a.sort_index().index.equals(tariff_b.sort_index().index):
+        return False
+
+    pairs = [(cells[0][col], cells[1][col]) for col in ('consumption', 'cost')]
+    pairs += [(terms_a[col], terms_b[col]) for col in ('total_consumption', 'term_total_cost')]
+    pairs.append((tariff_a.sort_index(), tariff_b.sort_index()))
+    return all(np.allclose(a.to_numpy(dtype='float64'), b.to_numpy(dtype='float64'), rtol=1e-9) for a, b in pairs)
+
+
+def main():
+    """Komut satırı girişi"""
+    parser = argparse.ArgumentParser(description="Enerji Analiz Sistemi performans karsilastirmalari")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    loaders_parser = subparsers.add_parser('loaders', help="Tablo okuma yontemlerini karsilastir")
+    loaders_parser.add_argument('--repeat', type=int, default=3)
+    loaders_parser.add_argument('--loaders', default='read_sql,stream,copy')
+
+    dates_parser = subparsers.add_parser('dates', help="Tarih ayristiriciyi pd.to_datetime ile karsilastir")
+    dates_parser.add_argument('--rows', type=int, default=1_000_000)
+    dates_parser.add_argument('--unique', type=int, default=20_000)
+    dates_parser.add_argument('--repeat', type=int, default=3)
+
+    backends_parser = subparsers.add_parser('backends', help="pandas ve Polars birlestirme motorlarini karsilastir")
+    backends_parser.add_argument('--accruals', type=int, default=20_000)
+    backends_parser.add_argument('--repeat', type=int, default=3)
+
+    shards_parser = subparsers.add_parser('shards', help="Tek surecli ve parcali (cok surecli) birlestirmeyi karsilastir")
+    shards_parser.add_argument('--accruals', type=int, default=20_000)
+    shards_parser.add_argument('--shards', default=f"2,{os.cpu_count() or 1}")
+    shards_parser.add_argument('--repeat', type=int, default=3)
+
+    aggregates_parser = subparsers.add_parser('aggregates', help="Grafik/rapor toplamlarini pandas ve DuckDB ile karsilastir")
+    aggregates_parser.add_argument('--accruals', type=int, default=20_000)
+    aggregates_parser.add_argument('--repeat', type=int, default=3)
+
+    args = parser.parse_args()
+
+    if args.command == 'loaders':
+        benchmark_loaders([name.strip() for name in args.loaders.split(',') if name.strip()], args.repeat)
+    elif args.command == 'dates':
+        benchmark_dates(args.rows, args.unique, args.repeat)
+    elif args.command == 'backends':
+        if not benchmark_backends(args.accruals, args.repeat):
+            sys.exit(1)
+    elif args.command == 'shards':
+        shards = sorted({int(count) for count in args.shards.split(',') if count.strip()})
+        benchmark_shards(args.accruals, shards, args.repeat)
+    elif args.command == 'aggregates':
+        benchmark_aggregates(args.accruals, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,7 @@ Tüm sabit değerler ve ayarlar bu dosyada merkezi olarak yönetilir.
 
 import os
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 from dotenv import load_dotenv
 
 # .env dosyasını yükle
@@ -44,6 +44,133 @@ class Config:
         DB_TABLE_ACCRUAL_FEE_CONSUMPTIONS
     ]
 
+    # Tablo bazında okunan sütunlar (SELECT * yerine sadece uygulamanın kullandıkları)
+    # Ek sütunlar DB_EXTRA_COLUMNS ile eklenir: "bi_accruals.customer_id,bi_accrual_terms.status"
+    DB_TABLE_COLUMNS: Dict[str, List[str]] = {
+        DB_TABLE_ACCRUALS: ['id', 'accrual_date', 'accrual_start_date', 'accrual_end_date'],
+        DB_TABLE_ACCRUAL_TERMS: ['id', 'accrual_id', 'term_date', 'start_date', 'end_date'],
+        DB_TABLE_ACCRUAL_FEES: ['id', 'accrual_term_id', 'fee_code', 'amount', 'unit_price', 'consumption'],
+        DB_TABLE_ACCRUAL_FEE_CONSUMPTIONS: ['id', 'accrual_fee_id', 'channel_key', 'billable_channel_consumption'],
+    }
+    DB_EXTRA_COLUMNS: str = os.getenv('DB_EXTRA_COLUMNS', '')
+
+    @classmethod
+    def get_table_columns(cls, table_name: str, extra: Optional[List[str]] = None) -> List[str]:
+        """
+        Tablodan okunacak sütunlar: manifest + DB_EXTRA_COLUMNS + watermark sütunu + extra.
+
+        Args:
+            table_name: Tablo ismi
+            extra: İsteğe bağlı ek sütunlar
+
+        Returns:
+            List[str]: Tekrarsız sütun listesi (manifestte olmayan tablo için ['*'])
+        """
+        if table_name not in cls.DB_TABLE_COLUMNS:
+            return ['*']
+        configured = [
+            item.strip().split('.', 1)[1]
+            for item in cls.DB_EXTRA_COLUMNS.split(',')
+            if item.strip().startswith(f"{table_name}.")
+        ]
+        columns = (cls.DB_TABLE_COLUMNS[table_name] + configured
+                   + [cls.DB_WATERMARK_COLUMNS.get(table_name, 'id')] + list(extra or []))
+        return list(dict.fromkeys(columns))
+
+    # Veri yükleme modu
+    # 'tables'   = Dört tablo ayrı ayrı okunur, pandas ile birleştirilir
+    # 'sql_join' = Birleştirme PostgreSQL'de yapılır (her iki modda sadece DB_TABLE_COLUMNS okunur)
+    DB_LOAD_MODE: str = os.getenv('DB_LOAD_MODE', 'tables').lower()
+
+    # Yükleme penceresi: sadece son N takvim yılının term'leri yüklenir (0 = tüm geçmiş)
+    # Pencere bi_accrual_terms.term_date üzerinden uygulanır; accrual, fee ve tüketimler
+    # term'ler üzerinden (semi-join) seçilir. Daha eski yıllar istendiğinde
+    # (EnergyDataProcessor.load_window) sadece eksik aralık okunup mevcut veriye eklenir
+    LOAD_WINDOW_YEARS: int = int(os.getenv('LOAD_WINDOW_YEARS', '0'))
+
+    # Tablo okuma yöntemi
+    # 'read_sql' = pd.read_sql ile tek seferde
+    # 'stream'   = Server-side cursor ile DB_CHUNK_SIZE'lık parçalar halinde
+    # 'copy'     = PostgreSQL COPY ... TO STDOUT (CSV) ile toplu aktarım (ilk yükleme için)
+    DB_LOADER: str = os.getenv('DB_LOADER', 'read_sql').lower()
+    DB_CHUNK_SIZE: int = int(os.getenv('DB_CHUNK_SIZE', '50000'))
+    DB_COPY_SPOOL_MB: int = int(os.getenv('DB_COPY_SPOOL_MB', '64'))  # Bu boyuttan sonra diske yazılır
+
+    # Tabloları connection pool üzerinden paralel yükle
+    DB_PARALLEL_LOAD: bool = os.getenv('DB_PARALLEL_LOAD', 'True').lower() == 'true'
+    DB_LOAD_WORKERS: int = int(os.getenv('DB_LOAD_WORKERS', os.getenv('DB_POOL_SIZE', '5')))
+
+    # Artımlı (delta) yükleme için tablo bazında watermark sütunları
+    # 'id' sadece yeni kayıtları, 'updated_at' gibi bir sütun değişen kayıtları da yakalar
+    DB_WATERMARK_COLUMNS: dict = {
+        DB_TABLE_ACCRUALS: os.getenv('DB_WATERMARK_COLUMN', 'id'),
+        DB_TABLE_ACCRUAL_FEES: os.getenv('DB_WATERMARK_COLUMN', 'id'),
+        DB_TABLE_ACCRUAL_TERMS: os.getenv('DB_WATERMARK_COLUMN', 'id'),
+        DB_TABLE_ACCRUAL_FEE_CONSUMPTIONS: os.getenv('DB_WATERMARK_COLUMN', 'id'),
+    }
+
+    # Birleştirme ve term toplamlarını çalıştıran motor
+    # 'pandas' = tek iş parçacıklı pandas merge/groupby
+    # 'polars' = Polars ile tembel ve çok iş parçacıklı (yüklü değilse pandas kullanılır)
+    PROCESSING_BACKEND: str = os.getenv('PROCESSING_BACKEND', 'pandas').lower()
+
+    # Accrual bazında parçalı, çok süreçli birleştirme
+    # Her accrual'ın term/fee/tüketim kayıtları aynı parçaya düşer; parçalar process
+    # pool'da birleştirilip sırayla eklenir (sonuç tek süreçli birleştirmeyle aynıdır)
+    # 1 = kapalı, 0 = CPU sayısı kadar parça
+    PROCESSING_SHARDS: int = int(os.getenv('PROCESSING_SHARDS', '1'))
+    PROCESSING_SHARD_MIN_ROWS: int = int(os.getenv('PROCESSING_SHARD_MIN_ROWS', '200000'))  # Daha az fee'de tek süreç
+
+    # Yerel snapshot (işlenmiş verinin sütunsal kopyası)
+    # Kaynak tabloların parmak izi değişmediği sürece yeniden yükleme yapılmaz
+    SNAPSHOT_ENABLED: bool = os.getenv('SNAPSHOT_ENABLED', 'True').lower() == 'true'
+    SNAPSHOT_DIR: Path = Path(os.getenv('SNAPSHOT_DIR', str(BASE_DIR / 'snapshots')))
+    SNAPSHOT_FORMAT: str = os.getenv('SNAPSHOT_FORMAT', 'parquet').lower()  # parquet | feather
+
+    # Sorgu sonuç cache'i (DatabaseManager.read_sql_cached): anahtar = normalize SQL + parametreler.
+    # Her istekte sorgunun tablolarına ucuz bir parmak izi sorgusu atılır, değişmediyse sonuç cache'ten döner
+    # 'count' = count(*) + max(watermark) (kesin), 'stats' = pg_stat_user_tables sayaçları
+    # (taramasız ama commit'ten kısa süre sonra güncellenir; bu arada eski sonuç dönebilir)
+    QUERY_CACHE_ENABLED: bool = os.getenv('QUERY_CACHE_ENABLED', 'True').lower() == 'true'
+    QUERY_CACHE_PROBE: str = os.getenv('QUERY_CACHE_PROBE', 'count').lower()
+    QUERY_CACHE_MAX_ENTRIES: int = int(os.getenv('QUERY_CACHE_MAX_ENTRIES', '128'))
+    QUERY_CACHE_MAX_MB: int = int(os.getenv('QUERY_CACHE_MAX_MB', '256'))  # Bellek katmanı (LRU)
+    QUERY_CACHE_DISK_ENABLED: bool = os.getenv('QUERY_CACHE_DISK_ENABLED', 'False').lower() == 'true'
+    QUERY_CACHE_DIR: Path = Path(os.getenv('QUERY_CACHE_DIR', str(SNAPSHOT_DIR / 'query_cache')))
+    QUERY_CACHE_DISK_MB: int = int(os.getenv('QUERY_CACHE_DISK_MB', '1024'))
+
+    # Out-of-core mod: bellek bütçesi (MB, 0 = kapalı, tüm veri bellekte işlenir)
+    # Açıkken accrual'lar id sırasıyla parça parça okunur; her parçanın fee detayı
+    # FEE_DETAIL_DIR'e yazılır, sadece term tablosu ve aylık küp bellekte tutulur.
+    # Parça boyutu, birleştirilmiş parça bütçenin MEMORY_BUDGET_CHUNK_RATIO'sunu aşmayacak şekilde ayarlanır
+    MEMORY_BUDGET_MB: int = int(os.getenv('MEMORY_BUDGET_MB', '0'))
+    MEMORY_BUDGET_CHUNK_RATIO: float = 0.25  # Birleştirme, parçanın birkaç katı geçici bellek kullanır
+    OUT_OF_CORE_FIRST_CHUNK: int = 1000      # İlk parçadaki accrual sayısı (sonrakiler ölçüme göre)
+    FEE_DETAIL_DIR: Path = Path(os.getenv('FEE_DETAIL_DIR', str(SNAPSHOT_DIR / 'fee_detail')))
+
+    # Dışa aktarma (csv, csv.gz, csv.zst, parquet - biçim dosya uzantısından belirlenir)
+    # Veri EXPORT_CHUNK_ROWS'luk parçalar halinde yazılır; Parquet yıl/ay bazında bölümlenir
+    EXPORT_CHUNK_ROWS: int = int(os.getenv('EXPORT_CHUNK_ROWS', '100000'))
+    EXPORT_CSV_ENCODING: str = 'utf-8-sig'  # Excel'in Türkçe karakterleri doğru açması için BOM
+    EXPORT_PARQUET_COMPRESSION: str = os.getenv('EXPORT_PARQUET_COMPRESSION', 'zstd')
+    EXPORT_ROW_GROUP_ROWS: int = 128 * 1024
+
+    # Grafik ve rapor toplamlarını hesaplayan motor
+    # 'pandas' = işlenmiş veriden (aylık küp ve term tablosu aşamaları)
+    # 'duckdb' = snapshot'taki dört tablodan SQL ile (birleştirilmiş veri belleğe alınmaz)
+    # 'postgres' = PostgreSQL materialized view'larından (veri değiştiyse uygulama yeniler)
+    ANALYTICS_ENGINE: str = os.getenv('ANALYTICS_ENGINE', 'pandas').lower()
+
+    # Materialized view'ların oluşturulacağı şema ve yenileme yöntemi
+    # CONCURRENTLY: yenileme sırasında view'lar okunmaya devam eder (unique index gerekir)
+    ROLLUP_SCHEMA: str = os.getenv('ROLLUP_SCHEMA', DB_SCHEMA)
+    ROLLUP_REFRESH_CONCURRENTLY: bool = os.getenv('ROLLUP_REFRESH_CONCURRENTLY', 'True').lower() == 'true'
+
+    # Süreçler arasında paylaşılan, memory-map ile açılan işlenmiş veri (Arrow IPC)
+    # Birden fazla Streamlit süreci aynı dosyayı kopyalamadan kullanır
+    SHARED_DATASET_ENABLED: bool = os.getenv('SHARED_DATASET_ENABLED', 'True').lower() == 'true'
+    SHARED_DATASET_PATH: Path = Path(os.getenv('SHARED_DATASET_PATH', str(SNAPSHOT_DIR / 'merged.arrow')))
+
     # İş mantığı sabitleri
     VAT_RATE: float = 0.20  # KDV oranı (%20)
     CURRENCY: str = "TL"
@@ -60,6 +187,10 @@ class Config:
     # Performans ayarları
     EPSILON: float = 1e-6  # Sıfıra bölme kontrolü için minimum değer
 
+    # Veri tipi optimizasyonu (category, küçültülmüş int, nullable Int, float32)
+    OPTIMIZE_DTYPES: bool = os.getenv('OPTIMIZE_DTYPES', 'True').lower() == 'true'
+    DTYPE_CATEGORY_MAX_RATIO: float = 0.5  # Farklı değer / kayıt oranı bunun altındaysa category
+
     # Streamlit ayarları
     ST_PAGE_TITLE: str = "Enerji Analiz Sistemi"
     ST_PAGE_ICON: str = "⚡"
@@ -72,6 +203,11 @@ class Config:
     LOG_BACKUP_COUNT: int = 5
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
 
+    # Aşama bazında süre/CPU/bellek ölçümü (JSON satırları LOG_FILE'a yazılır)
+    # rss = RSS farkı (ucuz), tracemalloc = ayırma tepe değeri (yavaş), off = bellek ölçülmez
+    PROFILE_ENABLED: bool = os.getenv('PROFILE_ENABLED', 'True').lower() == 'true'
+    PROFILE_MEMORY: str = os.getenv('PROFILE_MEMORY', 'rss').lower()
+
     # Grafik renk paleti
     COLOR_SCHEME: dict = {
         'primary': '#1f77b4',
@@ -135,6 +271,12 @@ class Config:
                 if not db_manager.check_table_exists(table_name):
                     return False
 
+            # Okunan sütunları kontrol et
+            missing = cls.get_missing_columns(db_manager)
+            if missing:
+                print(f"Veritabanında eksik sütunlar: {missing}")
+                return False
+
             return True
 
         except Exception as e:
@@ -168,6 +310,34 @@ class Config:
         except Exception:
             return cls.REQUIRED_DB_TABLES
 
+    @classmethod
+    def get_missing_columns(cls, db_manager=None, extra: Optional[Dict[str, List[str]]] = None) -> Dict[str, List[str]]:
+        """
+        Okunacak sütunlardan (get_table_columns) veritabanında olmayanları bul.
+        Sütunları okunamayan tablolar (yok ya da information_schema erişilemiyor) atlanır.
+
+        Args:
+            db_manager: DatabaseManager (None ise global instance)
+            extra: Tablo ismi -> isteğe bağlı ek sütunlar
+
+        Returns:
+            Dict[str, List[str]]: Tablo ismi -> eksik sütunlar (eksik yoksa boş)
+        """
+        if db_manager is None:
+            from database import get_database_manager
+            db_manager = get_database_manager()
+
+        existing = db_manager.get_column_names(cls.REQUIRED_DB_TABLES)
+        missing = {}
+        for table_name in cls.REQUIRED_DB_TABLES:
+            if not existing.get(table_name):
+                continue
+            columns = cls.get_table_columns(table_name, (extra or {}).get(table_name))
+            absent = [col for col in columns if col not in existing[table_name]]
+            if absent:
+                missing[table_name] = absent
+        return missing
+
 
 class DevelopmentConfig(Config):
     """Geliştirme ortamı konfigürasyonu."""
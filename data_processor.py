@@ -3,310 +3,2489 @@ Enerji Tüketim Veri İşleme Modülü
 Bu modül veritabanından verileri okur, temizler ve analiz için hazırlar.
 """
 
+import contextlib
+import csv
+import io
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+import numpy as np
 import pandas as pd
-from typing import Dict, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import text
 from config import Config
 from database import get_database_manager
+from exporter import EXPORT_FORMATS, PARTITION_COLUMNS, detect_format, write_csv, write_parquet
+from instrumentation import PipelineProfiler, current_rss_bytes
+from monthly_cube import MonthlyCube
+import polars_backend
+from snapshot import FeeDetailStore, SharedDataset, SnapshotStore
+
+
+# Tablo adı -> EnergyDataProcessor üzerindeki DataFrame attribute'u
+TABLE_ATTRIBUTES: Dict[str, str] = {
+    Config.DB_TABLE_ACCRUALS: 'df_accruals',                      # Ana fatura bilgileri
+    Config.DB_TABLE_ACCRUAL_FEES: 'df_fees',                      # Fatura ücret detayları
+    Config.DB_TABLE_ACCRUAL_TERMS: 'df_terms',                    # Fatura dönem bilgileri
+    Config.DB_TABLE_ACCRUAL_FEE_CONSUMPTIONS: 'df_consumptions',  # Tüketim detayları
+}
+
+# Tablo bazında YYYYMMDDHHmmss formatındaki tarih sütunları
+DATE_COLUMNS: Dict[str, List[str]] = {
+    Config.DB_TABLE_ACCRUALS: ['accrual_date', 'accrual_start_date', 'accrual_end_date'],
+    Config.DB_TABLE_ACCRUAL_TERMS: ['term_date', 'start_date', 'end_date'],
+}
+
+# Tablo bazında sayısala çevrilecek sütunlar
+NUMERIC_COLUMNS: Dict[str, List[str]] = {
+    Config.DB_TABLE_ACCRUAL_FEES: ['amount', 'unit_price', 'consumption'],
+    Config.DB_TABLE_ACCRUAL_FEE_CONSUMPTIONS: ['billable_channel_consumption'],
+}
+
+# Toplanan ya da toplamları filtreleyen sütunlar; float32'ye düşürülmez (toplamlar değişmesin diye)
+FLOAT64_COLUMNS: List[str] = [
+    'amount', 'unit_price', 'consumption', 'billable_channel_consumption',
+    'total_consumption', 'term_total_cost', 'consumption_value',
+]
+
+# Maliyete dahil edilen en yüksek birim fiyat (TL/kWh); üstündekiler anormal kabul edilir
+BILLABLE_MAX_UNIT_PRICE: float = 5.0
+
+# Fee seviyesindeki sayfaların (tarife dağılımı, tahmin modeli) kullandığı sütunlar.
+# Out-of-core modda fee detayı diskten sadece bu sütunlarla okunur.
+FEE_DETAIL_COLUMNS: List[str] = [
+    'accrual_term_id', 'fee_code', 'consumption', 'unit_price', 'amount', 'term_total_cost',
+]
+
+# Term tablosunda (her term için tek satır) tutulan sütunlar
+TERM_TABLE_COLUMNS: List[str] = [
+    'accrual_term_id', 'accrual_id', 'term_date', 'year', 'month',
+    'total_consumption', 'term_total_cost', 'tariff_category',
+]
+
+# Birleştirmede tabloların sırası ve çakışan sütun adlarına eklenen sonekler (merge_data ile aynı)
+JOIN_SUFFIXES: Dict[str, str] = {
+    Config.DB_TABLE_ACCRUALS: '',
+    Config.DB_TABLE_ACCRUAL_TERMS: '_term',
+    Config.DB_TABLE_ACCRUAL_FEES: '_fee',
+    Config.DB_TABLE_ACCRUAL_FEE_CONSUMPTIONS: '_consumption',
+}
+
+
+def is_id_column(column: str) -> bool:
+    """
+    Sütun bir id ya da yabancı anahtar mı (id, id_term, accrual_id gibi)?
+    COPY ile okumada bu sütunların tipi sayı olarak çıkarılır; optimize_dtypes
+    eksik değer yüzünden float olan id sütunlarını nullable Int'e çevirir.
+    """
+    return column == 'id' or column.startswith('id_') or column.endswith('_id')
+
+
+def joined_select_columns(table_columns: Optional[Dict[str, List[str]]] = None) -> List[tuple]:
+    """
+    SQL tarafında birleştirmede seçilen sütunlar (tablo sütun manifestinden).
+    Çıktı adları pandas merge'ün suffix'li adlarıyla aynıdır (id_term, id_fee, ...).
+
+    Args:
+        table_columns: Tablo adı -> sütunlar (varsayılan: Config.get_table_columns)
+
+    Returns:
+        [(tablo, sütun, df_merged'deki adı), ...]
+    """
+    selected, names = [], set()
+    for table, suffix in JOIN_SUFFIXES.items():
+        columns = (table_columns or {}).get(table) or Config.get_table_columns(table)
+        for column in columns:
+            output = f"{column}{suffix}" if column in names else column
+            names.add(output)
+            selected.append((table, column, output))
+    return selected
+
+
+def build_joined_query(table_columns: Optional[Dict[str, List[str]]] = None) -> str:
+    """
+    Dört tabloyu PostgreSQL tarafında birleştiren SELECT sorgusunu oluştur.
+    Join tipleri merge_data ile aynıdır (inner, inner, left).
+
+    Args:
+        table_columns: Tablo adı -> sütunlar (varsayılan: Config.get_table_columns)
+
+    Returns:
+        str: SQL sorgusu
+    """
+    aliases = {
+        Config.DB_TABLE_ACCRUALS: 'a',
+        Config.DB_TABLE_ACCRUAL_TERMS: 't',
+        Config.DB_TABLE_ACCRUAL_FEES: 'f',
+        Config.DB_TABLE_ACCRUAL_FEE_CONSUMPTIONS: 'c',
+    }
+    select_list = ",\n    ".join(
+        f"{aliases[table]}.{column} AS {output}"
+        for table, column, output in joined_select_columns(table_columns)
+    )
+
+    return (
+        f"SELECT\n    {select_list}\n"
+        f"FROM {Config.get_full_table_name(Config.DB_TABLE_ACCRUALS)} a\n"
+        f"JOIN {Config.get_full_table_name(Config.DB_TABLE_ACCRUAL_TERMS)} t ON t.accrual_id = a.id\n"
+        f"JOIN {Config.get_full_table_name(Config.DB_TABLE_ACCRUAL_FEES)} f ON f.accrual_term_id = t.id\n"
+        f"LEFT JOIN {Config.get_full_table_name(Config.DB_TABLE_ACCRUAL_FEE_CONSUMPTIONS)} c ON c.accrual_fee_id = f.id"
+    )
+
+
+def term_date_bounds(column: str, start: Any = None, end: Any = None) -> Tuple[Optional[str], Dict[str, str]]:
+    """
+    Term tarihi için [start, end) aralık koşulu (yükleme penceresi).
+    Sınırlar kaynaktaki YYYYMMDDHHmmss biçiminde parametre olarak verilir; PostgreSQL
+    parametreyi sütunun tipine (sayı veya metin) çevirir, term_date indeksi kullanılabilir.
+    Başlangıç sınırsızsa aralık tüm geçmişi kapsar; term_date'i boş term'ler de dahildir.
+
+    Args:
+        column: Koşuldaki sütun (örn: 'term_date', 't.term_date')
+        start: Başlangıç (dahil, None = sınırsız)
+        end: Bitiş (hariç, None = sınırsız)
+
+    Returns:
+        (SQL koşulu veya iki uç da None ise None, bind parametreleri)
+    """
+    conditions, params = [], {}
+    if start is not None:
+        conditions.append(f"{column} >= :window_start")
+        params['window_start'] = pd.Timestamp(start).strftime(Config.DATE_FORMAT_INPUT)
+    if end is not None:
+        condition = f"{column} < :window_end"
+        conditions.append(condition if start is not None else f"({condition} OR {column} IS NULL)")
+        params['window_end'] = pd.Timestamp(end).strftime(Config.DATE_FORMAT_INPUT)
+    return (" AND ".join(conditions) if conditions else None), params
+
+
+def window_key(start: Optional[pd.Timestamp]) -> Optional[str]:
+    """Yükleme penceresi başlangıcının parmak izindeki değeri (None = tüm geçmiş)."""
+    return None if start is None else start.isoformat()
+
+
+def fingerprint_covers(stored: Optional[Dict[str, Any]], fingerprint: Dict[str, Any]) -> bool:
+    """
+    Kaydedilmiş (snapshot/paylaşılan veri) parmak izi, verilen parmak izinin verisini kapsıyor mu?
+    Kaynak tablolar ve ayarlar aynı, kaydedilen pencere de istenen pencereyi içeriyorsa
+    (aynı veya daha erken başlıyorsa) kaydedilen veri kullanılabilir. Böylece pencereyi
+    genişleten bir sürecin yayınladığı veri, varsayılan pencereyle açılan süreçlerce
+    daraltılıp yeniden yayınlanmaz.
+
+    Args:
+        stored: Kaydedilmiş parmak izi (yoksa None)
+        fingerprint: Kaynak tabloların güncel parmak izi
+
+    Returns:
+        bool: Kaydedilen veri kullanılabiliyorsa True
+    """
+    if stored is None:
+        return False
+
+    def without_window(value: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: item for key, item in value.items() if key != 'window_start'}
+
+    if without_window(stored) != without_window(fingerprint):
+        return False
+
+    stored_start, start = stored.get('window_start'), fingerprint.get('window_start')
+    return stored_start is None or (start is not None and pd.Timestamp(stored_start) <= pd.Timestamp(start))
+
+
+def _compact_datetime_digits(values: pd.Index) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Değerlerden kesin olarak 14 haneli olanları int64'e çevir.
+
+    Args:
+        values: Tekil değerler (int, float veya metin)
+
+    Returns:
+        (int64 değerler, hızlı yoldan çözülebilir mi maskesi)
+    """
+    if pd.api.types.is_integer_dtype(values.dtype):
+        digits = values.to_numpy().astype(np.int64)
+        candidate = (digits >= 10**13) & (digits < 10**14)
+
+    elif pd.api.types.is_float_dtype(values.dtype):
+        floats = values.to_numpy(dtype='float64', na_value=np.nan)
+        candidate = (floats >= 10**13) & (floats < 10**14) & (floats == np.floor(floats))
+        digits = np.where(candidate, floats, 0).astype(np.int64)
+
+    else:
+        # Sadece 14 ASCII rakamdan oluşan metinler (boşluklu/eksik haneli değerler pandas'a kalır)
+        strings = values.to_numpy(dtype=object)
+        candidate = np.fromiter(
+            (isinstance(v, str) and len(v) == 14 and v.isascii() and v.isdigit() for v in strings),
+            dtype=bool, count=len(strings)
+        )
+        digits = np.zeros(len(strings), dtype=np.int64)
+        digits[candidate] = strings[candidate].astype(np.int64)
+
+    return digits, candidate
+
+
+def _digits_to_datetime(digits: np.ndarray, candidate: np.ndarray) -> np.ndarray:
+    """
+    YYYYMMDDHHMMSS tam sayılarını aritmetik olarak datetime64[ns]'e çevir.
+    Takvimde olmayan değerler (31 Şubat, 60. saniye, ...) NaT olur.
+
+    Args:
+        digits: int64 değerler
+        candidate: Çözülecek değerlerin maskesi
+
+    Returns:
+        datetime64[ns] dizisi (çözülemeyenler NaT)
+    """
+    year = digits // 10**10
+    month = digits // 10**8 % 100
+    day = digits // 10**6 % 100
+    hour = digits // 10**4 % 100
+    minute = digits // 100 % 100
+    second = digits % 100
+
+    # datetime64[ns] aralığının (1677-2262) tamamen içinde kalan yıllar
+    valid = (
+        candidate
+        & (year >= 1678) & (year <= 2261)
+        & (month >= 1) & (month <= 12)
+        & (day >= 1) & (day <= 31)
+        & (hour <= 23) & (minute <= 59) & (second <= 59)
+    )
+
+    # Geçersiz satırlar taşma olmasın diye 1970-01-01 00:00:00 ile hesaplanır
+    year = np.where(valid, year, 1970)
+    month = np.where(valid, month, 1)
+    day = np.where(valid, day, 1)
+    seconds = np.where(valid, hour * 3600 + minute * 60 + second, 0)
+
+    month_start = ((year - 1970) * 12 + month - 1).astype('datetime64[M]')
+    date = month_start.astype('datetime64[D]') + (day - 1).astype('timedelta64[D]')
+    # Gün ayın dışına taşıyorsa (30 Şubat gibi) tarih geçersizdir
+    valid &= date.astype('datetime64[M]') == month_start
+
+    result = date.astype('datetime64[ns]') + seconds.astype('timedelta64[s]')
+    result[~valid] = np.datetime64('NaT')
+    return result
+
+
+def parse_compact_datetime(values: pd.Series) -> pd.Series:
+    """
+    YYYYMMDDHHMMSS formatındaki tarihleri (int, float veya metin) datetime64[ns]'e çevir.
+
+    Sonuç pd.to_datetime(values, format=Config.DATE_FORMAT_INPUT, errors='coerce') ile
+    birebir aynıdır. Tekrar eden değerler bir kez çözülür; kesin geçerli 14 haneli değerler
+    NumPy ile aritmetik olarak ayrıştırılır, geri kalanlar (hatalı ya da pandas'ın kendine
+    özgü yorumladığı değerler) aynı tipte pd.to_datetime'a bırakılır.
+
+    Args:
+        values: Ham tarih sütunu
+
+    Returns:
+        datetime64[ns] Series (aynı index ve isimle)
+    """
+    # factorize 1 ile 1.0'ı aynı sayar, pandas ise object sütunda bunları farklı yorumlar;
+    # karışık tipli (nadir) sütunlar doğrudan pandas ile çözülür
+    if values.dtype == object and pd.api.types.infer_dtype(values, skipna=True) not in ('string', 'empty'):
+        return pd.to_datetime(values, format=Config.DATE_FORMAT_INPUT, errors='coerce')
+
+    codes, uniques = pd.factorize(values)
+    if not isinstance(uniques, pd.Index):
+        uniques = pd.Index(uniques)
+
+    parsed = _digits_to_datetime(*_compact_datetime_digits(uniques))
+
+    rest = np.isnat(parsed)
+    if rest.any():
+        parsed[rest] = pd.to_datetime(
+            pd.Series(uniques[rest], dtype=values.dtype),
+            format=Config.DATE_FORMAT_INPUT,
+            errors='coerce'
+        ).to_numpy(dtype='datetime64[ns]')
+
+    result = parsed.take(codes) if len(parsed) else np.full(len(codes), np.datetime64('NaT'), dtype='datetime64[ns]')
+    result[codes < 0] = np.datetime64('NaT')
+    return pd.Series(result, index=values.index, name=values.name)
+
+
+def build_term_table(df_merged: pd.DataFrame) -> pd.DataFrame:
+    """
+    Birleştirilmiş veriden her term için tek satırlık tabloyu oluştur.
+    Satırlar drop_duplicates(subset=['accrual_term_id']) ile aynıdır (ilk görülme sırası),
+    ancak sadece term seviyesindeki sütunlar kopyalanır.
+
+    Args:
+        df_merged: Birleştirilmiş ve hesaplanan sütunları eklenmiş veri
+
+    Returns:
+        Term tablosu (accrual_term_id, yıl, ay, toplam tüketim ve maliyet,
+        tarife kategorisi = term'in ilk satırının fee prefix'i)
+    """
+    if df_merged.empty or 'accrual_term_id' not in df_merged.columns:
+        return pd.DataFrame(columns=TERM_TABLE_COLUMNS)
+
+    columns = [col for col in TERM_TABLE_COLUMNS if col in df_merged.columns]
+    first_rows = ~df_merged['accrual_term_id'].duplicated().to_numpy()
+    df_terms = df_merged.loc[first_rows, columns].reset_index(drop=True)
+    if 'fee_prefix' in df_merged.columns:
+        df_terms['tariff_category'] = np.asarray(df_merged['fee_prefix'], dtype=object)[first_rows]
+    return df_terms
+
+
+def billable_fee_mask(df: pd.DataFrame) -> pd.Series:
+    """
+    Maliyete dahil edilen satırlar: tüketimi olan ve birim fiyatı makul aralıkta olan fee'ler
+    (sabit ücretler ve anormal unit_price'lar hariç tutulur)
+
+    Args:
+        df: consumption ve unit_price sütunlarını içeren veri
+
+    Returns:
+        Boolean maske
+    """
+    return (
+        (df['consumption'].notna()) &
+        (df['consumption'] > 0) &
+        (df['unit_price'].notna()) &
+        (df['unit_price'] > 0) &
+        (df['unit_price'] <= BILLABLE_MAX_UNIT_PRICE)  # Anormal unit_price'ları filtrele
+    )
+
+
+def build_monthly_cube(df_merged: pd.DataFrame) -> MonthlyCube:
+    """
+    Birleştirilmiş veriden aylık küpü oluştur
+
+    Args:
+        df_merged: Birleştirilmiş ve hesaplanan sütunları eklenmiş veri
+
+    Returns:
+        MonthlyCube (veri yoksa boş)
+    """
+    required = ['year', 'month', 'accrual_term_id', 'consumption', 'amount', 'unit_price']
+    if df_merged.empty or any(col not in df_merged.columns for col in required):
+        return MonthlyCube(pd.DataFrame(columns=MonthlyCube.DIMENSIONS + MonthlyCube.MEASURES))
+
+    measures = pd.DataFrame({
+        'consumption': df_merged['consumption'],
+        'cost': df_merged['amount'].where(billable_fee_mask(df_merged)),
+        'term_count': ~df_merged['accrual_term_id'].duplicated(),
+    })
+
+    # Eksik fee_code/kanal satırları da küpte kalır (toplamlar term tablosuyla aynı olsun diye)
+    keys = [
+        df_merged[name] if name in df_merged.columns else pd.Series('UNKNOWN', index=df_merged.index, name=name)
+        for name in MonthlyCube.DIMENSIONS
+    ]
+    grouped = measures.groupby(keys, sort=True, dropna=False, observed=True)
+
+    cells = grouped[['consumption', 'cost', 'term_count']].sum()
+    cells['record_count'] = grouped.size()
+    cells = cells.reset_index()
+
+    for name in ('fee_prefix', 'channel_key'):
+        cells[name] = cells[name].astype(object).fillna('UNKNOWN')
+    for name in ('year', 'month'):
+        cells[name] = cells[name].astype('float64')
+
+    return MonthlyCube(cells[MonthlyCube.DIMENSIONS + MonthlyCube.MEASURES])
+
+
+def combine_cubes(cubes: Sequence[MonthlyCube]) -> MonthlyCube:
+    """
+    Verinin ayrık parçalarından oluşturulmuş küpleri birleştir.
+    Bir term'in tüm satırları aynı parçada olmalıdır (term_count her term'i bir kez sayar).
+
+    Args:
+        cubes: Parça küpleri
+
+    Returns:
+        Tüm veri için build_monthly_cube ile aynı küp
+    """
+    cells = [cube.cells for cube in cubes if not cube.empty]
+    if not cells:
+        return build_monthly_cube(pd.DataFrame())
+
+    combined = (
+        pd.concat(cells, ignore_index=True)
+        .groupby(MonthlyCube.DIMENSIONS, sort=True, dropna=False)[MonthlyCube.MEASURES]
+        .sum()
+        .reset_index()
+    )
+    return MonthlyCube(combined[MonthlyCube.DIMENSIONS + MonthlyCube.MEASURES])
+
+
+def optimize_dtypes(df: pd.DataFrame, protected: Sequence[str] = FLOAT64_COLUMNS) -> pd.DataFrame:
+    """
+    DataFrame'in sütun tiplerini bellek kullanımını azaltacak şekilde küçült.
+
+    - Az sayıda farklı değeri olan metin sütunları -> category
+    - Tam sayı sütunları -> en küçük uygun int tipi
+    - Eksik değer yüzünden float olan id sütunları -> nullable Int
+    - Diğer float sütunları -> float32 (sadece tüm değerler float32'de aynen korunuyorsa;
+      büyük tam sayılar, sıkıştırılmış tarihler ve ondalıklı ölçümler float64 kalır)
+
+    Tekrar uygulanabilir; zaten küçültülmüş sütunlar değişmez.
+
+    Args:
+        df: Optimize edilecek DataFrame (yerinde değiştirilir)
+        protected: float64 olarak kalacak sütunlar
+
+    Returns:
+        Optimize edilmiş DataFrame
+    """
+    for col in df.columns:
+        series = df[col]
+        dtype = series.dtype
+
+        if dtype == object:
+            if len(series) == 0 or pd.api.types.infer_dtype(series, skipna=True) != 'string':
+                continue
+            if series.nunique(dropna=True) <= Config.DTYPE_CATEGORY_MAX_RATIO * len(series):
+                df[col] = series.astype('category')
+
+        elif pd.api.types.is_integer_dtype(dtype):
+            df[col] = pd.to_numeric(series, downcast='integer')
+
+        elif pd.api.types.is_float_dtype(dtype) and col not in protected:
+            values = series.to_numpy(dtype='float64', na_value=np.nan)
+            finite = values[~np.isnan(values)]
+
+            if is_id_column(col) and np.array_equal(finite, np.floor(finite)):
+                df[col] = pd.to_numeric(series.astype('Int64'), downcast='integer')
+            elif dtype != np.float32:
+                downcast = values.astype(np.float32)
+                if np.array_equal(downcast.astype(np.float64), values, equal_nan=True):
+                    df[col] = downcast
+
+    return df
+
+
+def concat_frames(frames: Sequence[pd.DataFrame]) -> pd.DataFrame:
+    """
+    DataFrame'leri alt alta ekle; category sütunlarının kategorileri birleştirilir.
+    (pd.concat farklı kategorili sütunları object tipine çevirir.)
+
+    Args:
+        frames: Birleştirilecek DataFrame'ler
+
+    Returns:
+        Birleştirilmiş DataFrame
+    """
+    frames = list(frames)
+    categorical = {
+        col for df in frames for col, dtype in df.dtypes.items()
+        if isinstance(dtype, pd.CategoricalDtype)
+    }
+
+    for col in categorical:
+        values = [
+            df[col].cat.categories if isinstance(df[col].dtype, pd.CategoricalDtype)
+            else pd.Index(df[col].dropna().unique())
+            for df in frames if col in df.columns
+        ]
+        dtype = pd.CategoricalDtype(values[0].append(values[1:]).unique())
+
+        aligned = []
+        for df in frames:
+            if col in df.columns and df[col].dtype != dtype:
+                df = df.copy(deep=False)
+                df[col] = df[col].astype(dtype)
+            aligned.append(df)
+        frames = aligned
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def partition_by_accrual(
+    df_accruals: pd.DataFrame,
+    df_terms: pd.DataFrame,
+    df_fees: pd.DataFrame,
+    df_consumptions: pd.DataFrame,
+    shards: int
+) -> Optional[List[Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]]]:
+    """
+    Dört tabloyu accrual bazında parçalara ayır.
+    Her accrual'ın term, fee ve tüketim kayıtları aynı parçaya düşer; parçalar accruals
+    tablosunun ardışık dilimleridir (fee sayısına göre dengelenir). Böylece parçaların
+    birleştirme sonuçları sırayla eklendiğinde tek parçalı birleştirmeyle aynı satır
+    sırası elde edilir. Hiçbir eşleşmeye girmeyen kayıtlar (inner join'in eleyeceği
+    term/fee'ler, fee'si olmayan tüketimler) parçalara alınmaz.
+
+    Args:
+        df_accruals: Accruals tablosu
+        df_terms: Terms tablosu
+        df_fees: Fees tablosu
+        df_consumptions: Consumptions tablosu
+        shards: Parça sayısı
+
+    Returns:
+        (accruals, terms, fees, consumptions) parçaları; anahtarlar tekil ve dolu
+        değilse (bir kayıt birden fazla parçayla eşleşebilir) None
+    """
+    keys = [df_accruals['id'], df_terms['id'], df_fees['id']]
+    if any(key.hasnans or not key.is_unique for key in keys):
+        return None
+
+    def parent_position(index: pd.Index, values: pd.Series, parents: np.ndarray) -> np.ndarray:
+        """Kayıtların ait olduğu accrual'ın satır numarası (-1 = eşleşme yok)."""
+        positions = index.get_indexer(values)
+        return np.where(positions >= 0, parents[positions], -1) if len(parents) else positions
+
+    accrual_rows = np.arange(len(df_accruals))
+    term_accruals = parent_position(pd.Index(keys[0]), df_terms['accrual_id'], accrual_rows)
+    fee_accruals = parent_position(pd.Index(keys[1]), df_fees['accrual_term_id'], term_accruals)
+    if 'accrual_fee_id' in df_consumptions.columns:
+        consumption_accruals = parent_position(pd.Index(keys[2]), df_consumptions['accrual_fee_id'], fee_accruals)
+    else:
+        consumption_accruals = np.full(len(df_consumptions), -1)
+
+    # Accrual başına ağırlık: fee sayısı + 1; kümülatif ağırlığa göre ardışık dilimler
+    weights = np.bincount(fee_accruals[fee_accruals >= 0], minlength=len(df_accruals)) + 1
+    starts = np.cumsum(weights) - weights
+    accrual_shards = starts * shards // max(int(weights.sum()), 1)
+
+    def shard_of(parents: np.ndarray) -> np.ndarray:
+        return np.where(parents >= 0, accrual_shards[np.maximum(parents, 0)], -1)
+
+    assignments = [
+        accrual_shards, shard_of(term_accruals), shard_of(fee_accruals), shard_of(consumption_accruals)
+    ]
+    frames = [df_accruals, df_terms, df_fees, df_consumptions]
+
+    partitions = []
+    for shard in range(shards):
+        rows = [np.flatnonzero(assignment == shard) for assignment in assignments]
+        if len(rows[0]):
+            partitions.append(tuple(df.iloc[positions] for df, positions in zip(frames, rows)))
+    return partitions
+
+
+def join_tables(
+    df_accruals: pd.DataFrame,
+    df_terms: pd.DataFrame,
+    df_fees: pd.DataFrame,
+    df_consumptions: pd.DataFrame,
+    profiler: PipelineProfiler
+) -> pd.DataFrame:
+    """
+    Dört tabloyu pandas ile birleştir
+
+    Args:
+        df_accruals: Accruals tablosu
+        df_terms: Terms tablosu
+        df_fees: Fees tablosu
+        df_consumptions: Consumptions tablosu
+        profiler: Adımların ölçüldüğü profiler
+
+    Returns:
+        Birleştirilmiş ham DataFrame
+    """
+    # 1. Accruals ve Terms'i birleştir
+    # bi_accruals.id = bi_accrual_terms.accrual_id
+    with profiler.stage('merge', step='accruals+terms') as info:
+        df_merged = pd.merge(
+            df_accruals,
+            df_terms,
+            left_on='id',
+            right_on='accrual_id',
+            how='inner',  # inner join ile sadece eşleşenleri al
+            suffixes=('', '_term')
+        )
+        info['rows'] = len(df_merged)
+    print(f"  [OK] Accruals + Terms birlestirildi: {len(df_merged)} kayit")
+
+    # 2. Fees tablosunu ekle
+    # bi_accrual_terms.id = bi_accrual_fees.accrual_term_id
+    # İlk merge'den sonra terms'deki 'id' sütunu 'id_term' olarak geldi
+    with profiler.stage('merge', step='+fees') as info:
+        df_merged = pd.merge(
+            df_merged,
+            df_fees,
+            left_on='id_term',  # terms tablosundaki id (suffix almış hali)
+            right_on='accrual_term_id',
+            how='inner',
+            suffixes=('', '_fee')
+        )
+        info['rows'] = len(df_merged)
+    print(f"  [OK] Fees eklendi: {len(df_merged)} kayit")
+
+    # 3. Consumptions tablosunu ekle
+    # bi_accrual_fees.id = bi_accrual_fee_consumptions.accrual_fee_id
+    # Fees'deki 'id' sütunu şimdi 'id_fee' olarak var
+    with profiler.stage('merge', step='+consumptions') as info:
+        df_merged = pd.merge(
+            df_merged,
+            df_consumptions,
+            left_on='id_fee',
+            right_on='accrual_fee_id',
+            how='left',  # left join çünkü tüm fee'lerde consumption olmayabilir
+            suffixes=('', '_consumption')
+        )
+        info['rows'] = len(df_merged)
+    print(f"  [OK] Consumptions eklendi: {len(df_merged)} kayit")
+
+    return df_merged
+
+
+def add_derived_columns(
+    df_merged: pd.DataFrame,
+    backend: str,
+    profiler: PipelineProfiler,
+    term_totals: Optional[Dict[str, np.ndarray]] = None
+) -> pd.DataFrame:
+    """
+    Birleştirilmiş veriye hesaplanan sütunları ekle.
+    Term toplamları sadece aynı term'in satırlarına bağlıdır, bu yüzden
+    fonksiyon verinin term bazlı herhangi bir alt kümesine de uygulanabilir.
+
+    Args:
+        df_merged: Birleştirilmiş ham DataFrame
+        backend: Term toplamlarını hesaplayan motor ('pandas' veya 'polars')
+        profiler: Adımların ölçüldüğü profiler
+        term_totals: Önceden hesaplanmış total_consumption/term_total_cost dizileri
+            (verilmezse seçili motorla hesaplanır)
+
+    Returns:
+        Hesaplanan sütunları eklenmiş DataFrame
+    """
+    # 4. Hesaplanan sütunlar ekle
+
+    # Fee code'dan prefix çıkar (4AG, 4OG, URT, KAG, KOG, vb.)
+    if 'fee_code' in df_merged.columns:
+        # Prefix'i al (ilk 3-4 karakter veya ilk underscore'a kadar)
+        df_merged['fee_prefix'] = df_merged['fee_code'].str.split('_').str[0]
+        print(f"  [OK] Fee prefix'leri cikarildi")
+
+    # amount zaten unit_price × consumption olarak hesaplanmış durumda
+    # KDV eklemiyoruz, direkt amount kullanıyoruz
+
+    # Polars motorunda iki term toplamı tek bir planda hesaplanır
+    if (term_totals is None and backend == 'polars' and polars_backend.POLARS_SUPPORTED
+            and {'accrual_term_id', 'consumption', 'amount', 'unit_price'} <= set(df_merged.columns)):
+        with profiler.stage('aggregate', column='term_totals', backend='polars') as info:
+            term_totals = polars_backend.term_totals(df_merged, billable_fee_mask(df_merged))
+            info['rows'] = len(df_merged)
+
+    # Term toplamları groupby-transform ile doğrudan satırlara yazılır
+    # (toplamı ayrı hesaplayıp geri merge etmek tüm tablonun bir kopyasını daha üretir)
+    # Toplam tüketim hesapla (accrual_term_id bazında)
+    if 'consumption' in df_merged.columns:
+        # Her term için toplam tüketim (fee consumption'larının toplamı)
+        if 'total_consumption' in df_merged.columns:
+            del df_merged['total_consumption']
+        if term_totals is not None:
+            df_merged['total_consumption'] = term_totals['total_consumption']
+        else:
+            with profiler.stage('aggregate', column='total_consumption') as info:
+                df_merged['total_consumption'] = (
+                    df_merged['consumption']
+                    .groupby(df_merged['accrual_term_id'], sort=False)
+                    .transform('sum')
+                )
+                info['rows'] = len(df_merged)
+        print(f"  [OK] Toplam tuketim hesaplandi")
+
+    # Her term için toplam maliyet hesapla (KDV'siz, direkt amount toplamı)
+    # SADECE consumption > 0 olan fee'leri kullan (sabit ücretleri hariç tut)
+    if 'amount' in df_merged.columns and 'accrual_term_id' in df_merged.columns:
+        # Eski term_total_cost sütununu sil (varsa)
+        if 'term_total_cost' in df_merged.columns:
+            del df_merged['term_total_cost']
+
+        # Sadece tüketim olan fee'lerin maliyetini hesapla
+        # Filtre dışı satırlar NaN olur ve toplama katılmaz
+        if term_totals is not None:
+            df_merged['term_total_cost'] = term_totals['term_total_cost']
+        else:
+            has_consumption = billable_fee_mask(df_merged)
+            with profiler.stage('aggregate', column='term_total_cost') as info:
+                df_merged['term_total_cost'] = (
+                    df_merged['amount'].where(has_consumption)
+                    .groupby(df_merged['accrual_term_id'], sort=False)
+                    .transform('sum')
+                )
+                info['rows'] = len(df_merged)
+        print(f"  [OK] Toplam maliyet hesaplandi (Sadece tuketim olan fee'ler, KDV'siz)")
+
+    # Sütun isimlerini standardize et
+    if 'billable_channel_consumption' in df_merged.columns:
+        df_merged['consumption_value'] = df_merged['billable_channel_consumption'].fillna(0)
+
+    if 'channel_key' in df_merged.columns:
+        time_frame = df_merged['channel_key']
+        if isinstance(time_frame.dtype, pd.CategoricalDtype) and 'UNKNOWN' not in time_frame.cat.categories:
+            time_frame = time_frame.cat.add_categories('UNKNOWN')
+        df_merged['time_frame'] = time_frame.fillna('UNKNOWN')
+
+    # Null değerleri temizle
+    df_merged['total_consumption'] = df_merged['total_consumption'].fillna(0)
+    df_merged['amount'] = df_merged['amount'].fillna(0)
+    df_merged['term_total_cost'] = df_merged['term_total_cost'].fillna(0)
+
+    return df_merged
+
+
+def merge_frames(
+    df_accruals: pd.DataFrame,
+    df_terms: pd.DataFrame,
+    df_fees: pd.DataFrame,
+    df_consumptions: pd.DataFrame,
+    backend: str,
+    profiler: PipelineProfiler
+) -> pd.DataFrame:
+    """
+    Dört tabloyu tek süreçte birleştir ve hesaplanan sütunları ekle.
+    backend 'polars' ise birleştirme ve term toplamları Polars ile yapılır;
+    sonuç pandas motoruyla aynı pandas DataFrame'dir.
+
+    Args:
+        df_accruals: Accruals tablosu
+        df_terms: Terms tablosu
+        df_fees: Fees tablosu
+        df_consumptions: Consumptions tablosu
+        backend: Birleştirme motoru ('pandas' veya 'polars')
+        profiler: Adımların ölçüldüğü profiler
+
+    Returns:
+        Birleştirilmiş ve hesaplanan sütunları eklenmiş DataFrame
+    """
+    # Motor elle 'polars' yapılmış olsa da desteklenmeyen sürümde pandas kullanılır
+    if backend != 'polars' or not polars_backend.POLARS_SUPPORTED:
+        return add_derived_columns(
+            join_tables(df_accruals, df_terms, df_fees, df_consumptions, profiler), backend, profiler
+        )
+
+    with profiler.stage('merge', step='polars') as info:
+        df_merged, term_totals = polars_backend.merge_tables(
+            df_accruals, df_terms, df_fees, df_consumptions, billable_fee_mask(df_fees)
+        )
+        info['rows'] = len(df_merged)
+    print(f"  [OK] Tablolar Polars ile birlestirildi: {len(df_merged)} kayit")
+
+    return add_derived_columns(df_merged, backend, profiler, term_totals)
+
+
+def _merge_shard(
+    tables: Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame],
+    backend: str
+) -> pd.DataFrame:
+    """
+    Bir parçayı birleştir ve hesaplanan sütunlarını ekle (process pool içinde çalışır).
+    Alt süreçte veritabanı bağlantısı açılmaz, ölçüm yapılmaz ve çıktı yazdırılmaz.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        return merge_frames(*tables, backend, PipelineProfiler(enabled=False))
+
+
+# İşleme aşamaları ve bağımlı oldukları aşamalar:
+# ham tablolar -> tipli tablolar -> birleştirilmiş veri -> term tablosu / aylık küp
+STAGE_DEPENDENCIES: Dict[str, Tuple[str, ...]] = {
+    'raw': (),
+    'typed': ('raw',),
+    'joined': ('typed',),
+    'term_table': ('joined',),
+    'monthly_cube': ('joined',),
+}
+
+
+def _typed_table_property(table_name: str) -> property:
+    """
+    'typed' aşamasındaki bir tabloya attribute olarak erişim (df_accruals, df_fees, ...).
+    Atama yapmak 'typed' aşamasının yeni bir sürümünü oluşturur.
+
+    Args:
+        table_name: Kaynak tablo adı
+
+    Returns:
+        property
+    """
+    def getter(self) -> pd.DataFrame:
+        return self._peek_stage('typed', {}).get(table_name, pd.DataFrame())
+
+    def setter(self, df: pd.DataFrame):
+        tables = dict(self._peek_stage('typed', {}))
+        tables[table_name] = df
+        self._set_stage('typed', tables)
+
+    return property(getter, setter)
+
+
+def count_rows(value: Any) -> Optional[int]:
+    """
+    Bir aşama sonucunun kayıt sayısı (ölçüm kayıtları için)
+
+    Args:
+        value: DataFrame, tablo adı -> DataFrame sözlüğü veya MonthlyCube
+
+    Returns:
+        Kayıt sayısı (sözlükte toplam, küpte hücre sayısı) veya None
+    """
+    if isinstance(value, MonthlyCube):
+        return len(value.cells)
+    if isinstance(value, pd.DataFrame):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(len(df) for df in value.values() if isinstance(df, pd.DataFrame))
+    return None
+
 
 class EnergyDataProcessor:
     """
     Enerji fatura verilerini işleyen ana sınıf.
     Veritabanından veri okur, birleştirir ve analiz için hazırlar.
+
+    İşleme, STAGE_DEPENDENCIES'teki aşamalardan oluşan tembel bir grafiktir:
+    her aşama ilk istendiğinde hesaplanır, cache'lenir ve sadece girdisi olan
+    aşamalardan biri değiştiğinde yeniden hesaplanır. load_data, clean_and_prepare
+    ve merge_data aşamaları sırayla ve hemen hesaplayan sarmalayıcılardır.
     """
 
-    def __init__(self):
+    # Tipli tablolar ve birleştirilmiş veri aşamalarına attribute olarak erişim
+    df_accruals = _typed_table_property(Config.DB_TABLE_ACCRUALS)
+    df_fees = _typed_table_property(Config.DB_TABLE_ACCRUAL_FEES)
+    df_terms = _typed_table_property(Config.DB_TABLE_ACCRUAL_TERMS)
+    df_consumptions = _typed_table_property(Config.DB_TABLE_ACCRUAL_FEE_CONSUMPTIONS)
+
+    def __init__(self):
+        """
+        Veri işleyiciyi başlat
+        """
+        self.db_manager = get_database_manager()
+
+        # İşleyici Streamlit'te tüm oturumlarca paylaşılır: yükleme, yenileme, pencere genişletme
+        # ve aşama hesaplamaları aynı anda tek oturumda çalışır (aşamalar iç içe istendiği için RLock)
+        self._lock = threading.RLock()
+
+        # Aşama sonuçları, henüz okunmamış snapshot çerçeveleri ve sürümler.
+        # Bir aşama, hesaplandığı andaki girdi sürümleri değişmediyse günceldir.
+        self._stage_values: Dict[str, Any] = {}
+        self._stage_loaders: Dict[str, Callable[[], Any]] = {}
+        self._stage_versions: Dict[str, int] = {name: 0 for name in STAGE_DEPENDENCIES}
+        self._stage_inputs: Dict[str, Tuple[int, ...]] = {}
+
+        # 'tables'   = raw/typed aşamaları dört tabloyu tutar
+        # 'sql_join' = raw/typed aşamaları PostgreSQL'de birleştirilmiş tek tabloyu tutar
+        self.load_mode = Config.DB_LOAD_MODE
+
+        # Tablo bazında okunan sütunlar (Config.DB_TABLE_COLUMNS + ek sütunlar);
+        # ilk yüklemede information_schema'ya göre doğrulanır
+        self.table_columns: Dict[str, List[str]] = {
+            table_name: Config.get_table_columns(table_name) for table_name in Config.REQUIRED_DB_TABLES
+        }
+        self._columns_validated = False
+
+        # Yükleme penceresinin başlangıcı (term_date >= window_start, None = tüm geçmiş)
+        self.window_start: Optional[pd.Timestamp] = (
+            pd.Timestamp(year=pd.Timestamp.now().year - Config.LOAD_WINDOW_YEARS + 1, month=1, day=1)
+            if Config.LOAD_WINDOW_YEARS > 0 else None
+        )
+
+        # Birleştirme ve term toplamlarını çalıştıran motor ('pandas' veya 'polars')
+        self.backend = Config.PROCESSING_BACKEND
+        if self.backend == 'polars' and not polars_backend.POLARS_AVAILABLE:
+            print("[UYARI] Polars yüklü değil, pandas motoru kullanilacak. "
+                  "'pip install polars' ile yükleyebilirsiniz.")
+            self.backend = 'pandas'
+        elif self.backend == 'polars' and not polars_backend.POLARS_SUPPORTED:
+            print(f"[UYARI] Polars {polars_backend.pl.__version__} cok eski, pandas motoru kullanilacak. "
+                  "'pip install -r requirements-optional.txt' ile guncelleyebilirsiniz.")
+            self.backend = 'pandas'
+
+        # Birleştirmenin accrual bazında bölündüğü parça sayısı (1 = tek süreç)
+        self.shards = Config.PROCESSING_SHARDS if Config.PROCESSING_SHARDS > 0 else (os.cpu_count() or 1)
+
+        # Out-of-core mod: tablolar accrual parçaları halinde işlenir, fee detayı diskte kalır
+        self.out_of_core = Config.MEMORY_BUDGET_MB > 0
+        if self.out_of_core and self.load_mode != 'tables':
+            print("[UYARI] Out-of-core mod sadece 'tables' yukleme modunda kullanilabilir, kapatildi.")
+            self.out_of_core = False
+        self.fee_detail: Optional[FeeDetailStore] = FeeDetailStore() if self.out_of_core else None
+        if self.fee_detail is not None and not self.fee_detail.available:
+            print("[UYARI] Out-of-core mod icin PyArrow gerekli, tum veri bellekte islenecek.")
+            self.out_of_core, self.fee_detail = False, None
+
+        # Artımlı yükleme için tablo bazında son görülen watermark değerleri
+        self.watermarks: Dict[str, Any] = {}
+
+        # Son yüklemede tablo bazında geçen süre (saniye)
+        self.load_timings: Dict[str, float] = {}
+
+        # Aşama bazında süre/CPU/bellek/kayıt ölçümleri (Config.LOG_FILE'a da yazılır)
+        self.profiler = PipelineProfiler()
+
+        # Yerel snapshot deposu (kapalıysa None)
+        self.snapshot_store: Optional[SnapshotStore] = SnapshotStore() if Config.SNAPSHOT_ENABLED else None
+
+        # Süreçler arası paylaşılan veri dosyası (kapalıysa veya out-of-core modda None)
+        self.shared_dataset: Optional[SharedDataset] = (
+            SharedDataset() if Config.SHARED_DATASET_ENABLED and not self.out_of_core else None
+        )
+
+    @property
+    def df_merged(self) -> pd.DataFrame:
+        """Birleştirilmiş veri ('joined' aşaması; hesaplanmamışsa boş DataFrame)"""
+        return self._peek_stage('joined', pd.DataFrame())
+
+    @df_merged.setter
+    def df_merged(self, df: pd.DataFrame):
+        self._set_stage('joined', df)
+
+    def stage(self, name: str) -> Any:
+        """
+        Bir işleme aşamasının sonucunu döndür.
+        Güncel değilse önce girdisi olan aşamalar, sonra aşamanın kendisi hesaplanır;
+        snapshot'tan tohumlanmış aşamalar ilk istendiklerinde diskten okunur.
+
+        Args:
+            name: Aşama adı ('raw', 'typed', 'joined', 'term_table', 'monthly_cube')
+
+        Returns:
+            Aşamanın sonucu
+
+        Raises:
+            Exception: Veritabanından okuma başarısız olursa
+        """
+        with self._lock:
+            if not self._is_stage_stale(name) and name not in self._stage_values:
+                loader = self._stage_loaders.pop(name, None)
+                if loader is not None:
+                    try:
+                        self._stage_values[name] = loader()
+                    except Exception as e:
+                        print(f"[UYARI] '{name}' asamasi snapshot'tan okunamadi, yeniden hesaplanacak: {e}")
+
+            if self._is_stage_stale(name) or name not in self._stage_values:
+                inputs = [self.stage(dependency) for dependency in STAGE_DEPENDENCIES[name]]
+                with self.profiler.stage(f'stage:{name}') as info:
+                    value = getattr(self, f'_build_{name}')(*inputs)
+                    info['rows'] = count_rows(value)
+                self._set_stage(name, value)
+
+            return self._stage_values[name]
+
+    def invalidate(self, name: str):
+        """
+        Aşamayı ve ona bağlı tüm aşamaları geçersiz kıl (sonraki istekte yeniden hesaplanır)
+
+        Args:
+            name: Aşama adı
+        """
+        for stage_name, dependencies in STAGE_DEPENDENCIES.items():
+            if stage_name == name or name in dependencies:
+                self._stage_values.pop(stage_name, None)
+                self._stage_loaders.pop(stage_name, None)
+                self._stage_inputs.pop(stage_name, None)
+                if stage_name != name:
+                    self.invalidate(stage_name)
+
+    def _is_stage_stale(self, name: str) -> bool:
+        """Aşama hiç hesaplanmamış ya da geçersiz kılınmış mı, veya girdileri değişmiş mi?"""
+        return name not in self._stage_inputs or self._is_stage_outdated(name)
+
+    def _is_stage_outdated(self, name: str) -> bool:
+        """
+        Aşama hesaplandıktan sonra zincirdeki bir girdisi değişti mi?
+        Hiç hesaplanmamış girdiler (ör. dışarıdan atanmış tablolar) değişmiş sayılmaz.
+        """
+        inputs = self._stage_inputs.get(name)
+        if inputs is None:
+            return False
+
+        dependencies = STAGE_DEPENDENCIES[name]
+        if inputs != tuple(self._stage_versions[d] for d in dependencies):
+            return True
+        return any(self._is_stage_outdated(dependency) for dependency in dependencies)
+
+    def _peek_stage(self, name: str, default: Any) -> Any:
+        """
+        Güncel aşamanın sonucunu hesaplama yapmadan döndür
+        (tohumlanmış aşama diskten okunur; güncel değilse ya da bellekten atıldıysa default)
+        """
+        if self._is_stage_stale(name):
+            return default
+        if name not in self._stage_values and name not in self._stage_loaders:
+            return default
+        return self.stage(name)
+
+    def _set_stage(self, name: str, value: Any):
+        """Aşamanın yeni sürümünü kaydet; bu aşamaya bağlı aşamalar güncelliğini yitirir."""
+        self._stage_values[name] = value
+        self._stage_loaders.pop(name, None)
+        self._record_stage_version(name)
+
+    def _seed_stage(self, name: str, loader: Optional[Callable[[], Any]]):
+        """
+        Aşamayı hesaplamadan güncel olarak işaretle (snapshot'tan).
+        loader ilk istekte çağrılır; None ise aşama bellekten atılmış sayılır.
+        """
+        self._stage_values.pop(name, None)
+        self._stage_loaders.pop(name, None)
+        if loader is not None:
+            self._stage_loaders[name] = loader
+        self._record_stage_version(name)
+
+    def _release_stage(self, name: str):
+        """Aşamanın sonucunu bellekten at; bağlı aşamalar güncel kalır (tekrar istenirse yeniden hesaplanır)."""
+        self._stage_values.pop(name, None)
+        self._stage_loaders.pop(name, None)
+
+    def _record_stage_version(self, name: str):
+        """Aşamanın sürümünü artır ve girdilerinin güncel sürümlerini kaydet."""
+        self._stage_versions[name] += 1
+        self._stage_inputs[name] = tuple(self._stage_versions[d] for d in STAGE_DEPENDENCIES[name])
+
+    def load_data(self) -> bool:
+        """
+        Veritabanından verileri yükle ('raw' aşaması; mevcut veri geçersiz kılınır)
+
+        Returns:
+            bool: Yükleme başarılıysa True, değilse False
+        """
+        self.invalidate('raw')
+        try:
+            self.stage('raw')
+            return True
+        except Exception as e:
+            print(f"[HATA] Veritabani yuklemede hata: {e}")
+            return False
+
+    def _build_raw(self) -> Dict[str, pd.DataFrame]:
+        """
+        'raw' aşaması: veritabanından okunan, henüz dönüştürülmemiş tablolar
+
+        Returns:
+            Tablo adı -> DataFrame ('sql_join' modunda {'joined': DataFrame})
+        """
+        if self.load_mode == 'sql_join':
+            return self._load_joined_from_database()
+        return self._load_from_database()
+
+    def _load_from_database(self) -> Dict[str, pd.DataFrame]:
+        """
+        Veritabanından tüm tabloları yükle
+
+        Returns:
+            Tablo adı -> DataFrame
+        """
+        print("[YUKLE] Veritabanindan veriler yukleniyor...")
+        if self.window_start is not None:
+            print(f"[PENCERE] Sadece {self.window_start.date()} ve sonrasindaki term'ler yukleniyor")
+
+        frames, watermarks = self._read_tables(self._windowed(
+            {table_name: {} for table_name in Config.REQUIRED_DB_TABLES}, self.window_start
+        ))
+
+        # Watermark'lar sadece tüm tablolar başarıyla okunduktan sonra atanır
+        self.watermarks = {}
+        self._commit_watermarks(watermarks)
+
+        print("[OK] Veritabanindan tum tablolar basariyla yuklendi!\n")
+        return frames
+
+    def _windowed(
+        self,
+        requests: Dict[str, Dict[str, Any]],
+        start: Any = None,
+        end: Any = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        _read_tables isteklerine yükleme penceresi koşullarını ekle.
+        Pencere term'lere term_date ile uygulanır; accrual, fee ve tüketimler
+        pencere içindeki term'ler üzerinden semi-join (IN alt sorgusu) ile seçilir.
+
+        Args:
+            requests: Tablo adı -> {'where', 'params'}
+            start: Pencere başlangıcı (dahil, None = sınırsız)
+            end: Pencere bitişi (hariç, None = sınırsız)
+
+        Returns:
+            Koşulları eklenmiş istekler (pencere yoksa aynen)
+        """
+        bounds, window_params = term_date_bounds('term_date', start, end)
+        if bounds is None:
+            return requests
+
+        terms = Config.get_full_table_name(Config.DB_TABLE_ACCRUAL_TERMS)
+        fees = Config.get_full_table_name(Config.DB_TABLE_ACCRUAL_FEES)
+        joined_bounds, _ = term_date_bounds('t.term_date', start, end)
+        window = {
+            Config.DB_TABLE_ACCRUALS: f"id IN (SELECT accrual_id FROM {terms} WHERE {bounds})",
+            Config.DB_TABLE_ACCRUAL_TERMS: bounds,
+            Config.DB_TABLE_ACCRUAL_FEES: f"accrual_term_id IN (SELECT id FROM {terms} WHERE {bounds})",
+            Config.DB_TABLE_ACCRUAL_FEE_CONSUMPTIONS: (
+                f"accrual_fee_id IN (SELECT f.id FROM {fees} f JOIN {terms} t ON t.id = f.accrual_term_id "
+                f"WHERE {joined_bounds})"
+            ),
+        }
+
+        windowed = {}
+        for table_name, request in requests.items():
+            where = request.get('where')
+            windowed[table_name] = {
+                **request,
+                'where': f"({where}) AND {window[table_name]}" if where else window[table_name],
+                'params': {**(request.get('params') or {}), **window_params},
+            }
+        return windowed
+
+    def validate_columns(self) -> bool:
+        """
+        Okunacak sütunları information_schema.columns'a göre doğrula (işlemci başına bir kez).
+        Sütunları okunamayan tablolar atlanır; eksik tablo yüklemede raporlanır.
+
+        Returns:
+            bool: Eksik sütun yoksa True
+        """
+        if self._columns_validated:
+            return True
+
+        existing = self.db_manager.get_column_names(Config.REQUIRED_DB_TABLES)
+        missing = {
+            table_name: [col for col in columns if col not in existing[table_name]]
+            for table_name, columns in self.table_columns.items()
+            if existing.get(table_name)
+        }
+        missing = {table_name: columns for table_name, columns in missing.items() if columns}
+        if missing:
+            for table_name, columns in missing.items():
+                print(f"[HATA] {table_name} tablosunda sutunlar bulunamadi: {', '.join(columns)}")
+            return False
+
+        self._columns_validated = True
+        return True
+
+    def fetch_columns(
+        self,
+        table_name: str,
+        columns: Sequence[str],
+        where: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None
+    ) -> pd.DataFrame:
+        """
+        Manifestte olmayan sütunları ihtiyaç anında oku (işlenmiş veriye eklenmez).
+        Sonuç id ile birlikte döner; birleştirilmiş veriye id üzerinden eklenebilir.
+
+        Args:
+            table_name: Tablo adı
+            columns: Okunacak ek sütunlar
+            where: Opsiyonel WHERE koşulu (bind parametreli)
+            params: WHERE koşulundaki parametreler
+
+        Returns:
+            id + istenen sütunlar (tarih/sayısal dönüşümler uygulanmış)
+        """
+        df, _ = self._read_table(table_name, where, params, columns=list(dict.fromkeys(['id', *columns])))
+        return self._prepare_table(table_name, df)
+
+    def table_query(self, table_name: str, where: Optional[str] = None, columns: Optional[Sequence[str]] = None) -> str:
+        """
+        Tek tablo okuma sorgusu (_read_table'ın çalıştırdığı SELECT)
+
+        Args:
+            table_name: Tablo adı
+            where: Opsiyonel WHERE koşulu (bind parametreli)
+            columns: Okunacak sütunlar (varsayılan: self.table_columns)
+
+        Returns:
+            str: SQL sorgusu
+        """
+        columns = columns or self.table_columns.get(table_name) or Config.get_table_columns(table_name)
+        query = f"SELECT {', '.join(columns)} FROM {Config.get_full_table_name(table_name)}"
+        if where:
+            query += f" WHERE {where}"
+        return query
+
+    def _read_table(
+        self,
+        table_name: str,
+        where: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None,
+        columns: Optional[Sequence[str]] = None
+    ) -> Tuple[pd.DataFrame, Any]:
+        """
+        Tek bir tabloyu veritabanından oku (sadece manifestteki sütunlar)
+
+        Args:
+            table_name: Okunacak tablo adı
+            where: Opsiyonel WHERE koşulu (bind parametreli, örn: "id > :watermark")
+            params: WHERE koşulundaki parametreler
+            columns: Okunacak sütunlar (varsayılan: self.table_columns)
+
+        Returns:
+            (Tablo verisi, ham veriden hesaplanan watermark değeri)
+        """
+        return self._read_sql(
+            self.table_query(table_name, where, columns),
+            params=params,
+            table_names=[table_name],
+            watermark_column=Config.DB_WATERMARK_COLUMNS.get(table_name, 'id')
+        )
+
+    def _read_sql(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]] = None,
+        table_names: Sequence[str] = (),
+        watermark_column: Optional[str] = None
+    ) -> Tuple[pd.DataFrame, Any]:
+        """
+        Sorguyu Config.DB_LOADER'da seçilen yöntemle çalıştır
+
+        Args:
+            query: SQL sorgusu
+            params: Bind parametreleri
+            table_names: Sonucun sütunlarını içeren tablolar (akışlı modda
+                parçalar bu tabloların dönüşümleriyle hazırlanır)
+            watermark_column: Watermark'ı hesaplanacak sütun
+
+        Returns:
+            (Sorgu sonucu, ham veriden hesaplanan watermark değeri)
+        """
+        if Config.DB_LOADER == 'copy':
+            return self._read_sql_copy(query, params, table_names, watermark_column)
+
+        engine = self.db_manager.get_engine()
+        with engine.connect() as connection:
+            if Config.DB_LOADER == 'stream':
+                return self._read_sql_stream(connection, query, params, table_names, watermark_column)
+
+            df = pd.read_sql(text(query), connection, params=params)
+            return df, self._raw_watermark(df, watermark_column)
+
+    def _read_sql_stream(
+        self,
+        connection,
+        query: str,
+        params: Optional[Dict[str, Any]],
+        table_names: Sequence[str],
+        watermark_column: Optional[str]
+    ) -> Tuple[pd.DataFrame, Any]:
+        """
+        Sorguyu server-side cursor ile DB_CHUNK_SIZE'lık parçalar halinde oku
+
+        Args:
+            connection: SQLAlchemy bağlantısı
+            query: SQL sorgusu
+            params: Bind parametreleri
+            table_names: Parçalara uygulanacak tablo dönüşümleri
+            watermark_column: Watermark'ı hesaplanacak sütun
+
+        Returns:
+            (Sorgu sonucu, ham veriden hesaplanan watermark değeri)
+        """
+        connection = connection.execution_options(
+            stream_results=True,
+            max_row_buffer=Config.DB_CHUNK_SIZE
+        )
+        chunks = pd.read_sql(text(query), connection, params=params, chunksize=Config.DB_CHUNK_SIZE)
+        return self._assemble_chunks(chunks, table_names, watermark_column)
+
+    def _read_sql_copy(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]],
+        table_names: Sequence[str],
+        watermark_column: Optional[str]
+    ) -> Tuple[pd.DataFrame, Any]:
+        """
+        Sorguyu PostgreSQL COPY ... TO STDOUT (CSV) ile oku.
+
+        CSV akışı geçici bir dosyaya (küçükse bellekte) yazılır ve pandas'ın C
+        parser'ı ile parça parça tipli sütunlara çevrilir. Sadece id ve sayısal
+        sütunların tipi çıkarılır; diğer sütunlar (tarihler, fee_code, channel_key)
+        string okunur. Böylece rakamdan oluşan kodlar baştaki sıfırlarını kaybetmez,
+        parçalar arasında tip değişmez ve sonuç read_sql yolundakiyle aynı olur.
+
+        Args:
+            query: SQL sorgusu
+            params: Bind parametreleri
+            table_names: Parçalara uygulanacak tablo dönüşümleri
+            watermark_column: Watermark'ı hesaplanacak sütun
+
+        Returns:
+            (Sorgu sonucu, ham veriden hesaplanan watermark değeri)
+        """
+        numeric_columns = {col for table_name in table_names for col in NUMERIC_COLUMNS.get(table_name, [])}
+
+        with tempfile.SpooledTemporaryFile(max_size=Config.DB_COPY_SPOOL_MB * 1024 * 1024) as buffer:
+            self.db_manager.copy_query(query, buffer, params=params)
+            buffer.seek(0)
+            header = next(csv.reader([buffer.readline().decode('utf-8')]), [])
+            buffer.seek(0)
+
+            chunks = pd.read_csv(
+                buffer,
+                encoding='utf-8',
+                na_values=['\\N'],
+                keep_default_na=False,
+                dtype={col: str for col in header if col not in numeric_columns and not is_id_column(col)},
+                float_precision='round_trip',  # Hızlı ayrıştırıcı son basamakta read_sql'den farklı sonuç verebilir
+                chunksize=Config.DB_CHUNK_SIZE
+            )
+            return self._assemble_chunks(chunks, table_names, watermark_column)
+
+    def _assemble_chunks(
+        self,
+        chunks: Iterable[pd.DataFrame],
+        table_names: Sequence[str],
+        watermark_column: Optional[str]
+    ) -> Tuple[pd.DataFrame, Any]:
+        """
+        Parça parça gelen sonucu tek DataFrame'e topla.
+
+        Her parça gelir gelmez tarih/sayısal dönüşümlerden geçirilir ve sütun
+        bazında biriktirilir; ham satırların tamamı hiçbir zaman bellekte
+        tutulmaz. Bellek kullanımı nihai veri boyutuna yakın kalır.
+
+        Args:
+            chunks: DataFrame parçaları
+            table_names: Parçalara uygulanacak tablo dönüşümleri
+            watermark_column: Watermark'ı hesaplanacak sütun
+
+        Returns:
+            (Birleştirilmiş veri, ham veriden hesaplanan watermark değeri)
+        """
+        buffers: Dict[str, List[pd.Series]] = {}
+        watermark = None
+
+        for chunk in chunks:
+            # Watermark dönüşümden önce ham değerlerden alınır
+            chunk_watermark = self._raw_watermark(chunk, watermark_column)
+            if chunk_watermark is not None:
+                watermark = chunk_watermark if watermark is None else max(watermark, chunk_watermark)
+
+            for table_name in table_names:
+                chunk = self._prepare_table(table_name, chunk)
+
+            for col in chunk.columns:
+                buffers.setdefault(col, []).append(chunk[col])
+
+        # Sütun bazında birleştir; her sütunun parçaları birleştirilir birleştirilmez bırakılır
+        data = {}
+        for col in list(buffers):
+            parts = buffers.pop(col)
+            data[col] = pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0]
+
+        return pd.DataFrame(data), watermark
+
+    def _read_tables(
+        self,
+        requests: Dict[str, Dict[str, Any]]
+    ) -> Tuple[Dict[str, pd.DataFrame], Dict[str, Any]]:
+        """
+        Birden fazla tabloyu oku. Config.DB_PARALLEL_LOAD açıksa her tablo
+        connection pool'dan ayrı bir bağlantı ile paralel okunur; toplam süre
+        en yavaş tablo kadar olur.
+
+        Args:
+            requests: Tablo adı -> _read_table'a verilecek argümanlar (where, params)
+
+        Returns:
+            (Tablo adı -> DataFrame, tablo adı -> watermark), requests ile aynı sırada
+
+        Raises:
+            RuntimeError: Herhangi bir tablo okunamazsa (diğer okumalar iptal edilir)
+        """
+        self.load_timings = {}
+
+        def read(table_name: str) -> Tuple[pd.DataFrame, Any]:
+            start = time.perf_counter()
+            with self.profiler.stage('load_table', table=table_name, loader=Config.DB_LOADER) as info:
+                df, watermark = self._read_table(table_name, **requests[table_name])
+                info['rows'] = len(df)
+            self.load_timings[table_name] = time.perf_counter() - start
+            print(f"[OK] {table_name} yuklendi: {len(df)} kayit "
+                  f"({self.load_timings[table_name]:.2f} sn)")
+            return df, watermark
+
+        results: Dict[str, Tuple[pd.DataFrame, Any]] = {}
+
+        if not Config.DB_PARALLEL_LOAD or len(requests) <= 1:
+            for table_name in requests:
+                results[table_name] = read(table_name)
+        else:
+            workers = max(1, min(len(requests), Config.DB_LOAD_WORKERS))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="db-load") as executor:
+                futures = {executor.submit(read, table_name): table_name for table_name in requests}
+                for future in as_completed(futures):
+                    table_name = futures[future]
+                    try:
+                        results[table_name] = future.result()
+                    except Exception as e:
+                        # Henüz başlamamış okumaları iptal et
+                        for pending in futures:
+                            pending.cancel()
+                        raise RuntimeError(f"{table_name} okunamadi: {e}") from e
+
+        frames = {table_name: results[table_name][0] for table_name in requests}
+        watermarks = {table_name: results[table_name][1] for table_name in requests}
+        return frames, watermarks
+
+    def _raw_watermark(self, df: pd.DataFrame, column: Optional[str]) -> Any:
+        """
+        Ham (dönüştürülmemiş) veriden watermark değerini hesapla
+
+        Args:
+            df: Veritabanından okunan ham veri
+            column: Watermark sütunu
+
+        Returns:
+            Sütunun en büyük değeri (Python tipinde) veya None
+        """
+        if column is None or df.empty or column not in df.columns:
+            return None
+
+        value = df[column].max()
+        if pd.isna(value):
+            return None
+
+        # numpy skalerlerini veritabanı sürücüsünün anlayacağı Python tiplerine çevir
+        if isinstance(value, np.generic):
+            value = value.item()
+        return value
+
+    def _commit_watermarks(self, watermarks: Dict[str, Any]):
+        """
+        Başarıyla işlenen okumaların watermark değerlerini kaydet
+
+        Args:
+            watermarks: Tablo adı -> watermark (None ise değişmez)
+        """
+        for table_name, value in watermarks.items():
+            if value is None:
+                continue
+            current = self.watermarks.get(table_name)
+            self.watermarks[table_name] = value if current is None else max(current, value)
+
+    def _load_joined_from_database(self) -> Dict[str, pd.DataFrame]:
+        """
+        Dört tabloyu PostgreSQL tarafında birleştirerek yükle.
+        Sadece uygulamanın kullandığı sütunlar çekilir, pandas'ta merge yapılmaz.
+
+        Returns:
+            {'joined': birleştirilmiş ham veri}
+        """
+        print("[YUKLE] Tablolar veritabaninda birlestirilerek yukleniyor...")
+
+        query = build_joined_query(self.table_columns)
+        bounds, params = term_date_bounds('t.term_date', self.window_start)
+        if bounds is not None:
+            print(f"[PENCERE] Sadece {self.window_start.date()} ve sonrasindaki term'ler yukleniyor")
+            query += f"\nWHERE {bounds}"
+
+        with self.profiler.stage('load_table', table='joined', loader='read_sql') as info:
+            df_joined, _ = self._read_sql(
+                query,
+                params=params or None,
+                table_names=Config.REQUIRED_DB_TABLES
+            )
+            info['rows'] = len(df_joined)
+        print(f"[OK] Birlestirilmis veri yuklendi: {len(df_joined)} kayit\n")
+        return {'joined': df_joined}
+
+    def clean_and_prepare(self):
+        """
+        Verileri temizle ve analiz için hazırla ('typed' aşaması)
+        - Tarih formatlarını düzelt
+        - Eksik verileri kontrol et
+        - Veri tiplerini düzelt
+        """
+        try:
+            self.stage('typed')
+        except Exception as e:
+            print(f"[HATA] Veri temizlemede hata: {e}")
+
+    def _build_typed(self, raw: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+        """
+        'typed' aşaması: tarih/sayısal dönüşümleri yapılmış, veri tipleri küçültülmüş tablolar.
+        Ham tablolar yerinde dönüştürülür; 'raw' aşaması bellekten atılır.
+
+        Args:
+            raw: 'raw' aşamasının tabloları
+
+        Returns:
+            Tablo adı -> DataFrame
+        """
+        print("[TEMIZLE] Veriler temizleniyor ve hazirlaniyor...")
+
+        if self.load_mode == 'sql_join':
+            return self._clean_joined(raw)
+
+        tables = dict(raw)
+        self._release_stage('raw')
+
+        # Veri yüklenmiş mi kontrol et
+        if any(tables.get(name, pd.DataFrame()).empty
+               for name in (Config.DB_TABLE_ACCRUAL_TERMS, Config.DB_TABLE_ACCRUALS)):
+            print("[HATA] Veri yuklenemedi, temizleme atlanıyor!")
+            return tables
+
+        # Tarih sütunlarını datetime formatına çevir
+        # Format: YYYYMMDDHHmmss (örn: 20250226141640)
+        for table_name in (Config.DB_TABLE_ACCRUALS, Config.DB_TABLE_ACCRUAL_TERMS):
+            tables[table_name] = self._prepare_table(table_name, tables[table_name])
+        if 'term_date' in tables[Config.DB_TABLE_ACCRUAL_TERMS].columns:
+            print("  [OK] Tarih formatlari duzeltildi")
+
+        # Sayısal sütunları kontrol et ve düzelt
+        for table_name in (Config.DB_TABLE_ACCRUAL_FEES, Config.DB_TABLE_ACCRUAL_FEE_CONSUMPTIONS):
+            tables[table_name] = self._prepare_table(table_name, tables[table_name])
+        print("  [OK] Sayisal degerler duzeltildi")
+
+        self._optimize_frames(tables)
+
+        # Eksik verileri kontrol et
+        print("\n[VERI] Eksik Veri Kontrolu:")
+        print(f"  - Accruals eksik: {tables[Config.DB_TABLE_ACCRUALS].isnull().sum().sum()}")
+        print(f"  - Terms eksik: {tables[Config.DB_TABLE_ACCRUAL_TERMS].isnull().sum().sum()}")
+        print(f"  - Consumptions eksik: {tables[Config.DB_TABLE_ACCRUAL_FEE_CONSUMPTIONS].isnull().sum().sum()}")
+
+        print("[OK] Veri temizleme tamamlandi!\n")
+        return tables
+
+    def _clean_joined(self, raw: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+        """
+        'sql_join' modunda birleştirilmiş veriyi temizle.
+        Tablo bazlı tarih ve sayısal dönüşümler tek DataFrame üzerinde yapılır.
+
+        Args:
+            raw: {'joined': birleştirilmiş ham veri}
+
+        Returns:
+            {'joined': dönüştürülmüş veri}
+        """
+        df_joined = raw.get('joined', pd.DataFrame())
+        self._release_stage('raw')
+
+        if df_joined.empty:
+            print("[HATA] Veri yuklenemedi, temizleme atlanıyor!")
+            return {'joined': df_joined}
+
+        for table_name in Config.REQUIRED_DB_TABLES:
+            df_joined = self._prepare_table(table_name, df_joined)
+        print("  [OK] Tarih formatlari ve sayisal degerler duzeltildi")
+
+        print("\n[VERI] Eksik Veri Kontrolu:")
+        print(f"  - Birlestirilmis veri eksik: {df_joined.isnull().sum().sum()}")
+
+        print("[OK] Veri temizleme tamamlandi!\n")
+        return {'joined': df_joined}
+
+    def _prepare_table(self, table_name: str, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Bir tablonun tarih ve sayısal sütunlarını dönüştür.
+        Terms tablosu için yıl ve ay sütunlarını da ekler.
+
+        Args:
+            table_name: Kaynak tablo adı (DATE_COLUMNS/NUMERIC_COLUMNS anahtarı)
+            df: Dönüştürülecek DataFrame
+
+        Returns:
+            Dönüştürülmüş DataFrame
+        """
+        # Akışlı yüklemede parçalar zaten dönüştürülmüş gelir, tekrar dönüştürülmez
+        for col in DATE_COLUMNS.get(table_name, []):
+            if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
+                with self.profiler.stage('parse_dates', table=table_name, column=col) as info:
+                    df[col] = parse_compact_datetime(df[col])
+                    info['rows'] = len(df)
+
+        # Yıl ve ay bilgilerini ayrı sütunlar olarak ekle
+        if table_name == Config.DB_TABLE_ACCRUAL_TERMS and 'term_date' in df.columns:
+            df['year'] = df['term_date'].dt.year  # type: ignore
+            df['month'] = df['term_date'].dt.month  # type: ignore
+
+        for col in NUMERIC_COLUMNS.get(table_name, []):
+            if col in df.columns and not pd.api.types.is_numeric_dtype(df[col]):
+                df[col] = pd.to_numeric(df[col], errors='coerce')
+
+        return df
+
+    def merge_data(self):
+        """
+        Tüm tabloları birleştir ve analiz için tek bir DataFrame oluştur ('joined' aşaması)
+        """
+        try:
+            df_merged = self.stage('joined')
+        except Exception as e:
+            print(f"[HATA] Birlestirmede hata: {e}")
+            return
+
+        if not df_merged.empty:
+            self._print_summary()
+
+    def _build_joined(self, typed: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """
+        'joined' aşaması: birleştirilmiş ve hesaplanan sütunları eklenmiş fee seviyesi veri
+
+        Args:
+            typed: 'typed' aşamasının tabloları
+
+        Returns:
+            Birleştirilmiş DataFrame (veri yoksa boş)
+        """
+        print("[BIRLESTIR] Tablolar birlestiriliyor...")
+
+        if self.load_mode == 'sql_join':
+            # Birleştirme veritabanında yapıldı, sadece hesaplanan sütunlar eklenir
+            df_merged = typed.get('joined', pd.DataFrame())
+            if df_merged.empty:
+                print("[HATA] Veri yuklenemedi, birlestirme atlanıyor!")
+                return pd.DataFrame()
+            print(f"  [OK] Tablolar veritabaninda birlestirildi: {len(df_merged)} kayit")
+            # Hesaplanan sütunlar aynı DataFrame'e eklenir, ayrı bir kopya tutulmaz
+            self._release_stage('typed')
+            df_merged = self._add_derived_columns(df_merged)
+        else:
+            # Veri yüklenmiş mi kontrol et
+            if any(typed.get(name, pd.DataFrame()).empty for name in (
+                    Config.DB_TABLE_ACCRUALS, Config.DB_TABLE_ACCRUAL_TERMS, Config.DB_TABLE_ACCRUAL_FEES)):
+                print("[HATA] Veri yuklenemedi, birlestirme atlanıyor!")
+                return pd.DataFrame()
+            df_merged = self._merge_tables(
+                typed[Config.DB_TABLE_ACCRUALS],
+                typed[Config.DB_TABLE_ACCRUAL_TERMS],
+                typed[Config.DB_TABLE_ACCRUAL_FEES],
+                typed.get(Config.DB_TABLE_ACCRUAL_FEE_CONSUMPTIONS, pd.DataFrame()),
+            )
+
+        self._optimize_frames({'df_merged': df_merged})
+        print("[OK] Tum tablolar basariyla birlestirildi!\n")
+        return df_merged
+
+    def _build_term_table(self, df_merged: pd.DataFrame) -> pd.DataFrame:
+        """'term_table' aşaması (bkz. build_term_table)"""
+        return build_term_table(df_merged)
+
+    def _build_monthly_cube(self, df_merged: pd.DataFrame) -> MonthlyCube:
+        """'monthly_cube' aşaması (bkz. build_monthly_cube)"""
+        return build_monthly_cube(df_merged)
+
+    def _merge_tables(
+        self,
+        df_accruals: pd.DataFrame,
+        df_terms: pd.DataFrame,
+        df_fees: pd.DataFrame,
+        df_consumptions: pd.DataFrame
+    ) -> pd.DataFrame:
+        """
+        Dört tabloyu birleştir ve hesaplanan sütunları ekle.
+        Config.PROCESSING_BACKEND 'polars' ise birleştirme ve term toplamları
+        Polars ile yapılır; sonuç pandas motoruyla aynı pandas DataFrame'dir.
+        Config.PROCESSING_SHARDS > 1 ise tablolar accrual bazında parçalara ayrılıp
+        process pool'da birleştirilir (bkz. partition_by_accrual).
+
+        Args:
+            df_accruals: Accruals tablosu
+            df_terms: Terms tablosu
+            df_fees: Fees tablosu
+            df_consumptions: Consumptions tablosu
+
+        Returns:
+            Birleştirilmiş ve hesaplanan sütunları eklenmiş DataFrame
+        """
+        if self.shards > 1 and len(df_fees) >= Config.PROCESSING_SHARD_MIN_ROWS:
+            partitions = partition_by_accrual(df_accruals, df_terms, df_fees, df_consumptions, self.shards)
+            if partitions is None:
+                print("  [UYARI] id sutunlari tekil degil, parcali birlestirme yerine tek surec kullaniliyor")
+            elif partitions:
+                return self._merge_sharded(partitions)
+
+        return merge_frames(df_accruals, df_terms, df_fees, df_consumptions, self.backend, self.profiler)
+
+    def _merge_sharded(
+        self,
+        partitions: List[Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]]
+    ) -> pd.DataFrame:
+        """
+        Parçaları process pool'da birleştir ve sonuçları parça sırasıyla ekle.
+        Term toplamları term'in kendi satırlarına bağlı olduğundan parça bazında
+        hesaplanan sütunlar tek süreçli birleştirmeyle aynıdır.
+
+        Args:
+            partitions: partition_by_accrual parçaları
+
+        Returns:
+            Birleştirilmiş ve hesaplanan sütunları eklenmiş DataFrame
+        """
+        workers = min(len(partitions), os.cpu_count() or 1)
+        with self.profiler.stage('merge', step='sharded', shards=len(partitions), workers=workers) as info:
+            if workers > 1:
+                # fork, iş parçacığı kullanan süreçlerde (Streamlit, Polars) kilitlenebilir
+                context = multiprocessing.get_context('spawn')
+                with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+                    results = list(executor.map(_merge_shard, partitions, [self.backend] * len(partitions)))
+            else:
+                results = [_merge_shard(tables, self.backend) for tables in partitions]
+
+            # Boş parça sonuçları eklenmez (boş DataFrame'ler sütun tiplerini değiştirebilir)
+            df_merged = concat_frames([df for df in results if not df.empty] or results[:1])
+            info['rows'] = len(df_merged)
+
+        print(f"  [OK] Tablolar {len(partitions)} parcada ({workers} surec) birlestirildi: {len(df_merged)} kayit")
+        return df_merged
+
+    def _add_derived_columns(
+        self,
+        df_merged: pd.DataFrame,
+        term_totals: Optional[Dict[str, np.ndarray]] = None
+    ) -> pd.DataFrame:
+        """
+        Birleştirilmiş veriye hesaplanan sütunları ekle (bkz. add_derived_columns)
+        """
+        return add_derived_columns(df_merged, self.backend, self.profiler, term_totals)
+
+    def _optimize_frames(self, frames: Dict[str, pd.DataFrame]):
+        """
+        DataFrame'lerin veri tiplerini yerinde küçült ve öncesi/sonrası bellek raporunu yazdır
+
+        Args:
+            frames: İsim -> DataFrame
+        """
+        if not Config.OPTIMIZE_DTYPES:
+            return
+
+        print("  [BELLEK] Veri tipi optimizasyonu:")
+        for name, df in frames.items():
+            before = df.memory_usage(deep=True).sum() / 1024 / 1024
+            with self.profiler.stage('optimize_dtypes', frame=name) as info:
+                optimize_dtypes(df)
+                info['rows'] = len(df)
+            after = df.memory_usage(deep=True).sum() / 1024 / 1024
+            ratio = before / after if after > 0 else 1.0
+            print(f"    - {name}: {before:.1f} MB -> {after:.1f} MB ({ratio:.1f}x)")
+
+    def _print_summary(self):
+        """
+        Birleştirilmiş veri için özet, yıllık dağılım ve birim fiyat analizini yazdır
+        """
+        df_merged = self.df_merged
+
+        # Özet için unique term bazında hesapla (her term bir kez sayılsın)
+        df_unique_summary = self.get_term_table()
+
+        print(f"[OZET] Toplam kayit sayisi: {len(df_merged)}")
+        print(f"[OZET] Unique term sayisi: {len(df_unique_summary)}")
+        print(f"[OZET] Tarih araligi: {df_merged['term_date'].min()} - {df_merged['term_date'].max()}")
+        print(f"[OZET] Toplam tuketim: {df_unique_summary['total_consumption'].sum():,.2f} kWh")
+        print(f"[OZET] Toplam maliyet (KDV'siz): TL {df_unique_summary['term_total_cost'].sum():,.2f}")
+
+        # Yıllara göre dağılım
+        print("\n[YILLIK DAGILIM]")
+        yearly_summary = df_unique_summary.groupby('year').agg({
+            'total_consumption': 'sum',
+            'term_total_cost': 'sum'
+        }).reset_index()
+        for _, row in yearly_summary.iterrows():
+            birim_fiyat = row['term_total_cost'] / row['total_consumption'] if row['total_consumption'] > 0 else 0
+            print(f"  {int(row['year'])}: {row['total_consumption']:,.0f} kWh -> {row['term_total_cost']:,.2f} TL (Birim: {birim_fiyat:.2f} TL/kWh)")
+
+        # Unit_price değerlerinin yıllara göre dağılımı
+        print("\n[UNIT_PRICE ANALIZI - Sadece consumption > 0 olanlar]")
+        df_with_consumption = df_merged[(df_merged['consumption'].notna()) & (df_merged['consumption'] > 0)]
+        unit_price_by_year = df_with_consumption.groupby('year')['unit_price'].agg(['mean', 'min', 'max', 'count']).reset_index()
+        for _, row in unit_price_by_year.iterrows():
+            print(f"  {int(row['year'])}: Ort={row['mean']:.2f} TL/kWh, Min={row['min']:.2f}, Max={row['max']:.2f}, Fee sayisi={int(row['count'])}")
+        print()
+        
+    def load_and_process(self) -> bool:
+        """
+        Verileri yükle, temizle ve birleştir (tam yükleme).
+        Kaynak tablolar son snapshot'tan beri değişmediyse aşamalar snapshot'tan
+        tohumlanır; her aşamanın dosyası ancak o aşama istendiğinde okunur.
+
+        Returns:
+            bool: İşlenmiş veri oluştuysa True, değilse False
+        """
+        with self._lock, self.profiler.stage('load_and_process'):
+            if not self.validate_columns():
+                return False
+
+            # Parmak izi yüklemeden önce alınır; yükleme sırasında gelen kayıtlar
+            # bir sonraki açılışta uyuşmazlık olarak görülür ve veri yeniden yüklenir
+            fingerprint = self._source_fingerprint()
+            if fingerprint is not None and self._load_snapshot(fingerprint):
+                # Snapshot daha geniş bir pencereyle kaydedildiyse pencere onunkine genişler
+                fingerprint = {**fingerprint, 'window_start': window_key(self.window_start)}
+                self._publish_shared(fingerprint)
+                return True
+
+            if self.out_of_core:
+                if not self._process_out_of_core():
+                    return False
+                if fingerprint is not None:
+                    self._save_snapshot(fingerprint)
+                return True
+
+            if not self.load_data():
+                return False
+
+            self.clean_and_prepare()
+            self.merge_data()
+            if self.df_merged.empty:
+                return False
+
+            if fingerprint is not None:
+                self._save_snapshot(fingerprint)
+            self._publish_shared(fingerprint)
+            return True
+
+    def _process_out_of_core(self) -> bool:
+        """
+        Tabloları accrual id sırasıyla parça parça işle (out-of-core mod).
+
+        Her parçada accrual'lar, term'leri, fee'leri ve tüketimleri okunur, birleştirilir
+        ve hesaplanan sütunlar eklenir. Parçanın fee detayı diske yazılır; term tablosu
+        ve aylık küp parçalardan toplanır. Bir term'in tüm satırları aynı parçada
+        olduğundan sonuçlar tüm verinin bellekte işlenmesiyle aynıdır (satır sırası
+        accrual id sırasıdır). Birleştirilmiş verinin tamamı hiçbir zaman bellekte tutulmaz.
+
+        Returns:
+            bool: İşlenmiş veri oluştuysa True, değilse False
+        """
+        print(f"[YUKLE] Out-of-core mod: tablolar accrual parcalari halinde isleniyor "
+              f"(bellek butcesi: {Config.MEMORY_BUDGET_MB} MB)...")
+
+        self.invalidate('raw')
+        self.watermarks = {}
+        term_tables: List[pd.DataFrame] = []
+        cube = build_monthly_cube(pd.DataFrame())
+        after, limit, chunk, rows = None, Config.OUT_OF_CORE_FIRST_CHUNK, 0, 0
+
+        self.fee_detail.begin()
+        try:
+            while True:
+                upper = self._next_accrual_boundary(after, limit)
+                if upper is None:
+                    break
+
+                with self.profiler.stage('out_of_core_chunk', chunk=chunk, limit=limit) as info:
+                    df_chunk, accruals = self._process_accrual_chunk(after, upper)
+                    info['rows'] = len(df_chunk)
+
+                chunk_mb = df_chunk.memory_usage(deep=True).sum() / 1024 / 1024
+                if not df_chunk.empty:
+                    term_tables.append(build_term_table(df_chunk))
+                    cube = combine_cubes([cube, build_monthly_cube(df_chunk)])
+                    self.fee_detail.append(df_chunk)
+                    rows += len(df_chunk)
+
+                rss = current_rss_bytes()
+                rss_text = f", RSS {rss / 1024 / 1024:.0f} MB" if rss is not None else ""
+                print(f"  [PARCA] {chunk + 1}: {accruals} accrual, {len(df_chunk)} kayit, "
+                      f"{chunk_mb:.1f} MB{rss_text}")
+
+                del df_chunk
+                limit = self._next_chunk_size(limit, accruals, chunk_mb)
+                after, chunk = upper, chunk + 1
+
+        except Exception as e:
+            self.fee_detail.abort()
+            print(f"[HATA] Out-of-core islemede hata: {e}")
+            return False
+
+        if rows == 0:
+            self.fee_detail.abort()
+            print("[HATA] Veri yuklenemedi, birlestirme atlanıyor!")
+            return False
+
+        self.fee_detail.commit()
+        term_table = concat_frames(term_tables)
+        del term_tables
+
+        self._seed_out_of_core_stages(lambda: term_table, lambda: cube)
+
+        totals = cube.totals()
+        print(f"[OZET] Toplam kayit sayisi: {rows} ({chunk} parca)")
+        print(f"[OZET] Unique term sayisi: {len(term_table)}")
+        print(f"[OZET] Toplam tuketim: {totals['consumption']:,.2f} kWh")
+        print(f"[OZET] Toplam maliyet (KDV'siz): TL {totals['cost']:,.2f}")
+        print(f"[OK] Fee detayi diske yazildi: {self.fee_detail.directory}\n")
+        return True
+
+    def _next_accrual_boundary(self, after: Any, limit: int) -> Any:
+        """
+        Sonraki parçanın son accrual id'si (keyset sayfalama)
+
+        Args:
+            after: Önceki parçanın son id'si (ilk parça için None)
+            limit: Parçadaki en fazla accrual sayısı
+
+        Returns:
+            Parçanın son id'si veya None (accrual kalmadı)
+        """
+        table = Config.get_full_table_name(Config.DB_TABLE_ACCRUALS)
+        where = "WHERE id > :after" if after is not None else ""
+        query = f"SELECT max(id) FROM (SELECT id FROM {table} {where} ORDER BY id LIMIT :limit) AS chunk"
+
+        params: Dict[str, Any] = {'limit': limit}
+        if after is not None:
+            params['after'] = after
+
+        with self.db_manager.get_engine().connect() as connection:
+            return connection.execute(text(query), params).scalar()
+
+    def _accrual_chunk_requests(self, after: Any, upper: Any) -> Dict[str, Dict[str, Any]]:
+        """
+        Bir accrual id aralığının (after, upper] dört tablodaki kayıtlarını okuyan
+        _read_tables istekleri. Fee ve tüketimler term'ler üzerinden seçilir.
+
+        Args:
+            after: Aralığın alt sınırı (hariç, ilk parça için None)
+            upper: Aralığın üst sınırı (dahil)
+
+        Returns:
+            Tablo adı -> {'where', 'params'}
+        """
+        def bounds(column: str) -> str:
+            condition = f"{column} <= :upper"
+            return condition if after is None else f"{condition} AND {column} > :after"
+
+        terms = Config.get_full_table_name(Config.DB_TABLE_ACCRUAL_TERMS)
+        fees = Config.get_full_table_name(Config.DB_TABLE_ACCRUAL_FEES)
+        params = {'upper': upper} if after is None else {'upper': upper, 'after': after}
+
+        where = {
+            Config.DB_TABLE_ACCRUALS: bounds('id'),
+            Config.DB_TABLE_ACCRUAL_TERMS: bounds('accrual_id'),
+            Config.DB_TABLE_ACCRUAL_FEES: f"accrual_term_id IN (SELECT id FROM {terms} WHERE {bounds('accrual_id')})",
+            Config.DB_TABLE_ACCRUAL_FEE_CONSUMPTIONS: (
+                f"accrual_fee_id IN (SELECT f.id FROM {fees} f JOIN {terms} t ON t.id = f.accrual_term_id "
+                f"WHERE {bounds('t.accrual_id')})"
+            ),
+        }
+        return self._windowed(
+            {table_name: {'where': where[table_name], 'params': params} for table_name in Config.REQUIRED_DB_TABLES},
+            self.window_start
+        )
+
+    def _process_accrual_chunk(self, after: Any, upper: Any) -> Tuple[pd.DataFrame, int]:
         """
-        Veri işleyiciyi başlat
+        Bir accrual parçasını oku, dönüştür ve birleştir (ara çıktılar yazdırılmaz)
+
+        Args:
+            after: Parçanın alt sınırı (hariç)
+            upper: Parçanın üst sınırı (dahil)
+
+        Returns:
+            (Birleştirilmiş ve hesaplanan sütunları eklenmiş parça, parçadaki accrual sayısı)
         """
-        self.db_manager = get_database_manager()
+        with contextlib.redirect_stdout(io.StringIO()):
+            tables, _ = self._read_tables(self._accrual_chunk_requests(after, upper))
+            for table_name in Config.REQUIRED_DB_TABLES:
+                tables[table_name] = self._prepare_table(table_name, tables[table_name])
+                if Config.OPTIMIZE_DTYPES:
+                    optimize_dtypes(tables[table_name])
 
-        self.df_accruals = pd.DataFrame()
-        self.df_fees = pd.DataFrame()
-        self.df_terms = pd.DataFrame()
-        self.df_consumptions = pd.DataFrame()
-        self.df_merged = pd.DataFrame()
-        
-    def load_data(self) -> bool:
+            accruals = len(tables[Config.DB_TABLE_ACCRUALS])
+            if any(tables[name].empty for name in (
+                    Config.DB_TABLE_ACCRUALS, Config.DB_TABLE_ACCRUAL_TERMS, Config.DB_TABLE_ACCRUAL_FEES)):
+                return pd.DataFrame(), accruals
+
+            df_chunk = self._merge_tables(
+                tables.pop(Config.DB_TABLE_ACCRUALS),
+                tables.pop(Config.DB_TABLE_ACCRUAL_TERMS),
+                tables.pop(Config.DB_TABLE_ACCRUAL_FEES),
+                tables.pop(Config.DB_TABLE_ACCRUAL_FEE_CONSUMPTIONS),
+            )
+        return df_chunk, accruals
+
+    def _next_chunk_size(self, limit: int, accruals: int, chunk_mb: float) -> int:
         """
-        Veritabanından verileri yükle
+        Sonraki parçanın accrual sayısı: birleştirilmiş parça bellek bütçesinin
+        MEMORY_BUDGET_CHUNK_RATIO'sunu aşmayacak kadar (her adımda en fazla 4 katı)
+
+        Args:
+            limit: Bu parçanın accrual sınırı
+            accruals: Bu parçada okunan accrual sayısı
+            chunk_mb: Birleştirilmiş parçanın bellek kullanımı (MB)
 
         Returns:
-            bool: Yükleme başarılıysa True, değilse False
+            Sonraki parçanın accrual sınırı
         """
-        return self._load_from_database()
+        if accruals == 0 or chunk_mb <= 0:
+            return limit * 4
 
-    def _load_from_database(self) -> bool:
+        target_mb = Config.MEMORY_BUDGET_MB * Config.MEMORY_BUDGET_CHUNK_RATIO
+        return int(min(max(target_mb / (chunk_mb / accruals), 1), limit * 4))
+
+    def _seed_out_of_core_stages(
+        self,
+        term_table: Callable[[], pd.DataFrame],
+        monthly_cube: Callable[[], MonthlyCube]
+    ):
         """
-        Veritabanından tüm tabloları yükle
+        Out-of-core sonuçlarıyla aşamaları tohumla. 'joined' aşaması sadece açıkça
+        istendiğinde diskteki fee detayından okunur (bkz. get_fee_detail).
 
-        Returns:
-            bool: Yükleme başarılıysa True, değilse False
+        Args:
+            term_table: Term tablosunu döndüren fonksiyon
+            monthly_cube: Aylık küpü döndüren fonksiyon
         """
-        try:
-            print("[YUKLE] Veritabanindan veriler yukleniyor...")
+        self.invalidate('raw')
+        self._seed_stage('raw', None)
+        self._seed_stage('typed', None)
+        self._seed_stage('joined', self.get_fee_detail)
+        self._seed_stage('term_table', term_table)
+        self._seed_stage('monthly_cube', monthly_cube)
 
-            engine = self.db_manager.get_engine()
+    def _publish_shared(self, fingerprint: Optional[Dict[str, Any]]):
+        """
+        İşlenmiş veriyi diğer süreçlerin memory-map ile açabileceği dosyaya yayınla
 
-            # bi_accruals - Ana fatura bilgileri
-            query_accruals = f"SELECT * FROM {Config.get_full_table_name(Config.DB_TABLE_ACCRUALS)}"
-            self.df_accruals = pd.read_sql(query_accruals, engine)
-            print(f"[OK] {Config.DB_TABLE_ACCRUALS} yuklendi: {len(self.df_accruals)} kayit")
+        Args:
+            fingerprint: Verinin yüklendiği andaki kaynak parmak izi
+        """
+        if self.shared_dataset is None:
+            return
 
-            # bi_accrual_fees - Fatura ücret detayları
-            query_fees = f"SELECT * FROM {Config.get_full_table_name(Config.DB_TABLE_ACCRUAL_FEES)}"
-            self.df_fees = pd.read_sql(query_fees, engine)
-            print(f"[OK] {Config.DB_TABLE_ACCRUAL_FEES} yuklendi: {len(self.df_fees)} kayit")
+        # Paylaşılan dosya bu veriyi zaten kapsıyorsa birleştirilmiş veri okunmaz;
+        # aynı kaynaktan daha geniş pencereyle yayınlanmış veri de daraltılmaz
+        if fingerprint is not None and fingerprint_covers(self.shared_dataset.read_fingerprint(), fingerprint):
+            return
 
-            # bi_accrual_terms - Fatura dönem bilgileri
-            query_terms = f"SELECT * FROM {Config.get_full_table_name(Config.DB_TABLE_ACCRUAL_TERMS)}"
-            self.df_terms = pd.read_sql(query_terms, engine)
-            print(f"[OK] {Config.DB_TABLE_ACCRUAL_TERMS} yuklendi: {len(self.df_terms)} kayit")
+        if self.df_merged.empty:
+            return
 
-            # bi_accrual_fee_consumptions - Tüketim detayları
-            query_consumptions = f"SELECT * FROM {Config.get_full_table_name(Config.DB_TABLE_ACCRUAL_FEE_CONSUMPTIONS)}"
-            self.df_consumptions = pd.read_sql(query_consumptions, engine)
-            print(f"[OK] {Config.DB_TABLE_ACCRUAL_FEE_CONSUMPTIONS} yuklendi: {len(self.df_consumptions)} kayit")
+        if self.shared_dataset.publish(self.df_merged, fingerprint):
+            print(f"[PAYLASIM] Islenmis veri yayinlandi: {self.shared_dataset.path}\n")
 
-            print("[OK] Veritabanindan tum tablolar basariyla yuklendi!\n")
-            return True
+    def is_shared_dataset_current(self) -> bool:
+        """
+        Yayınlanmış paylaşılan veri, kaynak tabloların güncel haliyle mi oluşturulmuş?
 
-        except Exception as e:
-            print(f"[HATA] Veritabani yuklemede hata: {e}")
+        Returns:
+            bool: Dosya var ve bu sürecin verisini kapsıyorsa True (bkz. fingerprint_covers)
+        """
+        if self.shared_dataset is None:
             return False
 
-    def clean_and_prepare(self):
+        fingerprint = self._source_fingerprint()
+        return fingerprint is not None and fingerprint_covers(self.shared_dataset.read_fingerprint(), fingerprint)
+
+    def _source_fingerprint(self) -> Optional[Dict[str, Any]]:
         """
-        Verileri temizle ve analiz için hazırla
-        - Tarih formatlarını düzelt
-        - Eksik verileri kontrol et
-        - Veri tiplerini düzelt
+        Kaynak tabloların parmak izini (kayıt sayısı + en büyük id) oluştur
+
+        Returns:
+            Parmak izi veya None (snapshot ve paylaşım kapalı ya da parmak izi alınamadı)
         """
-        print("[TEMIZLE] Veriler temizleniyor ve hazirlaniyor...")
+        stores = [store for store in (self.snapshot_store, self.shared_dataset) if store is not None]
+        if not any(store.available for store in stores):
+            return None
 
-        # Veri yüklenmiş mi kontrol et
-        if self.df_terms.empty or self.df_accruals.empty:
-            print("[HATA] Veri yuklenemedi, temizleme atlanıyor!")
+        tables = {}
+        for table_name in Config.REQUIRED_DB_TABLES:
+            table_fingerprint = self.db_manager.get_table_fingerprint(table_name)
+            if table_fingerprint is None:
+                return None
+            tables[table_name] = table_fingerprint
+
+        return {
+            'schema': Config.DB_SCHEMA,
+            'load_mode': self.load_mode,
+            'columns': self.table_columns,
+            'window_start': window_key(self.window_start),
+            'tables': tables,
+        }
+
+    def _save_snapshot(self, fingerprint: Dict[str, Any]):
+        """
+        İşlenmiş ve temizlenmiş kaynak verileri yerel snapshot olarak kaydet
+
+        Args:
+            fingerprint: Verinin yüklendiği andaki kaynak parmak izi
+        """
+        if self.snapshot_store is None:
             return
 
-        # Tarih sütunlarını datetime formatına çevir
-        # Format: YYYYMMDDHHmmss (örn: 20250226141640)
-        if 'term_date' in self.df_terms.columns:
-            self.df_terms['term_date'] = pd.to_datetime(
-                self.df_terms['term_date'],
-                format='%Y%m%d%H%M%S',
-                errors='coerce'
-            )
-            # Yıl ve ay bilgilerini ayrı sütunlar olarak ekle
-            self.df_terms['year'] = self.df_terms['term_date'].dt.year  # type: ignore
-            self.df_terms['month'] = self.df_terms['term_date'].dt.month  # type: ignore
-            print("  [OK] Tarih formatlari duzeltildi")
+        if self.out_of_core:
+            # Fee detayı zaten diskte; snapshot sadece toplanan aşamaları ve detayın sürümünü tutar
+            cube = self.get_monthly_cube()
+            frames = {'term_table': self.get_term_table(), 'monthly_cube': cube.cells}
+            extra = {
+                'out_of_core': True,
+                'fee_detail': self.fee_detail.version(),
+                'rows': int(cube.totals()['record_count']),
+                'term_columns': TERM_TABLE_COLUMNS,
+            }
+            if self.snapshot_store.save(frames, fingerprint, extra=extra):
+                print(f"[SNAPSHOT] Yerel snapshot kaydedildi: {self.snapshot_store.directory}\n")
+            return
 
-        # Accruals tablosundaki tarih sütunları
-        date_columns = ['accrual_date', 'accrual_start_date', 'accrual_end_date']
-        for col in date_columns:
-            if col in self.df_accruals.columns:
-                self.df_accruals[col] = pd.to_datetime(
-                    self.df_accruals[col],
-                    format='%Y%m%d%H%M%S',
-                    errors='coerce'
-                )
+        frames = {'merged': self.df_merged}
+        for table_name, attr in TABLE_ATTRIBUTES.items():
+            df = getattr(self, attr)
+            if not df.empty:
+                frames[table_name] = df
+        frames['term_table'] = self.get_term_table()
+        frames['monthly_cube'] = self.get_monthly_cube().cells
 
-        # Terms tablosundaki diğer tarih sütunları
-        term_date_columns = ['start_date', 'end_date']
-        for col in term_date_columns:
-            if col in self.df_terms.columns:
-                self.df_terms[col] = pd.to_datetime(
-                    self.df_terms[col],
-                    format='%Y%m%d%H%M%S',
-                    errors='coerce'
-                )
-        
-        # Sayısal sütunları kontrol et ve düzelt
-        if 'amount' in self.df_fees.columns:
-            self.df_fees['amount'] = pd.to_numeric(self.df_fees['amount'], errors='coerce')
-        
-        if 'unit_price' in self.df_fees.columns:
-            self.df_fees['unit_price'] = pd.to_numeric(self.df_fees['unit_price'], errors='coerce')
-        
-        if 'consumption' in self.df_fees.columns:
-            self.df_fees['consumption'] = pd.to_numeric(self.df_fees['consumption'], errors='coerce')
-        
-        if 'billable_channel_consumption' in self.df_consumptions.columns:
-            self.df_consumptions['billable_channel_consumption'] = pd.to_numeric(
-                self.df_consumptions['billable_channel_consumption'], errors='coerce'
-            )
-        
-        print("  [OK] Sayisal degerler duzeltildi")
-        
-        # Eksik verileri kontrol et
-        print("\n[VERI] Eksik Veri Kontrolu:")
-        print(f"  - Accruals eksik: {self.df_accruals.isnull().sum().sum()}")
-        print(f"  - Terms eksik: {self.df_terms.isnull().sum().sum()}")
-        print(f"  - Consumptions eksik: {self.df_consumptions.isnull().sum().sum()}")
+        extra = {'watermarks': self.watermarks, 'rows': len(self.df_merged), 'term_columns': TERM_TABLE_COLUMNS}
+        if self.snapshot_store.save(frames, fingerprint, extra=extra):
+            print(f"[SNAPSHOT] Yerel snapshot kaydedildi: {self.snapshot_store.directory}\n")
 
-        print("[OK] Veri temizleme tamamlandi!\n")
-    
-    def merge_data(self):
+    def _load_snapshot(self, fingerprint: Dict[str, Any]) -> bool:
         """
-        Tüm tabloları birleştir ve analiz için tek bir DataFrame oluştur
+        Parmak izini kapsayan yerel snapshot ile aşamaları tohumla.
+        Çerçeveler hemen okunmaz; her aşama ilk istendiğinde kendi dosyasını okur.
+        Snapshot daha geniş bir pencereyle kaydedildiyse yükleme penceresi onunki olur.
+
+        Args:
+            fingerprint: Kaynak tabloların güncel parmak izi
+
+        Returns:
+            bool: Snapshot kullanıldıysa True
         """
-        print("[BIRLESTIR] Tablolar birlestiriliyor...")
+        if self.snapshot_store is None:
+            return False
 
-        # Veri yüklenmiş mi kontrol et
-        if self.df_accruals.empty or self.df_terms.empty or self.df_fees.empty:
-            print("[HATA] Veri yuklenemedi, birlestirme atlanıyor!")
-            return
+        meta = self.snapshot_store.read_meta()
+        stored = meta.get('fingerprint') if meta is not None else None
+        if not fingerprint_covers(stored, fingerprint):
+            return False
 
-        # 1. Accruals ve Terms'i birleştir
-        # bi_accruals.id = bi_accrual_terms.accrual_id
-        df_merged = pd.merge(
-            self.df_accruals,
-            self.df_terms,
-            left_on='id',
-            right_on='accrual_id',
-            how='inner',  # inner join ile sadece eşleşenleri al
-            suffixes=('', '_term')
-        )
-        print(f"  [OK] Accruals + Terms birlestirildi: {len(df_merged)} kayit")
+        opened = self.snapshot_store.open(stored)
+        if opened is None:
+            return False
+        window_start = stored.get('window_start')
+        window_start = pd.Timestamp(window_start) if window_start is not None else None
 
-        # 2. Fees tablosunu ekle
-        # bi_accrual_terms.id = bi_accrual_fees.accrual_term_id
-        # İlk merge'den sonra terms'deki 'id' sütunu 'id_term' olarak geldi
-        df_merged = pd.merge(
-            df_merged,
-            self.df_fees,
-            left_on='id_term',  # terms tablosundaki id (suffix almış hali)
-            right_on='accrual_term_id',
-            how='inner',
-            suffixes=('', '_fee')
+        loaders, meta = opened
+        extra = meta.get('extra', {})
+        if bool(extra.get('out_of_core')) != self.out_of_core:
+            return False
+        if self.out_of_core:
+            if not self._load_out_of_core_snapshot(loaders, meta):
+                return False
+            self.window_start = window_start
+            return True
+        if 'merged' not in loaders or extra.get('rows') == 0:
+            return False
+
+        tables = [table_name for table_name in Config.REQUIRED_DB_TABLES if table_name in loaders]
+
+        # Ham tablolar snapshot'ta tutulmaz; 'sql_join' modunda tipli tablolar da yoktur
+        self.invalidate('raw')
+        self._seed_stage('raw', None)
+        self._seed_stage('typed', (lambda: {name: loaders[name]() for name in tables}) if tables else None)
+        self._seed_stage('joined', loaders['merged'])
+        # Eski snapshot'larda olmayan (veya sütunları farklı) aşamalar birleştirilmiş veriden hesaplanır
+        if 'term_table' in loaders and extra.get('term_columns') == TERM_TABLE_COLUMNS:
+            self._seed_stage('term_table', loaders['term_table'])
+        if 'monthly_cube' in loaders:
+            self._seed_stage('monthly_cube', lambda: MonthlyCube(loaders['monthly_cube']()))
+        self.watermarks = dict(extra.get('watermarks', {}))
+        self.window_start = window_start
+
+        print(f"[SNAPSHOT] Kaynak tablolar degismemis, yerel snapshot kullanildi "
+              f"({meta.get('created_at')}): {extra.get('rows', '?')} kayit\n")
+        return True
+
+    def _load_out_of_core_snapshot(self, loaders: Dict[str, Callable[[], pd.DataFrame]], meta: Dict[str, Any]) -> bool:
+        """
+        Out-of-core snapshot'ı ile aşamaları tohumla (fee detayının aynı sürümü diskte olmalı)
+
+        Args:
+            loaders: Snapshot çerçevelerini okuyan fonksiyonlar
+            meta: Snapshot meta bilgisi
+
+        Returns:
+            bool: Snapshot kullanıldıysa True
+        """
+        extra = meta.get('extra', {})
+        if ('term_table' not in loaders or 'monthly_cube' not in loaders or not extra.get('rows')
+                or extra.get('term_columns') != TERM_TABLE_COLUMNS
+                or self.fee_detail.version() != extra.get('fee_detail')):
+            return False
+
+        self._seed_out_of_core_stages(
+            loaders['term_table'],
+            lambda: MonthlyCube(loaders['monthly_cube']())
         )
-        print(f"  [OK] Fees eklendi: {len(df_merged)} kayit")
+        self.watermarks = {}
 
-        # 3. Consumptions tablosunu ekle
-        # bi_accrual_fees.id = bi_accrual_fee_consumptions.accrual_fee_id
-        # Fees'deki 'id' sütunu şimdi 'id_fee' olarak var
-        df_merged = pd.merge(
-            df_merged,
-            self.df_consumptions,
-            left_on='id_fee',
-            right_on='accrual_fee_id',
-            how='left',  # left join çünkü tüm fee'lerde consumption olmayabilir
-            suffixes=('', '_consumption')
+        print(f"[SNAPSHOT] Kaynak tablolar degismemis, yerel snapshot kullanildi "
+              f"({meta.get('created_at')}): {extra.get('rows')} kayit (fee detayi diskte)\n")
+        return True
+
+    def refresh_data(self) -> bool:
+        """
+        Watermark'tan sonraki yeni/değişen kayıtları yükle ve mevcut veriye ekle.
+
+        Sadece etkilenen term'lerin birleştirilmiş satırları ve toplamları
+        (total_consumption, term_total_cost) yeniden hesaplanır. Silinen kayıtlar
+        algılanmaz; bunun için tam yükleme gerekir.
+
+        Returns:
+            bool: Yenileme başarılıysa True, değilse False
+        """
+        with self._lock, self.profiler.stage('refresh_data'):
+            if self.out_of_core:
+                # Birleştirilmiş veri bellekte olmadığı için artımlı birleştirme yapılamaz;
+                # kaynak tablolar değişmediyse snapshot kullanılır
+                print("[YENILE] Out-of-core modda veri parca parca yeniden isleniyor...")
+                return self.load_and_process()
+
+            if (self.load_mode == 'sql_join' or self.df_merged.empty
+                    or len(self.watermarks) < len(Config.REQUIRED_DB_TABLES)):
+                print("[YENILE] Artimli yukleme yapilamiyor, tum veri yeniden yukleniyor...")
+                return self.load_and_process()
+
+            # Snapshot'ın parmak izi deltalar okunmadan önce alınır (bkz. load_and_process)
+            fingerprint = self._source_fingerprint()
+
+            try:
+                print("[YENILE] Yeni ve degisen kayitlar yukleniyor...")
+
+                deltas, watermarks = self._read_tables(self._windowed({
+                    table_name: {
+                        'where': f"{Config.DB_WATERMARK_COLUMNS.get(table_name, 'id')} > :watermark",
+                        'params': {'watermark': self.watermarks[table_name]}
+                    }
+                    for table_name in Config.REQUIRED_DB_TABLES
+                }, self.window_start))
+
+            except Exception as e:
+                print(f"[HATA] Artimli yuklemede hata: {e}")
+                return False
+
+            if all(df.empty for df in deltas.values()):
+                print("[OK] Yeni kayit yok, veri guncel!\n")
+                return True
+
+            self._commit_watermarks(watermarks)
+
+            # Etkilenen term'ler tablolar güncellenmeden önce belirlenir (eski eşleşmeler için).
+            # Tablolar güncellenince 'joined' aşaması güncelliğini yitirir, eski hali burada tutulur.
+            df_merged = self.df_merged
+            affected_terms = self._affected_term_ids(deltas, df_merged)
+
+            self._upsert_tables(deltas)
+
+            affected_terms = affected_terms.union(self._affected_term_ids(deltas, df_merged))
+            self._rebuild_terms(affected_terms, df_merged)
+
+            print(f"[OK] Artimli yenileme tamamlandi: {len(affected_terms)} term guncellendi\n")
+
+            if fingerprint is not None:
+                self._save_snapshot(fingerprint)
+            self._publish_shared(fingerprint)
+            return True
+
+    def _upsert_tables(self, frames: Dict[str, pd.DataFrame]):
+        """
+        Okunan ham kayıtları dönüştürüp id bazında mevcut tablolara ekle (upsert)
+
+        Args:
+            frames: Tablo adı -> yeni/değişen ham kayıtlar
+        """
+        for table_name, df in frames.items():
+            if df.empty:
+                continue
+            df = self._prepare_table(table_name, df)
+            if Config.OPTIMIZE_DTYPES:
+                optimize_dtypes(df)
+            attr = TABLE_ATTRIBUTES[table_name]
+            current = getattr(self, attr)
+            current = current[~current['id'].isin(df['id'])]
+            setattr(self, attr, concat_frames([current, df]))
+
+    def load_window(self, start: Any = None) -> bool:
+        """
+        Yükleme penceresini geriye doğru genişlet (eski yıllar istendiğinde).
+
+        Sadece eksik aralığın [start, window_start) term'leri ve bunların accrual, fee ve
+        tüketimleri okunur. Yeni term'ler mevcut term'lerle çakışmadığı için sadece onlar
+        birleştirilip mevcut veriye eklenir (artımlı yenilemedeki gibi). Watermark'lar
+        değişmez. 'sql_join' ve out-of-core modlarında veri yeni pencereyle yeniden yüklenir.
+
+        Args:
+            start: Yeni pencere başlangıcı (None = tüm geçmiş)
+
+        Returns:
+            bool: Pencere yüklendiyse (veya zaten yüklüyse) True
+        """
+        start = pd.Timestamp(start) if start is not None else None
+        end = self.window_start
+        if end is None or (start is not None and start >= end):
+            return True
+
+        with self._lock, self.profiler.stage('load_window'):
+            label = start.date() if start is not None else 'tum gecmis'
+            if self.out_of_core or self.load_mode == 'sql_join' or self.df_merged.empty:
+                print(f"[PENCERE] Veri {label} itibariyla yeniden yukleniyor...")
+                self.window_start = start
+                return self.load_and_process()
+
+            print(f"[PENCERE] {label} - {end.date()} arasi yukleniyor...")
+            self.window_start = start
+            # Snapshot'ın parmak izi (yeni pencereyle) okumadan önce alınır (bkz. load_and_process)
+            fingerprint = self._source_fingerprint()
+
+            try:
+                frames, _ = self._read_tables(self._windowed(
+                    {table_name: {} for table_name in Config.REQUIRED_DB_TABLES}, start, end
+                ))
+            except Exception as e:
+                self.window_start = end
+                print(f"[HATA] Pencere yuklemede hata: {e}")
+                return False
+
+            new_terms = pd.Index(frames[Config.DB_TABLE_ACCRUAL_TERMS]['id'].dropna().unique())
+            if len(new_terms):
+                df_merged = self.df_merged
+                self._upsert_tables(frames)
+                self._rebuild_terms(new_terms, df_merged)
+
+            print(f"[OK] Pencere genisletildi: {len(new_terms)} term eklendi\n")
+
+            if fingerprint is not None:
+                self._save_snapshot(fingerprint)
+            self._publish_shared(fingerprint)
+            return True
+
+    def _affected_term_ids(self, deltas: Dict[str, pd.DataFrame], merged: pd.DataFrame) -> pd.Index:
+        """
+        Delta kayıtlarından etkilenen accrual_term_id değerlerini bul
+
+        Args:
+            deltas: Tablo adı -> yeni/değişen ham kayıtlar
+            merged: Yenileme öncesi birleştirilmiş veri
+
+        Returns:
+            Etkilenen term id'leri
+        """
+        accrual_ids = deltas[Config.DB_TABLE_ACCRUALS]['id']
+        term_ids = deltas[Config.DB_TABLE_ACCRUAL_TERMS]['id']
+        fee_ids = deltas[Config.DB_TABLE_ACCRUAL_FEES]['id']
+        consumption_ids = deltas[Config.DB_TABLE_ACCRUAL_FEE_CONSUMPTIONS]['id']
+        consumption_fee_ids = deltas[Config.DB_TABLE_ACCRUAL_FEE_CONSUMPTIONS]['accrual_fee_id']
+
+        affected = [
+            term_ids,
+            deltas[Config.DB_TABLE_ACCRUAL_FEES]['accrual_term_id'],
+            self.df_terms.loc[self.df_terms['accrual_id'].isin(accrual_ids), 'id'],
+            self.df_fees.loc[self.df_fees['id'].isin(consumption_fee_ids), 'accrual_term_id'],
+        ]
+
+        # Başka bir term'e taşınan kayıtların eski term'leri
+        moved = (
+            merged['id'].isin(accrual_ids)
+            | merged['id_term'].isin(term_ids)
+            | merged['id_fee'].isin(fee_ids)
         )
-        print(f"  [OK] Consumptions eklendi: {len(df_merged)} kayit")
-
-        # 4. Hesaplanan sütunlar ekle
-
-        # Fee code'dan prefix çıkar (4AG, 4OG, URT, KAG, KOG, vb.)
-        if 'fee_code' in df_merged.columns:
-            # Prefix'i al (ilk 3-4 karakter veya ilk underscore'a kadar)
-            df_merged['fee_prefix'] = df_merged['fee_code'].str.split('_').str[0]
-            print(f"  [OK] Fee prefix'leri cikarildi")
-
-        # amount zaten unit_price × consumption olarak hesaplanmış durumda
-        # KDV eklemiyoruz, direkt amount kullanıyoruz
-
-        # Toplam tüketim hesapla (accrual_term_id bazında)
-        if 'consumption' in df_merged.columns:
-            # Her term için toplam tüketim (fee consumption'larının toplamı)
-            consumption_totals = df_merged.groupby('accrual_term_id')['consumption'].sum().reset_index()
-            consumption_totals.columns = ['accrual_term_id', 'total_consumption']
-
-            # Merge et
-            df_merged = df_merged.drop(columns=['total_consumption'], errors='ignore')
-            df_merged = pd.merge(
-                df_merged,
-                consumption_totals,
-                on='accrual_term_id',
-                how='left'
-            )
-            print(f"  [OK] Toplam tuketim hesaplandi")
-
-        # Her term için toplam maliyet hesapla (KDV'siz, direkt amount toplamı)
-        # SADECE consumption > 0 olan fee'leri kullan (sabit ücretleri hariç tut)
-        if 'amount' in df_merged.columns and 'accrual_term_id' in df_merged.columns:
-            # Eski term_total_cost sütununu sil (varsa)
-            df_merged = df_merged.drop(columns=['term_total_cost'], errors='ignore')
-
-            # Sadece tüketim olan fee'lerin maliyetini hesapla
-            total_fees = len(df_merged)
-            df_with_consumption = df_merged[
-                (df_merged['consumption'].notna()) &
-                (df_merged['consumption'] > 0) &
-                (df_merged['unit_price'].notna()) &
-                (df_merged['unit_price'] > 0) &
-                (df_merged['unit_price'] <= 5.0)  # Anormal unit_price'ları filtrele
-            ]
-            fees_with_consumption = len(df_with_consumption)
-
-            print(f"  [DEBUG] Toplam fee sayisi: {total_fees}")
-            print(f"  [DEBUG] Tuketimi olan fee sayisi: {fees_with_consumption}")
-
-            cost_totals = df_with_consumption.groupby('accrual_term_id')['amount'].sum().reset_index()
-            cost_totals.columns = ['accrual_term_id', 'term_total_cost']
-
-            # Merge et
-            df_merged = pd.merge(
-                df_merged,
-                cost_totals,
-                on='accrual_term_id',
-                how='left'
-            )
-            print(f"  [OK] Toplam maliyet hesaplandi (Sadece tuketim olan fee'ler, KDV'siz)")
+        if 'id_consumption' in merged.columns:
+            moved |= merged['id_consumption'].isin(consumption_ids)
+        affected.append(merged.loc[moved, 'accrual_term_id'])
 
-        # Sütun isimlerini standardize et
-        if 'billable_channel_consumption' in df_merged.columns:
-            df_merged['consumption_value'] = df_merged['billable_channel_consumption'].fillna(0)
+        return pd.Index(pd.concat(affected, ignore_index=True).dropna().unique())
 
-        if 'channel_key' in df_merged.columns:
-            df_merged['time_frame'] = df_merged['channel_key'].fillna('UNKNOWN')
+    def _rebuild_terms(self, term_ids: pd.Index, df_merged: pd.DataFrame):
+        """
+        Verilen term'lerin birleştirilmiş satırlarını ve toplamlarını yeniden oluştur.
+        Sonuç, güncellenmiş tablolardan hesaplanmış 'joined' aşaması olarak kaydedilir.
 
-        # Null değerleri temizle
-        df_merged['total_consumption'] = df_merged['total_consumption'].fillna(0)
-        df_merged['amount'] = df_merged['amount'].fillna(0)
-        df_merged['term_total_cost'] = df_merged['term_total_cost'].fillna(0)
+        Args:
+            term_ids: Yeniden hesaplanacak accrual_term_id değerleri
+            df_merged: Yenileme öncesi birleştirilmiş veri
+        """
+        df_terms = self.df_terms[self.df_terms['id'].isin(term_ids)]
+        df_accruals = self.df_accruals[self.df_accruals['id'].isin(df_terms['accrual_id'])]
+        df_fees = self.df_fees[self.df_fees['accrual_term_id'].isin(term_ids)]
+        df_consumptions = self.df_consumptions[
+            self.df_consumptions['accrual_fee_id'].isin(df_fees['id'])
+        ]
 
-        self.df_merged = df_merged
-        print("[OK] Tum tablolar basariyla birlestirildi!\n")
+        df_partial = self._merge_tables(df_accruals, df_terms, df_fees, df_consumptions)
 
-        # Özet için unique term bazında hesapla (her term bir kez sayılsın)
-        df_unique_summary = df_merged.drop_duplicates(subset=['accrual_term_id'])
+        if Config.OPTIMIZE_DTYPES:
+            optimize_dtypes(df_partial)
 
-        print(f"[OZET] Toplam kayit sayisi: {len(df_merged)}")
-        print(f"[OZET] Unique term sayisi: {len(df_unique_summary)}")
-        print(f"[OZET] Tarih araligi: {df_merged['term_date'].min()} - {df_merged['term_date'].max()}")
-        print(f"[OZET] Toplam tuketim: {df_unique_summary['total_consumption'].sum():,.2f} kWh")
-        print(f"[OZET] Toplam maliyet (KDV'siz): TL {df_unique_summary['term_total_cost'].sum():,.2f}")
+        df_kept = df_merged[~df_merged['accrual_term_id'].isin(term_ids)]
+        self.df_merged = concat_frames([df_kept, df_partial])
 
-        # Yıllara göre dağılım
-        print("\n[YILLIK DAGILIM]")
-        yearly_summary = df_unique_summary.groupby('year').agg({
-            'total_consumption': 'sum',
-            'term_total_cost': 'sum'
-        }).reset_index()
-        for _, row in yearly_summary.iterrows():
-            birim_fiyat = row['term_total_cost'] / row['total_consumption'] if row['total_consumption'] > 0 else 0
-            print(f"  {int(row['year'])}: {row['total_consumption']:,.0f} kWh -> {row['term_total_cost']:,.2f} TL (Birim: {birim_fiyat:.2f} TL/kWh)")
+    def _get_stage(self, name: str, empty: Callable[[], Any]) -> Any:
+        """
+        Aşamayı hesaplayıp döndür; veri yüklenemezse boş sonuç döndür
+
+        Args:
+            name: Aşama adı
+            empty: Boş sonucu üreten fonksiyon
+        """
+        try:
+            return self.stage(name)
+        except Exception as e:
+            print(f"[HATA] '{name}' asamasi hesaplanamadi: {e}")
+            return empty()
 
-        # Unit_price değerlerinin yıllara göre dağılımı
-        print("\n[UNIT_PRICE ANALIZI - Sadece consumption > 0 olanlar]")
-        df_with_consumption = df_merged[(df_merged['consumption'].notna()) & (df_merged['consumption'] > 0)]
-        unit_price_by_year = df_with_consumption.groupby('year')['unit_price'].agg(['mean', 'min', 'max', 'count']).reset_index()
-        for _, row in unit_price_by_year.iterrows():
-            print(f"  {int(row['year'])}: Ort={row['mean']:.2f} TL/kWh, Min={row['min']:.2f}, Max={row['max']:.2f}, Fee sayisi={int(row['count'])}")
-        print()
-        
     def get_processed_data(self) -> pd.DataFrame:
         """
-        İşlenmiş veriyi döndür
+        İşlenmiş veriyi döndür (gerekirse yüklenir ve birleştirilir)
 
         Returns:
             Birleştirilmiş ve işlenmiş DataFrame (boş olabilir)
         """
-        if self.df_merged.empty:
+        return self._get_stage('joined', pd.DataFrame)
+
+    def get_fee_detail(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        where: Optional[Dict[str, Sequence[Any]]] = None
+    ) -> pd.DataFrame:
+        """
+        Fee seviyesindeki veriden istenen sütunları ve satırları döndür.
+        Out-of-core modda veri diskten sadece istenen sütunlar ve satırlarla okunur;
+        değilse birleştirilmiş veriden seçilir.
+
+        Args:
+            columns: Sütunlar (varsayılan: tümü; olmayanlar atlanır)
+            where: Sütun -> izin verilen değerler (ör. {'year': [2024, 2025]})
+
+        Returns:
+            DataFrame (boş olabilir)
+        """
+        if self.fee_detail is None:
+            df = self.get_processed_data()
+            if df.empty:
+                return df
+            mask = pd.Series(True, index=df.index)
+            for col, values in (where or {}).items():
+                mask &= df[col].isin(list(values))
+            selected = [col for col in columns if col in df.columns] if columns is not None else list(df.columns)
+            return df.loc[mask, selected].reset_index(drop=True)
+
+        df = self.fee_detail.read(columns, where)
+        if df is None:
             return pd.DataFrame()
-        return self.df_merged
-    
+        if Config.OPTIMIZE_DTYPES:
+            optimize_dtypes(df)
+        return df
+
+    def get_term_table(self) -> pd.DataFrame:
+        """
+        Her term için tek satırlık tabloyu döndür ('term_table' aşaması, cache'lenir).
+        Term bazındaki toplamlar için df_merged.drop_duplicates yerine bu tablo kullanılır.
+
+        Returns:
+            Term tablosu (boş olabilir)
+        """
+        return self._get_stage('term_table', lambda: build_term_table(pd.DataFrame()))
+
+    def get_monthly_cube(self) -> MonthlyCube:
+        """
+        Yıl/ay/fee prefix/kanal bazında önceden toplanmış küpü döndür ('monthly_cube' aşaması, cache'lenir).
+        Aylık ve yıllık toplamlar için term tablosu yerine bu küp kullanılır.
+        Snapshot güncelse sadece küp dosyası okunur, fee seviyesindeki veri yüklenmez.
+
+        Returns:
+            MonthlyCube (boş olabilir)
+        """
+        return self._get_stage('monthly_cube', lambda: build_monthly_cube(pd.DataFrame()))
+
     def get_summary_statistics(self) -> Optional[Dict]:
         """
         Veri hakkında özet istatistikler
@@ -314,11 +2493,14 @@ class EnergyDataProcessor:
         Returns:
             İstatistikleri içeren dictionary (None olabilir)
         """
+        if self.out_of_core:
+            return self._get_out_of_core_statistics()
+
         if self.df_merged.empty:
             return None
 
         # Unique term bazında hesaplama (her term için bir kez say)
-        df_unique = self.df_merged.drop_duplicates(subset=['accrual_term_id'])
+        df_unique = self.get_term_table()
 
         stats = {
             'total_records': len(self.df_merged),
@@ -334,15 +2516,126 @@ class EnergyDataProcessor:
 
         return stats
     
+    def _get_out_of_core_statistics(self) -> Optional[Dict]:
+        """
+        get_summary_statistics'in out-of-core karşılığı: fee detayı okunmadan
+        term tablosu ve aylık küpten hesaplanır.
+        """
+        df_unique = self.get_term_table()
+        if df_unique.empty:
+            return None
+
+        cells = self.get_monthly_cube().cells
+        return {
+            'total_records': int(cells['record_count'].sum()),
+            'total_consumption': df_unique['total_consumption'].sum(),
+            'total_cost': df_unique['term_total_cost'].sum(),
+            'date_range': {
+                'start': df_unique['term_date'].min(),
+                'end': df_unique['term_date'].max()
+            },
+            'unique_accruals': df_unique['accrual_id'].nunique(),
+            'unique_prefixes': cells.loc[cells['fee_prefix'] != 'UNKNOWN', 'fee_prefix'].nunique()
+        }
+
+    def iter_fee_detail(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        start: Any = None,
+        end: Any = None,
+        chunk_rows: Optional[int] = None
+    ) -> Iterable[pd.DataFrame]:
+        """
+        Fee seviyesindeki veriyi parça parça döndür (dışa aktarma için).
+        Out-of-core modda parçalar diskten okunur; değilse birleştirilmiş verinin
+        dilimleridir. Her seferinde sadece bir parçanın kopyası bellekte tutulur.
+
+        Args:
+            columns: Sütunlar (varsayılan: tümü; olmayanlar atlanır)
+            start: Başlangıç tarihi (term_date >= start, None = sınırsız)
+            end: Bitiş tarihi (term_date < end, None = sınırsız)
+            chunk_rows: Parça başına en fazla kayıt (varsayılan: Config.EXPORT_CHUNK_ROWS)
+
+        Yields:
+            DataFrame parçaları
+        """
+        chunk_rows = chunk_rows or Config.EXPORT_CHUNK_ROWS
+
+        if self.fee_detail is not None:
+            date_range = ('term_date', start, end) if start is not None or end is not None else None
+            yield from self.fee_detail.iter_batches(columns, date_range=date_range, batch_rows=chunk_rows)
+            return
+
+        df = self.get_processed_data()
+        selected = [col for col in columns if col in df.columns] if columns is not None else list(df.columns)
+        for offset in range(0, len(df), chunk_rows):
+            chunk = df.iloc[offset:offset + chunk_rows]
+            if start is not None or end is not None:
+                mask = pd.Series(True, index=chunk.index)
+                if start is not None:
+                    mask &= chunk['term_date'] >= pd.Timestamp(start)
+                if end is not None:
+                    mask &= chunk['term_date'] < pd.Timestamp(end)
+                chunk = chunk.loc[mask]
+            if len(chunk):
+                yield chunk[selected]
+
+    def export_data(
+        self,
+        path: str,
+        file_format: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None,
+        start: Any = None,
+        end: Any = None
+    ) -> int:
+        """
+        Fee seviyesindeki veriyi parça parça dışa aktar (bellek kullanımı parça boyutuyla sınırlı)
+
+        Args:
+            path: Hedef dosya (csv, csv.gz, csv.zst) veya klasör (parquet)
+            file_format: exporter.EXPORT_FORMATS'tan biri (varsayılan: uzantıdan)
+            columns: Sütunlar (varsayılan: tümü). Parquet'te year/month bölüm sütunları eklenir;
+                term tarihi olmayan kayıtlar da yazılır, year=0/month=0 bölümüne düşer
+                (okurken year == 0 ile ayırt edilir).
+            start: Başlangıç tarihi (term_date >= start)
+            end: Bitiş tarihi (term_date < end)
+
+        Returns:
+            Yazılan kayıt sayısı
+
+        Raises:
+            ValueError: Bilinmeyen biçim veya gerekli kütüphane yoksa
+        """
+        file_format = file_format or detect_format(path)
+        if file_format not in EXPORT_FORMATS:
+            raise ValueError(f"Bilinmeyen disa aktarma bicimi: {file_format} ({', '.join(EXPORT_FORMATS)})")
+
+        if file_format == 'parquet':
+            if columns is not None:
+                columns = list(columns) + [col for col in PARTITION_COLUMNS if col not in columns]
+            batches = self.iter_fee_detail(columns, start, end)
+            if self.fee_detail is not None:
+                rows = write_parquet(batches, path, schema=self.fee_detail.schema(columns))
+            else:
+                df = self.get_processed_data()
+                sample = df[[col for col in columns if col in df.columns]] if columns is not None else df
+                rows = write_parquet(batches, path, sample=sample)
+        else:
+            rows = write_csv(self.iter_fee_detail(columns, start, end), path, file_format)
+
+        print(f"[OK] {rows:,} kayit '{path}' konumuna kaydedildi ({file_format})")
+        return rows
+
     def export_to_csv(self, filename: str = "processed_data.csv"):
         """
-        İşlenmiş veriyi CSV olarak dışa aktar
-        
+        İşlenmiş veriyi CSV olarak dışa aktar (bkz. export_data; .csv.gz/.csv.zst uzantıları sıkıştırır)
+
         Args:
             filename: Kaydedilecek dosya adı
         """
-        if self.df_merged is not None:
-            self.df_merged.to_csv(filename, index=False, encoding='utf-8-sig')
-            print(f"[OK] Veri '{filename}' dosyasina kaydedildi!")
+        has_data = (self.fee_detail.version() is not None if self.fee_detail is not None
+                    else not self.get_processed_data().empty)
+        if has_data:
+            self.export_data(filename)
         else:
             print("[HATA] Henuz islenmis veri yok!")
\ No newline at end of file
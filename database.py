@@ -3,31 +3,324 @@ Veritabanı bağlantı yönetimi modülü.
 PostgreSQL veritabanına SQLAlchemy ile bağlantı sağlar.
 """
 
+import asyncio
+import hashlib
+import json
 import os
-from typing import Optional
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import IO, Any, Awaitable, Dict, List, Optional, Sequence, Tuple, TypeVar
 from urllib.parse import quote_plus
-from sqlalchemy import create_engine, text
+from sqlalchemy import bindparam, create_engine, text
 from sqlalchemy.engine import Engine
 from sqlalchemy.exc import SQLAlchemyError
 from dotenv import load_dotenv
 import logging
+import pandas as pd
+
+from config import Config
+from monthly_cube import MonthlyCube
+
+# Async engine (opsiyonel - asyncpg yüklü değilse sadece senkron DatabaseManager kullanılır)
+try:
+    import asyncpg  # type: ignore  # noqa: F401
+    from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+    ASYNCPG_AVAILABLE = True
+except ImportError:
+    ASYNCPG_AVAILABLE = False
+
+T = TypeVar('T')
 
 # Logging yapılandırması
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-class DatabaseManager:
+# SQL token'ları: yorumlar, metin sabitleri, tırnaklı isimler, (noktalı) kelimeler ve tek karakterler
+SQL_TOKEN_PATTERN = re.compile(
+    r"--[^\n]*|/\*.*?\*/|'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|\w+(?:\.\w+)*|\S", re.DOTALL
+)
+SQL_IDENTIFIER_PATTERN = re.compile(r"[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)?")
+# FROM listesini bitiren anahtar kelimeler (aynı parantez seviyesinde)
+SQL_CLAUSE_KEYWORDS = {
+    'where', 'group', 'order', 'having', 'limit', 'offset', 'union', 'intersect',
+    'except', 'window', 'fetch', 'for', 'returning', 'select', 'values',
+}
+
+
+def _sql_tokens(query: str) -> List[str]:
+    """Sorgunun token'ları (yorumlar atılır)."""
+    return [token for token in SQL_TOKEN_PATTERN.findall(query) if not token.startswith(('--', '/*'))]
+
+
+def normalize_sql(query: str) -> str:
     """
-    PostgreSQL veritabanı bağlantı yöneticisi.
+    Sorguyu cache anahtarı için normalize et: yorumlar atılır, boşluklar tek boşluğa
+    iner, tırnaksız kelimeler küçük harfe çevrilir (PostgreSQL'de büyük/küçük harf
+    duyarsız), metin sabitleri ve tırnaklı isimler aynen kalır.
 
-    .env dosyasından bağlantı bilgilerini okur ve
-    SQLAlchemy engine oluşturur.
+    Args:
+        query: SQL sorgusu
+
+    Returns:
+        str: Normalize sorgu
+    """
+    tokens = [token if token[0] in "'\"" else token.lower() for token in _sql_tokens(query)]
+    while tokens and tokens[-1] == ';':
+        tokens.pop()
+    return " ".join(tokens)
+
+
+def referenced_tables(query: str, schema: Optional[str] = None) -> Optional[List[str]]:
+    """
+    Sorgunun FROM/JOIN listelerindeki tabloları bul (şema ile nitelenmiş).
+    Alt sorgulardaki tablolar da bulunur. Emin olunamayan durumlarda (tırnaklı isim,
+    FROM'da fonksiyon çağrısı vb.) None döner ve sonuç cache'lenmez; CTE isimleri
+    tablo sayılır, parmak izi bulunamadığı için yine cache'lenmez.
+
+    Args:
+        query: SQL sorgusu
+        schema: Nitelenmemiş tabloların şeması (None ise .env'den alınır)
+
+    Returns:
+        Tablo isimleri (schema.tablo, tekrarsız) veya None
+    """
+    schema_name = schema if schema is not None else os.getenv('DB_SCHEMA', 'public')
+    tokens = _sql_tokens(query)
+    tables: List[str] = []
+    states: List[Optional[str]] = [None]  # Parantez seviyesi başına: None, 'from' veya 'on'
+    expect_table = False
+
+    for index, token in enumerate(tokens):
+        lower = token.lower()
+        if expect_table:
+            expect_table = False
+            if token == '(':
+                states.append(None)  # Alt sorgu: içindeki FROM'lar ayrıca bulunur
+                continue
+            if (not SQL_IDENTIFIER_PATTERN.fullmatch(token)
+                    or (index + 1 < len(tokens) and tokens[index + 1] == '(')):
+                return None
+            name = lower if '.' in lower else f"{schema_name}.{lower}"
+            if name not in tables:
+                tables.append(name)
+            continue
+
+        if token == '(':
+            states.append(None)
+        elif token == ')':
+            if len(states) > 1:
+                states.pop()
+        elif lower in ('from', 'join'):
+            states[-1] = 'from'
+            expect_table = True
+        elif lower in ('on', 'using') and states[-1] == 'from':
+            states[-1] = 'on'
+        elif lower in SQL_CLAUSE_KEYWORDS:
+            states[-1] = None
+        elif token == ',' and states[-1] in ('from', 'on'):
+            states[-1] = 'from'
+            expect_table = True
+
+    return tables
+
+
+class QueryResultCache:
+    """
+    Sorgu sonuçları için iki katmanlı cache: bellekte LRU, opsiyonel olarak diskte Parquet.
+
+    Girdiler anahtar (normalize SQL + parametreler) ve kaynak tabloların parmak izi ile
+    tutulur; parmak izi değiştiyse girdi geçersizdir. Disk katmanında dosya adı parmak
+    izini içerdiği için yazan süreç ile okuyan süreç hiçbir zaman karışık sürüm görmez.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_mb: Optional[int] = None,
+        disk: Optional[bool] = None,
+        directory: Optional[Path] = None
+    ):
+        """
+        Args:
+            max_entries: Bellekteki en fazla girdi (varsayılan: Config.QUERY_CACHE_MAX_ENTRIES)
+            max_mb: Bellek katmanının boyutu (varsayılan: Config.QUERY_CACHE_MAX_MB)
+            disk: Disk katmanı açık mı (varsayılan: Config.QUERY_CACHE_DISK_ENABLED)
+            directory: Disk katmanının dizini (varsayılan: Config.QUERY_CACHE_DIR)
+        """
+        self.max_entries = max_entries if max_entries is not None else Config.QUERY_CACHE_MAX_ENTRIES
+        self.max_bytes = (max_mb if max_mb is not None else Config.QUERY_CACHE_MAX_MB) * 1024 * 1024
+        disk = disk if disk is not None else Config.QUERY_CACHE_DISK_ENABLED
+        self.directory: Optional[Path] = (directory or Config.QUERY_CACHE_DIR) if disk else None
+        self.max_disk_bytes = Config.QUERY_CACHE_DISK_MB * 1024 * 1024
+        self._entries: 'OrderedDict[str, Tuple[str, pd.DataFrame, int]]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(query: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Cache anahtarı: normalize SQL + sıralı parametrelerin SHA-256 özeti
+
+        Args:
+            query: SQL sorgusu
+            params: Bind parametreleri
+
+        Returns:
+            str: Anahtar
+        """
+        payload = normalize_sql(query) + "\0" + json.dumps(params or {}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _disk_path(self, key: str, fingerprint: str) -> Path:
+        """Girdinin disk katmanındaki dosyası (parmak izi özeti dosya adında)."""
+        digest = hashlib.sha256(fingerprint.encode('utf-8')).hexdigest()[:16]
+        return self.directory / f"{key}-{digest}.parquet"
+
+    def get(self, key: str, fingerprint: str) -> Optional[pd.DataFrame]:
+        """
+        Parmak izi eşleşen girdiyi döndür (önce bellek, sonra disk)
+
+        Args:
+            key: make_key çıktısı
+            fingerprint: Kaynak tabloların güncel parmak izi
+
+        Returns:
+            Sonucun kopyası veya None (girdi yok ya da eskimiş)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == fingerprint:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1].copy()
+            if entry is not None:
+                self._remove(key)
+
+        if self.directory is not None:
+            path = self._disk_path(key, fingerprint)
+            try:
+                df = pd.read_parquet(path)
+                os.utime(path)  # Disk katmanında en eski kullanılan önce silinir
+            except (OSError, ValueError):
+                df = None
+            if df is not None:
+                with self._lock:
+                    self.hits += 1
+                    self._store(key, fingerprint, df)
+                return df.copy()
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, fingerprint: str, df: pd.DataFrame):
+        """
+        Sonucu cache'e yaz (bellek katmanına sığmıyorsa sadece diske)
+
+        Args:
+            key: make_key çıktısı
+            fingerprint: Sorgudan önce alınan parmak izi
+            df: Sorgu sonucu
+        """
+        df = df.copy()
+        with self._lock:
+            self._store(key, fingerprint, df)
+
+        if self.directory is not None:
+            self._write_disk(key, fingerprint, df)
+
+    def _store(self, key: str, fingerprint: str, df: pd.DataFrame):
+        """Bellek katmanına ekle ve sınırları aşan en eski girdileri çıkar (kilit altında çağrılır)."""
+        size = int(df.memory_usage(deep=True).sum())
+        if key in self._entries:
+            self._remove(key)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (fingerprint, df, size)
+        self._bytes += size
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str):
+        """Girdiyi bellek katmanından çıkar (kilit altında çağrılır)."""
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def _write_disk(self, key: str, fingerprint: str, df: pd.DataFrame):
+        """
+        Girdiyi atomik olarak diske yaz; aynı anahtarın eski sürümlerini ve
+        boyut sınırını aşan en eski dosyaları sil.
+        """
+        path = self._disk_path(key, fingerprint)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{time.time_ns()}")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            df.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            # Parquet'e yazılamayan sonuçlar (örn: karışık tipli sütunlar) sadece bellekte tutulur
+            logger.warning(f"Sorgu sonucu diske yazılamadı: {str(e)}")
+            tmp_path.unlink(missing_ok=True)
+            return
+
+        files = []
+        for other in self.directory.glob("*.parquet"):
+            try:
+                if other.name.startswith(f"{key}-") and other != path:
+                    other.unlink()
+                else:
+                    stat = other.stat()
+                    files.append((stat.st_mtime, stat.st_size, other))
+            except OSError:
+                continue  # Başka bir süreç silmiş olabilir
+
+        total = sum(size for _, size, _ in files)
+        for _, size, other in sorted(files, key=lambda item: item[0]):
+            if total <= self.max_disk_bytes:
+                break
+            if other != path:
+                other.unlink(missing_ok=True)
+                total -= size
+
+    def clear(self):
+        """Bellek ve disk katmanlarını temizle."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        if self.directory is not None and self.directory.exists():
+            for path in self.directory.glob("*.parquet"):
+                path.unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Cache istatistikleri
+
+        Returns:
+            dict: 'entries', 'memory_mb', 'hits', 'misses'
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'memory_mb': round(self._bytes / 1024 / 1024, 2),
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+class DatabaseSettings:
+    """
+    .env dosyasındaki bağlantı bilgileri ve connection pool ayarları.
+    Senkron (DatabaseManager) ve async (AsyncDatabaseManager) yöneticiler ortak kullanır.
     """
 
     def __init__(self):
-        """DatabaseManager başlatıcı."""
-        self.engine: Optional[Engine] = None
+        """Ortam değişkenlerini yükler ve kontrol eder."""
         self._load_environment()
 
     def _load_environment(self) -> None:
@@ -46,11 +339,14 @@ class DatabaseManager:
                 "Lütfen .env dosyasını kontrol edin."
             )
 
-    def get_connection_string(self) -> str:
+    def get_connection_string(self, driver: str = 'postgresql') -> str:
         """
         PostgreSQL bağlantı string'ini oluşturur.
         Özel karakterleri URL encoding ile güvenli hale getirir.
 
+        Args:
+            driver: SQLAlchemy dialect+driver (örn: 'postgresql', 'postgresql+asyncpg')
+
         Returns:
             str: PostgreSQL bağlantı string'i
         """
@@ -64,7 +360,37 @@ class DatabaseManager:
         db_user_encoded = quote_plus(str(db_user))
         db_password_encoded = quote_plus(str(db_password))
 
-        return f"postgresql://{db_user_encoded}:{db_password_encoded}@{db_host}:{db_port}/{db_name}"
+        return f"{driver}://{db_user_encoded}:{db_password_encoded}@{db_host}:{db_port}/{db_name}"
+
+    def pool_options(self) -> Dict[str, Any]:
+        """
+        Engine'e verilecek connection pool ve log ayarları.
+
+        Returns:
+            dict: create_engine / create_async_engine anahtar argümanları
+        """
+        return {
+            'pool_size': int(os.getenv('DB_POOL_SIZE', 5)),
+            'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 10)),
+            'pool_timeout': int(os.getenv('DB_POOL_TIMEOUT', 30)),
+            'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', 3600)),
+            'echo': os.getenv('DEBUG_MODE', 'False').lower() == 'true',
+        }
+
+
+class DatabaseManager(DatabaseSettings):
+    """
+    PostgreSQL veritabanı bağlantı yöneticisi.
+
+    .env dosyasından bağlantı bilgilerini okur ve
+    SQLAlchemy engine oluşturur.
+    """
+
+    def __init__(self):
+        """DatabaseManager başlatıcı."""
+        self.engine: Optional[Engine] = None
+        self.query_cache: Optional[QueryResultCache] = QueryResultCache() if Config.QUERY_CACHE_ENABLED else None
+        super().__init__()
 
     def create_engine(self) -> Engine:
         """
@@ -82,20 +408,8 @@ class DatabaseManager:
         try:
             connection_string = self.get_connection_string()
 
-            # Connection pool ayarları
-            pool_size = int(os.getenv('DB_POOL_SIZE', 5))
-            max_overflow = int(os.getenv('DB_MAX_OVERFLOW', 10))
-            pool_timeout = int(os.getenv('DB_POOL_TIMEOUT', 30))
-            pool_recycle = int(os.getenv('DB_POOL_RECYCLE', 3600))
-
-            self.engine = create_engine(
-                connection_string,
-                pool_size=pool_size,
-                max_overflow=max_overflow,
-                pool_timeout=pool_timeout,
-                pool_recycle=pool_recycle,
-                echo=os.getenv('DEBUG_MODE', 'False').lower() == 'true'
-            )
+            # Connection pool ayarları (.env)
+            self.engine = create_engine(connection_string, **self.pool_options())
 
             logger.info("Veritabanı bağlantısı başarıyla oluşturuldu.")
             return self.engine
@@ -142,6 +456,160 @@ class DatabaseManager:
             logger.info("Veritabanı bağlantısı kapatıldı.")
             self.engine = None
 
+    def copy_query(
+        self,
+        query: str,
+        output: IO[bytes],
+        params: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Sorgu sonucunu PostgreSQL COPY ile CSV olarak dışa aktarır.
+        Satırlar DBAPI üzerinden tek tek çekilmez, sunucu CSV akışı üretir.
+
+        NULL değerler '\\N' olarak yazılır (boş string'lerden ayırt edilebilsin diye).
+
+        Args:
+            query: SELECT sorgusu (SQLAlchemy text formatında, :param bind parametreli)
+            output: CSV'nin yazılacağı binary dosya benzeri nesne
+            params: Bind parametreleri
+
+        Raises:
+            SQLAlchemyError: Bağlantı hatası durumunda
+            psycopg2.Error: COPY hatası durumunda
+        """
+        engine = self.get_engine()
+
+        # Bind parametrelerini sürücünün kendi kaçış kurallarıyla sorguya göm
+        compiled = text(query).compile(dialect=engine.dialect)
+        raw_connection = engine.raw_connection()
+        try:
+            cursor = raw_connection.cursor()
+            sql = str(compiled)
+            if params:
+                sql = cursor.mogrify(sql, compiled.construct_params(params)).decode()
+
+            cursor.copy_expert(
+                f"COPY ({sql}) TO STDOUT WITH (FORMAT csv, HEADER true, NULL '\\N')",
+                output
+            )
+            cursor.close()
+        finally:
+            raw_connection.close()
+
+    def get_table_fingerprint(self, table_name: str, schema: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Tablonun ucuz bir parmak izini döndürür (kayıt sayısı + en büyük id).
+        Parmak izi değişmediyse tablonun içeriği değişmemiş kabul edilir.
+
+        Args:
+            table_name: Tablo ismi
+            schema: Schema adı (None ise .env'den alınır)
+
+        Returns:
+            dict: {'row_count': int, 'max_id': str} veya hata durumunda None
+        """
+        try:
+            schema_name = schema if schema is not None else os.getenv('DB_SCHEMA', 'public')
+
+            engine = self.get_engine()
+            with engine.connect() as connection:
+                result = connection.execute(text(
+                    f"SELECT count(*), max(id) FROM {schema_name}.{table_name}"
+                ))
+                row_count, max_id = result.fetchone()
+                return {
+                    'row_count': int(row_count),
+                    'max_id': None if max_id is None else str(max_id)
+                }
+        except SQLAlchemyError as e:
+            logger.error(f"Tablo parmak izi alınırken hata: {str(e)}")
+            return None
+
+    def get_change_fingerprint(self, table_names: Sequence[str]) -> Optional[str]:
+        """
+        Tabloların değişim parmak izini tek sorguda döndürür (sorgu cache'inin geçerlilik kontrolü).
+
+        Config.QUERY_CACHE_PROBE 'stats' ise pg_stat_user_tables'taki ekleme/güncelleme/silme
+        sayaçları ve dosya numarası (TRUNCATE ve REFRESH MATERIALIZED VIEW değiştirir) kullanılır;
+        tablo taranmaz. Sayaçlar commit'ten sonra kısa bir gecikmeyle (PostgreSQL istatistik
+        aralığı) güncellenir. 'count' ise count(*) ve en büyük watermark değeri okunur (kesin ama
+        tabloyu tarar).
+
+        Args:
+            table_names: schema.tablo isimleri
+
+        Returns:
+            str: Parmak izi (JSON) veya tablolardan biri bulunamazsa/hata durumunda None
+        """
+        names = sorted(set(table_names))
+        try:
+            with self.get_engine().connect() as connection:
+                if Config.QUERY_CACHE_PROBE == 'count':
+                    rows = []
+                    for name in names:
+                        column = Config.DB_WATERMARK_COLUMNS.get(name.split('.')[-1])
+                        row_count, max_value = connection.execute(text(
+                            f"SELECT count(*), {f'max({column})::text' if column else 'NULL'} FROM {name}"
+                        )).fetchone()
+                        rows.append((name, int(row_count), max_value))
+                else:
+                    rows = [tuple(row) for row in connection.execute(text(
+                        "SELECT schemaname || '.' || relname AS name, n_tup_ins, n_tup_upd, n_tup_del, "
+                        "pg_relation_filenode(relid) "
+                        "FROM pg_stat_user_tables "
+                        "WHERE schemaname || '.' || relname IN :names "
+                        "ORDER BY 1"
+                    ).bindparams(bindparam('names', expanding=True)), {"names": names})]
+        except SQLAlchemyError as e:
+            logger.error(f"Tablo değişim parmak izi alınırken hata: {str(e)}")
+            return None
+
+        if len(rows) != len(names):
+            return None
+        return json.dumps(rows, default=str)
+
+    def read_sql_cached(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]] = None,
+        tables: Optional[Sequence[str]] = None,
+        version: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        SELECT sorgusunu sonuç cache'i üzerinden çalıştırır.
+
+        Tabloların parmak izi sorgudan önce alınır: sorgu sırasında veri değişirse bir
+        sonraki kontrolde parmak izi farklı çıkar ve sonuç yeniden okunur. Cache kapalıysa,
+        tablolar belirlenemiyorsa ya da parmak izi alınamıyorsa sorgu doğrudan çalışır.
+
+        Args:
+            query: SQL sorgusu
+            params: Bind parametreleri
+            tables: Sorgunun okuduğu tablolar (schema.tablo; varsayılan: sorgudan bulunur)
+            version: Parmak izine eklenen, çağıranın bildiği sürüm (örn: view'ın son yenilenme
+                zamanı); parmak izinin yakalayamadığı değişiklikleri ayırt eder
+
+        Returns:
+            pd.DataFrame: Sorgu sonucu
+        """
+        tables = list(tables) if tables is not None else referenced_tables(query)
+        fingerprint = self.get_change_fingerprint(tables) if self.query_cache is not None and tables else None
+        if fingerprint is not None and version is not None:
+            fingerprint = json.dumps([version, fingerprint])
+
+        if fingerprint is not None:
+            key = QueryResultCache.make_key(query, params)
+            cached = self.query_cache.get(key, fingerprint)
+            if cached is not None:
+                return cached
+
+        with self.get_engine().connect() as connection:
+            df = pd.read_sql(text(query), connection, params=params)
+
+        if fingerprint is not None:
+            self.query_cache.put(key, fingerprint, df)
+        return df
+
     def get_table_names(self, schema: Optional[str] = None) -> list:
         """
         Veritabanındaki tüm tablo isimlerini getirir.
@@ -166,6 +634,74 @@ class DatabaseManager:
             logger.error(f"Tablo isimleri alınırken hata: {str(e)}")
             return []
 
+    def get_column_names(self, table_names: list, schema: Optional[str] = None) -> Dict[str, list]:
+        """
+        Tabloların sütun isimlerini information_schema.columns'tan tek sorguda getirir.
+
+        Args:
+            table_names: Tablo isimleri
+            schema: Schema adı (None ise .env'den alınır)
+
+        Returns:
+            dict: Tablo ismi -> sütun isimleri (tablo sırasıyla); olmayan tablolar ve
+            hata durumunda sorgu sonucu boş döner
+        """
+        try:
+            schema_name = schema if schema is not None else os.getenv('DB_SCHEMA', 'public')
+
+            engine = self.get_engine()
+            with engine.connect() as connection:
+                result = connection.execute(text(
+                    "SELECT table_name, column_name FROM information_schema.columns "
+                    "WHERE table_schema = :schema AND table_name IN :table_names "
+                    "ORDER BY table_name, ordinal_position"
+                ).bindparams(bindparam('table_names', expanding=True)),
+                    {"schema": schema_name, "table_names": list(table_names)})
+                columns: Dict[str, list] = {}
+                for table_name, column_name in result:
+                    columns.setdefault(table_name, []).append(column_name)
+                return columns
+        except SQLAlchemyError as e:
+            logger.error(f"Sütun isimleri alınırken hata: {str(e)}")
+            return {}
+
+    def get_indexes(self, table_names: list, schema: Optional[str] = None) -> list:
+        """
+        Tabloların indekslerini pg_indexes'ten getirir (geçerlilik bilgisiyle).
+        CREATE INDEX CONCURRENTLY yarıda kalırsa indeks geçersiz (valid=False) kalır.
+
+        Args:
+            table_names: Tablo isimleri
+            schema: Schema adı (None ise .env'den alınır)
+
+        Returns:
+            list: {'table_name', 'index_name', 'definition', 'valid'} sözlükleri;
+            hata durumunda boş liste
+        """
+        try:
+            schema_name = schema if schema is not None else os.getenv('DB_SCHEMA', 'public')
+
+            engine = self.get_engine()
+            with engine.connect() as connection:
+                result = connection.execute(text(
+                    "SELECT i.tablename, i.indexname, i.indexdef, x.indisvalid "
+                    "FROM pg_indexes i "
+                    "JOIN pg_namespace n ON n.nspname = i.schemaname "
+                    "JOIN pg_class c ON c.relname = i.indexname AND c.relnamespace = n.oid "
+                    "JOIN pg_index x ON x.indexrelid = c.oid "
+                    "WHERE i.schemaname = :schema AND i.tablename IN :table_names "
+                    "ORDER BY i.tablename, i.indexname"
+                ).bindparams(bindparam('table_names', expanding=True)),
+                    {"schema": schema_name, "table_names": list(table_names)})
+                return [
+                    {'table_name': table_name, 'index_name': index_name,
+                     'definition': definition, 'valid': bool(valid)}
+                    for table_name, index_name, definition, valid in result
+                ]
+        except SQLAlchemyError as e:
+            logger.error(f"İndeksler alınırken hata: {str(e)}")
+            return []
+
     def check_table_exists(self, table_name: str, schema: Optional[str] = None) -> bool:
         """
         Belirtilen tablonun var olup olmadığını kontrol eder.
@@ -196,8 +732,614 @@ class DatabaseManager:
             return False
 
 
+# Term tarihini (YYYYMMDDHHmmss, sayı ya da metin) timestamp'e çeviren ifade.
+# Geçersiz değerler NULL olur (pandas'taki errors='coerce' gibi); iç içe CASE'ler,
+# dönüşümlerin sadece kontrolden geçen değerlerde çalışmasını garanti eder.
+COMPACT_TIMESTAMP_SQL = """
+CASE WHEN CAST({column} AS text) ~ '^[0-9]{{14}}$' THEN
+    CASE WHEN substr(CAST({column} AS text), 1, 4)::int BETWEEN 1678 AND 2261
+          AND substr(CAST({column} AS text), 5, 2)::int BETWEEN 1 AND 12
+          AND substr(CAST({column} AS text), 7, 2)::int BETWEEN 1 AND 31
+          AND substr(CAST({column} AS text), 9, 2)::int < 24
+          AND substr(CAST({column} AS text), 11, 2)::int < 60
+          AND substr(CAST({column} AS text), 13, 2)::int < 60 THEN
+        CASE WHEN extract(month FROM make_date(substr(CAST({column} AS text), 1, 4)::int,
+                                               substr(CAST({column} AS text), 5, 2)::int, 1)
+                                     + (substr(CAST({column} AS text), 7, 2)::int - 1))
+                  = substr(CAST({column} AS text), 5, 2)::int THEN
+            make_timestamp(substr(CAST({column} AS text), 1, 4)::int, substr(CAST({column} AS text), 5, 2)::int,
+                           substr(CAST({column} AS text), 7, 2)::int, substr(CAST({column} AS text), 9, 2)::int,
+                           substr(CAST({column} AS text), 11, 2)::int, substr(CAST({column} AS text), 13, 2)::int)
+        END
+    END
+END"""
+
+# Birleştirilmiş fee satırları (merge_data ile aynı join'ler). is_first: satır, term'in ilk
+# satırı mı (ilk fee'sinin ilk tüketimi). Tablo sırası yerine en küçük id'ler kullanılır;
+# tablolar id sırasıyla okunduğunda pandas'taki ilk satırla aynıdır.
+ROLLUP_FEE_ROWS_SQL = """
+WITH terms AS (
+    SELECT t.id, t.accrual_id, {term_date} AS term_date
+    FROM {accruals} a
+    JOIN {terms} t ON t.accrual_id = a.id
+),
+fee_rows AS (
+    SELECT
+        t.id AS accrual_term_id, t.accrual_id, t.term_date,
+        split_part(f.fee_code, '_', 1) AS fee_prefix, c.channel_key,
+        f.consumption,
+        CASE WHEN f.consumption > 0 AND f.unit_price > 0 AND f.unit_price <= {max_unit_price}
+             THEN f.amount END AS cost,
+        f.id = first_fee.id AND c.id IS NOT DISTINCT FROM first_consumption.id AS is_first
+    FROM terms t
+    JOIN {fees} f ON f.accrual_term_id = t.id
+    LEFT JOIN {consumptions} c ON c.accrual_fee_id = f.id
+    JOIN (SELECT accrual_term_id, min(id) AS id FROM {fees} GROUP BY accrual_term_id) first_fee
+        ON first_fee.accrual_term_id = t.id
+    LEFT JOIN (SELECT accrual_fee_id, min(id) AS id FROM {consumptions} GROUP BY accrual_fee_id) first_consumption
+        ON first_consumption.accrual_fee_id = f.id
+)"""
+
+# View adı -> (SELECT, unique index sütunları). Sıra yenileme sırasıdır: yıllık ve tarife
+# özetleri aylık küpten ve term toplamlarından hesaplanır, ham tablolar iki kez taranır.
+ROLLUP_VIEWS: Dict[str, tuple] = {
+    'mv_term_totals': ("""{fee_rows}
+SELECT
+    accrual_term_id, accrual_id, term_date,
+    CAST(extract(year FROM term_date) AS double precision) AS year,
+    CAST(extract(month FROM term_date) AS double precision) AS month,
+    coalesce(sum(consumption), 0) AS total_consumption,
+    coalesce(sum(cost), 0) AS term_total_cost,
+    max(fee_prefix) FILTER (WHERE is_first) AS tariff_category
+FROM fee_rows
+GROUP BY accrual_term_id, accrual_id, term_date""", ['accrual_term_id']),
+    'mv_monthly_rollup': ("""{fee_rows}
+SELECT
+    CAST(extract(year FROM term_date) AS double precision) AS year,
+    CAST(extract(month FROM term_date) AS double precision) AS month,
+    coalesce(fee_prefix, 'UNKNOWN') AS fee_prefix,
+    coalesce(channel_key, 'UNKNOWN') AS channel_key,
+    coalesce(sum(consumption), 0) AS consumption,
+    coalesce(sum(cost), 0) AS cost,
+    count(*) AS record_count,
+    count(*) FILTER (WHERE is_first) AS term_count
+FROM fee_rows
+GROUP BY 1, 2, 3, 4""", ['year', 'month', 'fee_prefix', 'channel_key']),
+    'mv_yearly_rollup': ("""
+SELECT
+    year,
+    sum(consumption) AS consumption,
+    sum(cost) AS cost,
+    sum(record_count) AS record_count,
+    sum(term_count) AS term_count
+FROM {schema}.mv_monthly_rollup
+GROUP BY year""", ['year']),
+    'mv_tariff_costs': ("""
+SELECT tariff_category, sum(term_total_cost) AS cost
+FROM {schema}.mv_term_totals
+WHERE tariff_category IS NOT NULL
+GROUP BY tariff_category""", ['tariff_category']),
+}
+
+
+class MaterializedRollups:
+    """
+    PostgreSQL materialized view'ları ile sunucu tarafında tutulan özetler.
+
+    Term toplamları, aylık küp, yıllık ve tarife özetleri veritabanında
+    hesaplanır; sayfalar ham tabloları okumadan bu küçük view'ları okur.
+    Her yenileme, kaynak tabloların parmak izini (kayıt sayısı + en büyük id)
+    yenileme log tablosuna yazar; parmak izi değişmişse view'lar eskimiş sayılır.
+    Yenileme, view'lar doluysa CONCURRENTLY ile yapılır (okuyanlar beklemez) ve
+    advisory lock ile aynı anda tek süreç yeniler.
+    """
+
+    LOG_TABLE = "rollup_refresh_log"
+    LOCK_KEY = 804_215_001  # pg_advisory_xact_lock anahtarı (uygulamaya özgü sabit)
+
+    def __init__(self, db_manager: Optional[DatabaseManager] = None, schema: Optional[str] = None):
+        """
+        Args:
+            db_manager: DatabaseManager (None ise global instance)
+            schema: View'ların şeması (varsayılan: Config.ROLLUP_SCHEMA)
+        """
+        self.db_manager = db_manager or get_database_manager()
+        self.schema = schema or Config.ROLLUP_SCHEMA
+        self.version: Optional[str] = None
+
+    def _view_sql(self, name: str) -> str:
+        """View'ın SELECT sorgusu (tablo adları ve fee satırları yerleştirilmiş)."""
+        from data_processor import BILLABLE_MAX_UNIT_PRICE
+
+        fee_rows = ROLLUP_FEE_ROWS_SQL.format(
+            term_date=COMPACT_TIMESTAMP_SQL.format(column='t.term_date'),
+            accruals=Config.get_full_table_name(Config.DB_TABLE_ACCRUALS),
+            terms=Config.get_full_table_name(Config.DB_TABLE_ACCRUAL_TERMS),
+            fees=Config.get_full_table_name(Config.DB_TABLE_ACCRUAL_FEES),
+            consumptions=Config.get_full_table_name(Config.DB_TABLE_ACCRUAL_FEE_CONSUMPTIONS),
+            max_unit_price=BILLABLE_MAX_UNIT_PRICE,
+        )
+        return ROLLUP_VIEWS[name][0].format(fee_rows=fee_rows, schema=self.schema)
+
+    def create(self) -> bool:
+        """
+        View'ları (boş olarak), unique index'lerini ve yenileme log tablosunu oluştur.
+        Var olanlara dokunulmaz.
+
+        Returns:
+            bool: Başarılıysa True
+        """
+        try:
+            with self.db_manager.get_engine().begin() as connection:
+                connection.execute(text(f"CREATE SCHEMA IF NOT EXISTS {self.schema}"))
+                connection.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {self.schema}.{self.LOG_TABLE} ("
+                    "view_name text PRIMARY KEY, "
+                    "refreshed_at timestamptz NOT NULL, "
+                    "fingerprint text NOT NULL, "
+                    "duration_ms integer)"
+                ))
+                for name, (_, unique_columns) in ROLLUP_VIEWS.items():
+                    connection.execute(text(
+                        f"CREATE MATERIALIZED VIEW IF NOT EXISTS {self.schema}.{name} AS "
+                        f"{self._view_sql(name)}\nWITH NO DATA"
+                    ))
+                    # REFRESH ... CONCURRENTLY view'da unique index ister
+                    connection.execute(text(
+                        f"CREATE UNIQUE INDEX IF NOT EXISTS {name}_key "
+                        f"ON {self.schema}.{name} ({', '.join(unique_columns)})"
+                    ))
+            return True
+        except SQLAlchemyError as e:
+            logger.error(f"Materialized view'lar oluşturulurken hata: {str(e)}")
+            return False
+
+    def source_fingerprint(self) -> Optional[str]:
+        """
+        Kaynak tabloların parmak izi (view'ların hangi veriden hesaplandığını belirler)
+
+        Returns:
+            str: JSON parmak izi veya alınamazsa None
+        """
+        tables = {}
+        for table_name in Config.REQUIRED_DB_TABLES:
+            fingerprint = self.db_manager.get_table_fingerprint(table_name, Config.DB_SCHEMA)
+            if fingerprint is None:
+                return None
+            tables[table_name] = fingerprint
+        return json.dumps(tables, sort_keys=True)
+
+    def stale_views(self, fingerprint: Optional[str] = None) -> list:
+        """
+        Eskimiş view'ları bul: hiç doldurulmamış, log kaydı olmayan ya da kaynak
+        tabloların parmak izi son yenilemeden beri değişmiş olanlar.
+
+        Args:
+            fingerprint: Kaynak parmak izi (None ise hesaplanır)
+
+        Returns:
+            list: Eskimiş view isimleri (yenileme sırasıyla; durum okunamazsa hepsi)
+        """
+        fingerprint = fingerprint or self.source_fingerprint()
+        try:
+            with self.db_manager.get_engine().connect() as connection:
+                populated = dict(connection.execute(text(
+                    "SELECT matviewname, ispopulated FROM pg_matviews WHERE schemaname = :schema"
+                ), {"schema": self.schema}).fetchall())
+                logged = dict(connection.execute(text(
+                    f"SELECT view_name, fingerprint FROM {self.schema}.{self.LOG_TABLE}"
+                )).fetchall())
+        except SQLAlchemyError as e:
+            logger.error(f"Materialized view durumu okunurken hata: {str(e)}")
+            return list(ROLLUP_VIEWS)
+
+        return [
+            name for name in ROLLUP_VIEWS
+            if not populated.get(name) or fingerprint is None or logged.get(name) != fingerprint
+        ]
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Eskimiş view'ları (force ise hepsini) sırayla yenile.
+        Başka bir süreç yeniliyorsa beklemeden çıkılır.
+
+        Args:
+            force: Parmak izinden bağımsız olarak hepsini yenile
+
+        Returns:
+            bool: View'lar güncelse (ya da başka süreç yeniliyorsa) True
+        """
+        fingerprint = self.source_fingerprint()
+        stale = list(ROLLUP_VIEWS) if force else self.stale_views(fingerprint)
+        if not stale:
+            return True
+        if fingerprint is None:
+            return False
+
+        # Bir view yenilenince ondan hesaplanan view'lar da yenilenir
+        stale = list(ROLLUP_VIEWS)[list(ROLLUP_VIEWS).index(stale[0]):]
+
+        try:
+            with self.db_manager.get_engine().begin() as connection:
+                locked = connection.execute(
+                    text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": self.LOCK_KEY}
+                ).scalar()
+                if not locked:
+                    logger.info("Materialized view'lar başka bir süreç tarafından yenileniyor.")
+                    return True
+
+                populated = dict(connection.execute(text(
+                    "SELECT matviewname, ispopulated FROM pg_matviews WHERE schemaname = :schema"
+                ), {"schema": self.schema}).fetchall())
+
+                for name in stale:
+                    # CONCURRENTLY sadece dolu view'larda kullanılabilir
+                    concurrently = "CONCURRENTLY " if Config.ROLLUP_REFRESH_CONCURRENTLY and populated.get(name) else ""
+                    start = time.perf_counter()
+                    connection.execute(text(f"REFRESH MATERIALIZED VIEW {concurrently}{self.schema}.{name}"))
+                    connection.execute(text(
+                        f"INSERT INTO {self.schema}.{self.LOG_TABLE} (view_name, refreshed_at, fingerprint, duration_ms) "
+                        "VALUES (:name, now(), :fingerprint, :duration) "
+                        "ON CONFLICT (view_name) DO UPDATE SET refreshed_at = EXCLUDED.refreshed_at, "
+                        "fingerprint = EXCLUDED.fingerprint, duration_ms = EXCLUDED.duration_ms"
+                    ), {"name": name, "fingerprint": fingerprint,
+                        "duration": int((time.perf_counter() - start) * 1000)})
+                    logger.info(f"{name} yenilendi ({time.perf_counter() - start:.2f} sn)")
+            return True
+        except SQLAlchemyError as e:
+            logger.error(f"Materialized view'lar yenilenirken hata: {str(e)}")
+            return False
+
+    def open(self) -> bool:
+        """
+        View'ları gerekirse oluştur ve eskimişse yenile; sürümü (son yenileme zamanı) ata.
+
+        Returns:
+            bool: View'lar okunabilir durumdaysa True
+        """
+        if not self.create() or not self.refresh():
+            return False
+        try:
+            with self.db_manager.get_engine().connect() as connection:
+                refreshed_at = connection.execute(text(
+                    f"SELECT max(refreshed_at) FROM {self.schema}.{self.LOG_TABLE}"
+                )).scalar()
+        except SQLAlchemyError as e:
+            logger.error(f"Yenileme log'u okunurken hata: {str(e)}")
+            return False
+        self.version = None if refreshed_at is None else str(refreshed_at)
+        return self.version is not None
+
+    def query(self, name: str, order_by: Optional[str] = None) -> pd.DataFrame:
+        """
+        Bir view'ı oku
+
+        Args:
+            name: View ismi (ROLLUP_VIEWS)
+            order_by: Opsiyonel ORDER BY ifadesi
+
+        Returns:
+            View içeriği
+        """
+        sql = f"SELECT * FROM {self.schema}.{name}"
+        if order_by:
+            sql += f" ORDER BY {order_by}"
+        # CONCURRENTLY yenileme kayıt sayısını değiştirmeyebilir; yenileme zamanı (self.version)
+        # parmak izine eklenir, yenilenen view'ın eski sonucu cache'ten dönmez
+        return self.db_manager.read_sql_cached(sql, tables=[f"{self.schema}.{name}"], version=self.version)
+
+    def monthly_cube(self) -> MonthlyCube:
+        """
+        Aylık küp (build_monthly_cube ile aynı hücreler)
+
+        Returns:
+            MonthlyCube
+        """
+        cells = self.query('mv_monthly_rollup', 'year NULLS LAST, month NULLS LAST, fee_prefix, channel_key')
+        for name in ('year', 'month', 'consumption', 'cost'):
+            cells[name] = cells[name].astype('float64')
+        return MonthlyCube(cells[MonthlyCube.DIMENSIONS + MonthlyCube.MEASURES])
+
+    def term_table(self) -> pd.DataFrame:
+        """
+        Term tablosu (build_term_table ile aynı satırlar, accrual/term id sırasıyla)
+
+        Returns:
+            Term tablosu (TERM_TABLE_COLUMNS)
+        """
+        from data_processor import TERM_TABLE_COLUMNS
+
+        df = self.query('mv_term_totals', 'accrual_id, accrual_term_id')
+        df['term_date'] = pd.to_datetime(df['term_date']).astype('datetime64[ns]')
+        for name in ('year', 'month', 'total_consumption', 'term_total_cost'):
+            df[name] = df[name].astype('float64')
+        return df[TERM_TABLE_COLUMNS]
+
+    def yearly(self) -> pd.DataFrame:
+        """
+        Yıllık toplamlar (MonthlyCube.by_year ile aynı; yılı bilinmeyenler hariç)
+
+        Returns:
+            year + consumption, cost, record_count, term_count
+        """
+        df = self.query('mv_yearly_rollup', 'year')
+        df = df[df['year'].notna()].reset_index(drop=True)
+        df['year'] = df['year'].astype(int)
+        return df
+
+    def tariff_costs(self) -> pd.Series:
+        """
+        Tarife kategorisi bazında term maliyetleri (SnapshotAnalytics.tariff_costs ile aynı)
+
+        Returns:
+            Kategori -> toplam term_total_cost
+        """
+        costs = self.query('mv_tariff_costs', 'tariff_category')
+        return costs.set_index('tariff_category')['cost'].astype('float64')
+
+
+class AsyncDatabaseManager(DatabaseSettings):
+    """
+    SQLAlchemy asyncio engine'i (asyncpg) ile async veritabanı yöneticisi.
+
+    DatabaseManager ile aynı .env bağlantı bilgilerini ve pool ayarlarını kullanır.
+    Birbirinden bağımsız sorgular (tablo okumaları, tablo kontrolleri, özet view'lar)
+    asyncio.gather ile aynı anda beklenir; aynı anda açık bağlantı sayısı pool
+    kapasitesiyle (DB_POOL_SIZE + DB_MAX_OVERFLOW) sınırlanır.
+    Senkron koddan (Streamlit) run() ile çağrılır: coroutine'ler yöneticiye ait
+    tek bir arka plan event loop'unda çalışır, pool'daki bağlantılar o loop'a bağlıdır.
+    """
+
+    def __init__(self):
+        """AsyncDatabaseManager başlatıcı."""
+        self.engine: Optional['AsyncEngine'] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        super().__init__()
+
+    @property
+    def available(self) -> bool:
+        """asyncpg yüklü mü?"""
+        return ASYNCPG_AVAILABLE
+
+    def create_engine(self) -> 'AsyncEngine':
+        """
+        Async SQLAlchemy engine oluşturur (bağlantılar ilk sorguda açılır).
+
+        Returns:
+            AsyncEngine: Async engine nesnesi
+
+        Raises:
+            ImportError: asyncpg yüklü değilse
+        """
+        if self.engine is not None:
+            return self.engine
+        if not ASYNCPG_AVAILABLE:
+            raise ImportError("Async veritabani katmani icin asyncpg gerekli: pip install asyncpg")
+
+        options = self.pool_options()
+        self.engine = create_async_engine(self.get_connection_string('postgresql+asyncpg'), **options)
+        self._semaphore = asyncio.Semaphore(options['pool_size'] + options['max_overflow'])
+        logger.info("Async veritabanı bağlantısı başarıyla oluşturuldu.")
+        return self.engine
+
+    def get_engine(self) -> 'AsyncEngine':
+        """
+        Mevcut async engine'i döndürür veya yoksa oluşturur.
+
+        Returns:
+            AsyncEngine: Async engine nesnesi
+        """
+        if self.engine is None:
+            return self.create_engine()
+        return self.engine
+
+    def run(self, coroutine: Awaitable[T]) -> T:
+        """
+        Coroutine'i yöneticinin arka plan event loop'unda çalıştır ve sonucu bekle.
+        Senkron koddan çağrılır (örn: Streamlit script thread'i).
+
+        Args:
+            coroutine: Çalıştırılacak coroutine
+
+        Returns:
+            Coroutine'in sonucu
+        """
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name='async-db', daemon=True).start()
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    async def read_sql(self, query: str, params: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+        """
+        Sorguyu çalıştır ve sonucu DataFrame olarak döndür
+
+        Args:
+            query: SQL sorgusu
+            params: Bind parametreleri
+
+        Returns:
+            pd.DataFrame: Sorgu sonucu
+        """
+        engine = self.get_engine()
+        async with self._semaphore:
+            async with engine.connect() as connection:
+                result = await connection.execute(text(query), params or {})
+                return pd.DataFrame(result.fetchall(), columns=list(result.keys()))
+
+    async def read_table(
+        self,
+        table_name: str,
+        columns: Optional[Sequence[str]] = None,
+        where: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None
+    ) -> pd.DataFrame:
+        """
+        Tek bir tabloyu oku (varsayılan: manifestteki sütunlar, dönüşüm yapılmaz)
+
+        Args:
+            table_name: Tablo ismi
+            columns: Okunacak sütunlar (varsayılan: Config.get_table_columns)
+            where: Opsiyonel WHERE koşulu (bind parametreli)
+            params: WHERE koşulundaki parametreler
+
+        Returns:
+            pd.DataFrame: Tablo verisi
+        """
+        columns = columns or Config.get_table_columns(table_name)
+        query = f"SELECT {', '.join(columns)} FROM {Config.get_full_table_name(table_name)}"
+        if where:
+            query += f" WHERE {where}"
+        return await self.read_sql(query, params)
+
+    async def read_tables(self, requests: Dict[str, Dict[str, Any]]) -> Dict[str, pd.DataFrame]:
+        """
+        Tabloları aynı anda oku
+
+        Args:
+            requests: Tablo ismi -> read_table argümanları ('columns', 'where', 'params')
+
+        Returns:
+            Tablo ismi -> DataFrame
+        """
+        frames = await asyncio.gather(*(
+            self.read_table(table_name, **request) for table_name, request in requests.items()
+        ))
+        return dict(zip(requests, frames))
+
+    async def test_connection(self) -> bool:
+        """
+        Async bağlantıyı test eder.
+
+        Returns:
+            bool: Bağlantı başarılı ise True, değilse False
+        """
+        try:
+            await self.read_sql("SELECT 1")
+            logger.info("Async veritabanı bağlantı testi başarılı.")
+            return True
+        except (SQLAlchemyError, OSError) as e:
+            logger.error(f"Async veritabanı bağlantı testi başarısız: {str(e)}")
+            return False
+
+    async def check_table_exists(self, table_name: str, schema: Optional[str] = None) -> bool:
+        """
+        Belirtilen tablonun var olup olmadığını kontrol eder.
+
+        Args:
+            table_name: Kontrol edilecek tablo ismi
+            schema: Schema adı (None ise .env'den alınır)
+
+        Returns:
+            bool: Tablo varsa True, yoksa False
+        """
+        try:
+            schema_name = schema if schema is not None else os.getenv('DB_SCHEMA', 'public')
+            df = await self.read_sql(
+                "SELECT EXISTS ("
+                "SELECT FROM information_schema.tables "
+                "WHERE table_schema = :schema "
+                "AND table_name = :table_name"
+                ")", {"schema": schema_name, "table_name": table_name})
+            return bool(df.iloc[0, 0])
+        except SQLAlchemyError as e:
+            logger.error(f"Tablo kontrolü sırasında hata: {str(e)}")
+            return False
+
+    async def check_tables_exist(self, table_names: List[str], schema: Optional[str] = None) -> Dict[str, bool]:
+        """
+        Tabloların varlığını aynı anda kontrol eder.
+
+        Args:
+            table_names: Tablo isimleri
+            schema: Schema adı (None ise .env'den alınır)
+
+        Returns:
+            dict: Tablo ismi -> var mı
+        """
+        exists = await asyncio.gather(*(self.check_table_exists(name, schema) for name in table_names))
+        return dict(zip(table_names, exists))
+
+    async def get_table_fingerprint(self, table_name: str, schema: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Tablonun parmak izini döndürür (DatabaseManager.get_table_fingerprint ile aynı).
+
+        Args:
+            table_name: Tablo ismi
+            schema: Schema adı (None ise .env'den alınır)
+
+        Returns:
+            dict: {'row_count': int, 'max_id': str} veya hata durumunda None
+        """
+        try:
+            schema_name = schema if schema is not None else os.getenv('DB_SCHEMA', 'public')
+            df = await self.read_sql(f"SELECT count(*) AS row_count, max(id) AS max_id FROM {schema_name}.{table_name}")
+            row_count, max_id = df.iloc[0]
+            return {
+                'row_count': int(row_count),
+                'max_id': None if max_id is None else str(max_id)
+            }
+        except SQLAlchemyError as e:
+            logger.error(f"Tablo parmak izi alınırken hata: {str(e)}")
+            return None
+
+    async def read_rollup(self, name: str, order_by: Optional[str] = None, schema: Optional[str] = None) -> pd.DataFrame:
+        """
+        Bir materialized view'ı oku (bkz. MaterializedRollups)
+
+        Args:
+            name: View adı (ROLLUP_VIEWS anahtarı)
+            order_by: Opsiyonel sıralama sütunları
+            schema: View'ların şeması (varsayılan: Config.ROLLUP_SCHEMA)
+
+        Returns:
+            pd.DataFrame: View içeriği
+        """
+        if name not in ROLLUP_VIEWS:
+            raise ValueError(f"Bilinmeyen ozet view: {name}")
+        query = f"SELECT * FROM {schema or Config.ROLLUP_SCHEMA}.{name}"
+        if order_by:
+            query += f" ORDER BY {order_by}"
+        return await self.read_sql(query)
+
+    async def read_rollups(self, names: Optional[List[str]] = None, schema: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Materialized view'ları aynı anda oku
+
+        Args:
+            names: View adları (varsayılan: hepsi)
+            schema: View'ların şeması (varsayılan: Config.ROLLUP_SCHEMA)
+
+        Returns:
+            View adı -> DataFrame
+        """
+        names = list(names or ROLLUP_VIEWS)
+        frames = await asyncio.gather(*(self.read_rollup(name, schema=schema) for name in names))
+        return dict(zip(names, frames))
+
+    async def dispose(self) -> None:
+        """Async engine'in bağlantılarını kapatır."""
+        if self.engine is not None:
+            await self.engine.dispose()
+            logger.info("Async veritabanı bağlantısı kapatıldı.")
+            self.engine = None
+
+    def close(self) -> None:
+        """
+        Bağlantıları kapatır ve arka plan event loop'unu durdurur.
+        """
+        if self._loop is None:
+            return
+        self.run(self.dispose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop = None
+
+
 # Global database manager instance
 _db_manager: Optional[DatabaseManager] = None
+_async_db_manager: Optional[AsyncDatabaseManager] = None
 
 
 def get_database_manager() -> DatabaseManager:
@@ -213,6 +1355,19 @@ def get_database_manager() -> DatabaseManager:
     return _db_manager
 
 
+def get_async_database_manager() -> AsyncDatabaseManager:
+    """
+    Global AsyncDatabaseManager instance'ını döndürür (singleton pattern).
+
+    Returns:
+        AsyncDatabaseManager: AsyncDatabaseManager instance
+    """
+    global _async_db_manager
+    if _async_db_manager is None:
+        _async_db_manager = AsyncDatabaseManager()
+    return _async_db_manager
+
+
 if __name__ == "__main__":
     # Test amaçlı kullanım
     db = DatabaseManager()
@@ -0,0 +1,293 @@
+"""
+DuckDB Analitik Modülü
+Yerel snapshot'taki dört bi_accrual* tablosunu gömülü DuckDB ile doğrudan sorgular.
+
+Grafik ve raporların ihtiyaç duyduğu toplamlar (aylık küp, term tablosu, tarife
+maliyetleri) fee seviyesindeki birleştirilmiş veri belleğe alınmadan SQL ile
+hesaplanır. Tablolar Config.DB_SCHEMA şemasında view olarak tanımlandığı için
+PostgreSQL'e gönderilen sorgular (ör. build_joined_query) aynen çalışır; motor,
+testlerde ve karşılaştırmalarda ağ bağlantısı gerektirmeyen bir yerel veritabanı
+olarak da kullanılabilir.
+"""
+
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from config import Config
+from data_processor import BILLABLE_MAX_UNIT_PRICE, TERM_TABLE_COLUMNS, MonthlyCube
+from snapshot import SnapshotStore
+
+# DuckDB import (opsiyonel - yüklü değilse analitikler pandas ile hesaplanır)
+try:
+    import duckdb  # type: ignore
+    DUCKDB_AVAILABLE = True
+except ImportError:
+    DUCKDB_AVAILABLE = False
+
+# Birleştirilmiş fee satırları: pandas merge ile aynı join'ler.
+# is_first: satır, term'in df_merged'deki ilk satırı mı (term_count ve tarife dağılımı
+# bu satıra yazılır). Term'in ilk satırı, dosya sırasına göre ilk fee'sinin ilk
+# tüketim satırıdır; tüm satırları sıralamak yerine en küçük satır numaralarıyla bulunur.
+FEE_ROWS_SQL = """
+SELECT
+    t.id AS accrual_term_id, t.accrual_id, t.term_date,
+    CAST(t.year AS DOUBLE) AS year, CAST(t.month AS DOUBLE) AS month,
+    split_part(f.fee_code, '_', 1) AS fee_prefix, c.channel_key,
+    f.consumption,
+    CASE WHEN f.consumption > 0 AND f.unit_price > 0 AND f.unit_price <= {max_unit_price}
+         THEN f.amount END AS cost,
+    f._row = first_fee.f_row AND c._row IS NOT DISTINCT FROM first_consumption.c_row AS is_first,
+    a._row AS a_row, t._row AS t_row
+FROM _bi_accruals a
+JOIN _bi_accrual_terms t ON t.accrual_id = a.id
+JOIN _bi_accrual_fees f ON f.accrual_term_id = t.id
+LEFT JOIN _bi_accrual_fee_consumptions c ON c.accrual_fee_id = f.id
+JOIN (
+    SELECT accrual_term_id, min(_row) AS f_row FROM _bi_accrual_fees GROUP BY accrual_term_id
+) first_fee ON first_fee.accrual_term_id = t.id
+LEFT JOIN (
+    SELECT accrual_fee_id, min(_row) AS c_row FROM _bi_accrual_fee_consumptions GROUP BY accrual_fee_id
+) first_consumption ON first_consumption.accrual_fee_id = f.id
+"""
+
+
+class SnapshotAnalytics:
+    """
+    Snapshot tabloları üzerinde DuckDB analitik motoru.
+
+    open() güncel snapshot'ın Parquet/Feather dosyalarını view olarak bağlar;
+    from_frames() aynı tabloları bellekteki DataFrame'lerden oluşturur (testler ve
+    karşılaştırmalar için). Sorgular tek bağlantıda sırayla çalışır (her sorgu DuckDB
+    içinde paralelleşir); bir instance birden fazla thread'den kullanılabilir.
+    """
+
+    def __init__(self, store: Optional[SnapshotStore] = None):
+        """
+        Analitik motorunu başlat
+
+        Args:
+            store: Snapshot deposu (varsayılan: Config.SNAPSHOT_DIR)
+        """
+        self.store = store or SnapshotStore()
+        self.version: Optional[str] = None
+        self._connection = duckdb.connect(':memory:') if DUCKDB_AVAILABLE else None
+        self._registered: List[Any] = []
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        """DuckDB yüklü mü?"""
+        return DUCKDB_AVAILABLE
+
+    def open(self) -> bool:
+        """
+        Güncel snapshot'ın tablolarını bağla
+
+        Returns:
+            bool: Dört tablo da snapshot'ta varsa True ('sql_join' modunda tablolar yazılmaz)
+        """
+        if not self.available:
+            return False
+
+        meta = self.store.read_meta()
+        if meta is None or any(name not in meta.get('frames', []) for name in Config.REQUIRED_DB_TABLES):
+            return False
+
+        version_dir = self.store.directory / meta['version']
+        for table_name in Config.REQUIRED_DB_TABLES:
+            path = version_dir / f"{table_name}.{meta['format']}"
+            if meta['format'] == 'feather':
+                self._register_arrow(table_name, self._read_feather(path))
+            else:
+                self._create_views(
+                    table_name,
+                    f"SELECT * EXCLUDE (file_row_number), file_row_number AS _row "
+                    f"FROM read_parquet('{self._quote(path)}', file_row_number = true)"
+                )
+        self._create_fee_rows_view()
+
+        self.version = meta['version']
+        return True
+
+    @classmethod
+    def from_frames(cls, frames: Dict[str, pd.DataFrame]) -> 'SnapshotAnalytics':
+        """
+        Tabloları bellekteki DataFrame'lerden oluştur (ağsız yerel PostgreSQL yerine)
+
+        Args:
+            frames: Tablo adı -> DataFrame (Config.REQUIRED_DB_TABLES)
+
+        Returns:
+            SnapshotAnalytics
+        """
+        import pyarrow as pa  # type: ignore
+
+        engine = cls()
+        for table_name in Config.REQUIRED_DB_TABLES:
+            engine._register_arrow(table_name, pa.Table.from_pandas(frames[table_name], preserve_index=False))
+        engine._create_fee_rows_view()
+        engine.version = 'memory'
+        return engine
+
+    @staticmethod
+    def _quote(path: Path) -> str:
+        """SQL metni içindeki dosya yolu için tek tırnakları kaçır."""
+        return str(path).replace("'", "''")
+
+    @staticmethod
+    def _read_feather(path: Path):
+        """Feather (Arrow IPC) dosyasını memory-map ile Arrow tablosu olarak aç."""
+        import pyarrow.feather as feather  # type: ignore
+        return feather.read_table(path, memory_map=True)
+
+    def _register_arrow(self, table_name: str, table):
+        """Arrow tablosunu satır numarası sütunuyla birlikte kaydet."""
+        import pyarrow as pa  # type: ignore
+
+        table = table.append_column('_row', pa.array(np.arange(table.num_rows, dtype=np.int64)))
+        self._registered.append(table)
+        self._connection.register(f"_{table_name}_source", table)
+        self._create_views(table_name, f"SELECT * FROM _{table_name}_source")
+
+    def _create_views(self, table_name: str, select: str):
+        """
+        Tablonun iki view'ını oluştur: satır numaralı iç view (_tablo) ve
+        PostgreSQL'deki ile aynı adlı, aynı sütunlu şema view'ı (şema.tablo).
+        """
+        schema = Config.DB_SCHEMA
+        self._connection.execute(f'CREATE SCHEMA IF NOT EXISTS "{schema}"')
+        self._connection.execute(f'CREATE OR REPLACE VIEW "_{table_name}" AS {select}')
+        self._connection.execute(
+            f'CREATE OR REPLACE VIEW "{schema}"."{table_name}" AS SELECT * EXCLUDE (_row) FROM "_{table_name}"'
+        )
+
+    def _create_fee_rows_view(self):
+        """Dört tablo bağlandıktan sonra birleştirilmiş fee satırları view'ını oluştur."""
+        self._connection.execute(
+            f"CREATE OR REPLACE VIEW fee_rows AS {FEE_ROWS_SQL.format(max_unit_price=BILLABLE_MAX_UNIT_PRICE)}"
+        )
+
+    def query(self, sql: str, params: Optional[Sequence[Any]] = None) -> pd.DataFrame:
+        """
+        SQL sorgusunu çalıştır
+
+        Args:
+            sql: DuckDB SQL sorgusu (tablolar şema.tablo adlarıyla kullanılabilir)
+            params: Konumsal parametreler (? yer tutucuları için)
+
+        Returns:
+            Sorgu sonucu
+        """
+        with self._lock:
+            return self._connection.execute(sql, params or []).df()
+
+    def get_table_fingerprint(self, table_name: str) -> Optional[Dict[str, Any]]:
+        """
+        DatabaseManager.get_table_fingerprint ile aynı biçimde parmak izi
+
+        Args:
+            table_name: Tablo ismi
+
+        Returns:
+            dict: {'row_count': int, 'max_id': str} veya tablo yoksa None
+        """
+        if not self.check_table_exists(table_name):
+            return None
+        row_count, max_id = self.query(
+            f'SELECT count(*), max(id) FROM "{Config.DB_SCHEMA}"."{table_name}"'
+        ).iloc[0]
+        return {'row_count': int(row_count), 'max_id': None if pd.isna(max_id) else str(max_id)}
+
+    def check_table_exists(self, table_name: str) -> bool:
+        """
+        Tablonun bağlı olup olmadığını kontrol et
+
+        Args:
+            table_name: Tablo ismi
+
+        Returns:
+            bool: Tablo varsa True
+        """
+        result = self.query(
+            "SELECT count(*) AS n FROM information_schema.tables WHERE table_schema = ? AND table_name = ?",
+            [Config.DB_SCHEMA, table_name]
+        )
+        return bool(result['n'].iloc[0])
+
+    def monthly_cube(self) -> MonthlyCube:
+        """
+        Aylık küpü dört tablodan hesapla (build_monthly_cube ile aynı hücreler)
+
+        Returns:
+            MonthlyCube
+        """
+        cells = self.query("""
+            SELECT
+                year, month,
+                coalesce(fee_prefix, 'UNKNOWN') AS fee_prefix,
+                coalesce(channel_key, 'UNKNOWN') AS channel_key,
+                coalesce(sum(consumption), 0) AS consumption,
+                coalesce(sum(cost), 0) AS cost,
+                count(*) AS record_count,
+                count(*) FILTER (WHERE is_first) AS term_count
+            FROM fee_rows
+            GROUP BY ALL
+            ORDER BY year NULLS LAST, month NULLS LAST, fee_prefix, channel_key
+        """)
+        for name in ('fee_prefix', 'channel_key'):
+            cells[name] = cells[name].astype(object)
+        return MonthlyCube(cells[MonthlyCube.DIMENSIONS + MonthlyCube.MEASURES])
+
+    def term_table(self) -> pd.DataFrame:
+        """
+        Term tablosunu dört tablodan hesapla (build_term_table ile aynı satırlar ve sıra)
+
+        Returns:
+            Term tablosu (TERM_TABLE_COLUMNS)
+        """
+        return self.query("""
+            SELECT
+                accrual_term_id, accrual_id, term_date, year, month,
+                coalesce(sum(consumption), 0) AS total_consumption,
+                coalesce(sum(cost), 0) AS term_total_cost,
+                any_value(fee_prefix) FILTER (WHERE is_first) AS tariff_category
+            FROM fee_rows
+            GROUP BY accrual_term_id, accrual_id, term_date, year, month
+            ORDER BY min(a_row), min(t_row)
+        """)[TERM_TABLE_COLUMNS]
+
+    def tariff_costs(self) -> pd.Series:
+        """
+        Tarife kategorisi (fee prefix) bazında term maliyetleri.
+        Her term, ilk satırının kategorisinde bir kez sayılır
+        (EnergyVisualizer.tariff_category_costs ile aynı).
+
+        Returns:
+            Kategori -> toplam term_total_cost
+        """
+        costs = self.query("""
+            WITH terms AS (
+                SELECT
+                    accrual_term_id,
+                    any_value(fee_prefix) FILTER (WHERE is_first) AS tariff_category,
+                    coalesce(sum(cost), 0) AS term_total_cost
+                FROM fee_rows
+                GROUP BY accrual_term_id
+            )
+            SELECT tariff_category, sum(term_total_cost) AS cost
+            FROM terms
+            WHERE tariff_category IS NOT NULL
+            GROUP BY tariff_category
+            ORDER BY tariff_category
+        """)
+        return costs.set_index('tariff_category')['cost']
+
+    def close(self):
+        """Bağlantıyı kapat."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
@@ -0,0 +1,187 @@
+"""
+Dışa Aktarma Modülü
+Fee seviyesindeki veriyi parça parça (sınırlı bellekle) dosyaya yazar.
+
+Desteklenen biçimler:
+    csv      - düz CSV
+    csv.gz   - gzip ile sıkıştırılmış CSV
+    csv.zst  - zstd ile sıkıştırılmış CSV
+    parquet  - yıl/ay bazında bölümlenmiş (year=YYYY/month=M) Parquet klasörü
+"""
+
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional, Sequence
+
+import pandas as pd
+
+from config import Config
+
+# PyArrow import (opsiyonel - yüklü değilse sadece düz CSV yazılabilir)
+try:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.dataset as ds  # type: ignore
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+EXPORT_FORMATS = ('csv', 'csv.gz', 'csv.zst', 'parquet')
+
+# CSV biçimi -> PyArrow sıkıştırma codec'i
+CSV_CODECS = {'csv.gz': 'gzip', 'csv.zst': 'zstd'}
+
+# Parquet çıktısının bölümlendiği sütunlar
+PARTITION_COLUMNS = ['year', 'month']
+
+# Term tarihi olmayan kayıtların bölümü (year=0/month=0). Boş değerli bölüm
+# (__HIVE_DEFAULT_PARTITION__) pandas.read_parquet ile okunamadığı için kullanılmaz.
+NULL_PARTITION_VALUE = 0
+
+
+def detect_format(path: Path) -> str:
+    """
+    Dosya adından dışa aktarma biçimini bul (bilinmiyorsa düz CSV)
+
+    Args:
+        path: Hedef dosya/klasör yolu
+
+    Returns:
+        EXPORT_FORMATS'tan biri
+    """
+    name = Path(path).name.lower()
+    if name.endswith(('.csv.gz', '.csv.gzip')):
+        return 'csv.gz'
+    if name.endswith(('.csv.zst', '.csv.zstd')):
+        return 'csv.zst'
+    if name.endswith('.parquet') or Path(path).is_dir():
+        return 'parquet'
+    return 'csv'
+
+
+def write_csv(
+    batches: Iterable[pd.DataFrame],
+    path: Path,
+    file_format: str = 'csv',
+    encoding: Optional[str] = None
+) -> int:
+    """
+    Parçaları tek bir (gerekirse sıkıştırılmış) CSV dosyasına yaz.
+    Başlık satırı bir kez yazılır; her seferinde sadece bir parça bellekte tutulur.
+
+    Args:
+        batches: Aynı sütunlara sahip DataFrame parçaları
+        path: Hedef dosya
+        file_format: 'csv', 'csv.gz' veya 'csv.zst'
+        encoding: Metin kodlaması (varsayılan: Config.EXPORT_CSV_ENCODING)
+
+    Returns:
+        Yazılan kayıt sayısı
+
+    Raises:
+        ValueError: Sıkıştırma için PyArrow yoksa
+    """
+    encoding = encoding or Config.EXPORT_CSV_ENCODING
+    codec = CSV_CODECS.get(file_format)
+    if codec is not None and not PYARROW_AVAILABLE:
+        raise ValueError(f"'{file_format}' icin PyArrow gerekli. 'pip install pyarrow' ile yukleyebilirsiniz.")
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    sink = pa.CompressedOutputStream(str(path), codec) if codec is not None else open(path, 'wb')
+
+    rows, header = 0, True
+    with sink:
+        for batch in batches:
+            if batch.empty and not header:
+                continue
+            text = batch.to_csv(index=False, header=header)
+            # BOM (utf-8-sig) sadece dosyanın başında olmalı
+            sink.write(text.encode(encoding if header else encoding.replace('-sig', '')))
+            rows += len(batch)
+            header = False
+    return rows
+
+
+def _arrow_schema(sample: pd.DataFrame, partition_columns: Sequence[str], schema: Optional[Any] = None):
+    """
+    Parçaların ortak Arrow şeması: verilmezse örnek veriden çıkarılır (tamamen boş object
+    sütunlarının tipi ilk dolu değerden). Bölüm sütunları tam sayı olarak tanımlanır
+    (klasör adları year=2024/month=1 olsun diye).
+    """
+    if schema is None:
+        schema = pa.Schema.from_pandas(sample.head(0), preserve_index=False)
+        for i, field in enumerate(schema):
+            values = sample[field.name].dropna() if pa.types.is_null(field.type) else None
+            if values is not None and len(values):
+                schema = schema.set(i, pa.field(field.name, pa.array(values.head(1)).type))
+
+    schema = schema.remove_metadata()
+    for col in partition_columns:
+        i = schema.get_field_index(col)
+        schema = schema.set(i, pa.field(col, pa.int16() if col == 'year' else pa.int8()))
+    return schema
+
+
+def write_parquet(
+    batches: Iterable[pd.DataFrame],
+    path: Path,
+    partition_columns: Sequence[str] = PARTITION_COLUMNS,
+    sample: Optional[pd.DataFrame] = None,
+    schema: Optional[Any] = None
+) -> int:
+    """
+    Parçaları yıl/ay bazında bölümlenmiş bir Parquet klasörüne yaz (hive: year=2024/month=1).
+    Hedef klasörde yazılan bölümlerin eski dosyaları silinir, diğer bölümler korunur.
+    Yılı/ayı boş kayıtlar year=0/month=0 bölümüne yazılır (NULL_PARTITION_VALUE).
+
+    Args:
+        batches: Aynı sütunlara sahip DataFrame parçaları
+        path: Hedef klasör
+        partition_columns: Bölümleme sütunları (parçalarda bulunmalı)
+        sample: Şema çıkarımı için örnek veri (varsayılan: ilk parça)
+        schema: Parçaların Arrow şeması (verilirse örnekten çıkarılmaz)
+
+    Returns:
+        Yazılan kayıt sayısı
+
+    Raises:
+        ValueError: PyArrow yoksa
+    """
+    if not PYARROW_AVAILABLE:
+        raise ValueError("Parquet icin PyArrow gerekli. 'pip install pyarrow' ile yukleyebilirsiniz.")
+
+    batches = iter(batches)
+    first = next(batches, None)
+    if first is None:
+        return 0
+
+    partition_columns = [col for col in partition_columns if col in first.columns]
+    schema = _arrow_schema(sample if sample is not None else first, partition_columns, schema)
+    counter = {'rows': 0}
+
+    def record_batches() -> Iterator[Any]:
+        for batch in _chain(first, batches):
+            counter['rows'] += len(batch)
+            missing = {col: batch[col].fillna(NULL_PARTITION_VALUE)
+                       for col in partition_columns if batch[col].isna().any()}
+            if missing:
+                batch = batch.assign(**missing)
+            yield from pa.Table.from_pandas(batch, schema=schema, preserve_index=False).to_batches()
+
+    ds.write_dataset(
+        record_batches(),
+        str(path),
+        schema=schema,
+        format='parquet',
+        partitioning=ds.partitioning(pa.schema([schema.field(col) for col in partition_columns]), flavor='hive')
+        if partition_columns else None,
+        existing_data_behavior='delete_matching',
+        max_rows_per_group=Config.EXPORT_ROW_GROUP_ROWS,
+        min_rows_per_group=Config.EXPORT_ROW_GROUP_ROWS // 2,
+        file_options=ds.ParquetFileFormat().make_write_options(compression=Config.EXPORT_PARQUET_COMPRESSION),
+    )
+    return counter['rows']
+
+
+def _chain(first: pd.DataFrame, rest: Iterator[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+    """İlk parçayı (şema için önceden okunmuş) kalan parçaların önüne ekle."""
+    yield first
+    yield from rest
@@ -0,0 +1,413 @@
+"""
+İndeks Danışmanı
+Birleştirme anahtarları, term_date ve watermark sütunları için gereken indeksleri
+pg_indexes'e göre kontrol eder, uygulamanın sorgularının EXPLAIN planlarını raporlar
+ve eksik indeksleri CREATE INDEX CONCURRENTLY ile oluşturur.
+
+Kullanım:
+    python index_advisor.py check [--analyze] [--repeat 1]
+    python index_advisor.py create [--dry-run] [--repeat 3] [--output index_timings.json]
+"""
+
+import argparse
+import json
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from benchmark import print_table
+from config import Config
+from data_processor import EnergyDataProcessor, build_joined_query, term_date_bounds
+from database import DatabaseManager, get_database_manager
+
+# pg_indexes.indexdef'teki sütun listesi: "... USING btree (accrual_id, id)"
+INDEX_COLUMNS_PATTERN = re.compile(r"USING \w+ \(([^)]*)\)")
+
+
+def required_indexes() -> List[Dict[str, str]]:
+    """
+    Uygulamanın sorgularının ihtiyaç duyduğu indeksler (tablo, baştaki sütun, neden)
+
+    Returns:
+        {'table', 'column', 'reason'} listesi (tekrarsız)
+    """
+    wanted = [
+        (Config.DB_TABLE_ACCRUALS, 'id', "join (t.accrual_id = a.id)"),
+        (Config.DB_TABLE_ACCRUAL_TERMS, 'id', "join (f.accrual_term_id = t.id)"),
+        (Config.DB_TABLE_ACCRUAL_FEES, 'id', "join (c.accrual_fee_id = f.id)"),
+        (Config.DB_TABLE_ACCRUAL_TERMS, 'accrual_id', "join anahtari"),
+        (Config.DB_TABLE_ACCRUAL_FEES, 'accrual_term_id', "join anahtari"),
+        (Config.DB_TABLE_ACCRUAL_FEE_CONSUMPTIONS, 'accrual_fee_id', "join anahtari"),
+        (Config.DB_TABLE_ACCRUAL_TERMS, 'term_date', "yukleme penceresi"),
+    ]
+    wanted += [
+        (table_name, Config.DB_WATERMARK_COLUMNS.get(table_name, 'id'), "artimli yenileme (watermark)")
+        for table_name in Config.REQUIRED_DB_TABLES
+    ]
+
+    indexes, seen = [], set()
+    for table_name, column, reason in wanted:
+        if (table_name, column) not in seen:
+            seen.add((table_name, column))
+            indexes.append({'table': table_name, 'column': column, 'reason': reason})
+    return indexes
+
+
+def leading_column(definition: str) -> Optional[str]:
+    """
+    İndeks tanımının ilk sütunu (kısmi ve ifade indeksleri için None).
+    B-tree indeksi sadece baştaki sütunu üzerinden eşitlik/aralık aramasında kullanılır.
+
+    Args:
+        definition: pg_indexes.indexdef
+
+    Returns:
+        Sütun adı veya None
+    """
+    match = INDEX_COLUMNS_PATTERN.search(definition)
+    if match is None or " WHERE " in definition[match.end():]:
+        return None
+    first = match.group(1).split(',')[0].strip().split(' ')[0].strip('"')
+    return first if re.fullmatch(r"\w+", first) else None
+
+
+def index_name(table_name: str, column: str) -> str:
+    """Oluşturulacak indeksin adı (PostgreSQL 63 karakter sınırı içinde)."""
+    return f"ix_{table_name}_{column}"[:63]
+
+
+def check_indexes(db_manager: DatabaseManager) -> List[Dict[str, Any]]:
+    """
+    Gereken her indeks için mevcut durumu bul
+
+    Args:
+        db_manager: Veritabanı yöneticisi
+
+    Returns:
+        Gereken indeksler + 'status' ('ok', 'eksik', 'gecersiz') ve 'index' (mevcut indeks adı)
+    """
+    existing = db_manager.get_indexes(Config.REQUIRED_DB_TABLES)
+
+    report = []
+    for required in required_indexes():
+        covering = [
+            index for index in existing
+            if index['table_name'] == required['table'] and leading_column(index['definition']) == required['column']
+        ]
+        valid = [index for index in covering if index['valid']]
+        if valid:
+            status, name = 'ok', valid[0]['index_name']
+        elif covering:
+            # Yarıda kalmış CONCURRENTLY: indeks var ama planlayıcı kullanmaz
+            status, name = 'gecersiz', covering[0]['index_name']
+        else:
+            status, name = 'eksik', None
+        report.append({**required, 'status': status, 'index': name})
+    return report
+
+
+def index_statements(report: List[Dict[str, Any]]) -> List[str]:
+    """
+    Eksik ve geçersiz indeksler için DDL komutları.
+    CONCURRENTLY tabloyu yazmaya kilitlemez; geçersiz indeks önce kaldırılır.
+
+    Args:
+        report: check_indexes çıktısı
+
+    Returns:
+        SQL komutları (sırasıyla çalıştırılır)
+    """
+    statements = []
+    for item in report:
+        if item['status'] == 'gecersiz':
+            statements.append(f"DROP INDEX CONCURRENTLY IF EXISTS {Config.DB_SCHEMA}.{item['index']}")
+        if item['status'] != 'ok':
+            statements.append(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name(item['table'], item['column'])} "
+                f"ON {Config.get_full_table_name(item['table'])} ({item['column']})"
+            )
+    return statements
+
+
+def app_queries(processor: EnergyDataProcessor) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+    """
+    Uygulamanın çalıştırdığı sorguların temsilcileri (parametreleriyle):
+    SQL join yüklemesi, yükleme penceresi, out-of-core accrual parçası ve artımlı yenileme.
+    Parametreler veritabanındaki gerçek değerlerden seçilir.
+
+    Args:
+        processor: İşleyici (sütun manifesti ve yükleme penceresi buradan alınır)
+
+    Returns:
+        Sorgu adı -> (SQL, parametreler)
+    """
+    now = pd.Timestamp.now()
+    window_start = processor.window_start or pd.Timestamp(year=now.year, month=1, day=1)
+
+    queries = {}
+    bounds, params = term_date_bounds('t.term_date', window_start)
+    queries['sql_join'] = (f"{build_joined_query(processor.table_columns)}\nWHERE {bounds}", params)
+
+    for table_name, request in processor._windowed(
+            {table_name: {} for table_name in Config.REQUIRED_DB_TABLES}, window_start).items():
+        queries[f"pencere:{table_name}"] = (processor.table_query(table_name, request['where']), request['params'])
+
+    engine = processor.db_manager.get_engine()
+    with engine.connect() as connection:
+        upper = connection.execute(text(
+            f"SELECT max(id) FROM (SELECT id FROM {Config.get_full_table_name(Config.DB_TABLE_ACCRUALS)} "
+            "ORDER BY id LIMIT :limit) ids"
+        ), {"limit": Config.OUT_OF_CORE_FIRST_CHUNK}).scalar()
+        watermarks = {
+            table_name: connection.execute(text(
+                f"SELECT max({Config.DB_WATERMARK_COLUMNS.get(table_name, 'id')}) "
+                f"FROM {Config.get_full_table_name(table_name)}"
+            )).scalar()
+            for table_name in Config.REQUIRED_DB_TABLES
+        }
+
+    if upper is not None:
+        for table_name, request in processor._accrual_chunk_requests(None, upper).items():
+            queries[f"parca:{table_name}"] = (processor.table_query(table_name, request['where']), request['params'])
+
+    for table_name, request in processor._windowed({
+        table_name: {
+            'where': f"{Config.DB_WATERMARK_COLUMNS.get(table_name, 'id')} > :watermark",
+            'params': {'watermark': watermarks[table_name]}
+        }
+        for table_name in Config.REQUIRED_DB_TABLES if watermarks[table_name] is not None
+    }, processor.window_start).items():
+        queries[f"yenileme:{table_name}"] = (processor.table_query(table_name, request['where']), request['params'])
+
+    return queries
+
+
+def _plan_nodes(plan: Dict[str, Any]):
+    """Plan ağacındaki tüm düğümler (derinlik öncelikli)."""
+    yield plan
+    for child in plan.get('Plans', []):
+        yield from _plan_nodes(child)
+
+
+def explain(connection, query: str, params: Dict[str, Any], analyze: bool = False) -> Dict[str, Any]:
+    """
+    Sorgunun planını al; kaynak tablolardaki sıralı taramaları (Seq Scan) bul.
+
+    Args:
+        connection: SQLAlchemy bağlantısı
+        query: SQL sorgusu
+        params: Bind parametreleri
+        analyze: True ise sorgu çalıştırılır ve sunucudaki süre ölçülür (EXPLAIN ANALYZE)
+
+    Returns:
+        {'cost': planlayıcı maliyeti, 'seq_scans': tablolar, 'ms': süre (analyze değilse None)}
+    """
+    options = "ANALYZE, BUFFERS, FORMAT JSON" if analyze else "FORMAT JSON"
+    result = connection.execute(text(f"EXPLAIN ({options}) {query}"), params).scalar()
+    plan = (json.loads(result) if isinstance(result, str) else result)[0]
+
+    seq_scans = sorted({
+        node['Relation Name'] for node in _plan_nodes(plan['Plan'])
+        if node.get('Node Type') == 'Seq Scan' and node.get('Relation Name') in Config.REQUIRED_DB_TABLES
+    })
+    return {
+        'cost': plan['Plan']['Total Cost'],
+        'seq_scans': seq_scans,
+        'ms': plan.get('Execution Time'),
+    }
+
+
+def measure_queries(
+    db_manager: DatabaseManager,
+    queries: Dict[str, Tuple[str, Dict[str, Any]]],
+    analyze: bool,
+    repeat: int
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Sorguların planlarını (ve analyze ise en iyi sunucu süresini) topla
+
+    Args:
+        db_manager: Veritabanı yöneticisi
+        queries: Sorgu adı -> (SQL, parametreler)
+        analyze: Sorguları çalıştırıp süre ölç
+        repeat: Süre için tekrar sayısı (en iyi süre raporlanır)
+
+    Returns:
+        Sorgu adı -> explain çıktısı
+    """
+    results = {}
+    with db_manager.get_engine().connect() as connection:
+        for name, (query, params) in queries.items():
+            runs = [explain(connection, query, params, analyze) for _ in range(max(1, repeat) if analyze else 1)]
+            best = min(runs, key=lambda run: run['ms'] or 0)
+            results[name] = best
+    return results
+
+
+def create_indexes(db_manager: DatabaseManager, statements: List[str]) -> List[str]:
+    """
+    DDL komutlarını çalıştır ve etkilenen tabloların istatistiklerini güncelle.
+    CONCURRENTLY transaction içinde çalışamadığı için AUTOCOMMIT kullanılır.
+
+    Args:
+        db_manager: Veritabanı yöneticisi
+        statements: index_statements çıktısı
+
+    Returns:
+        Başarıyla çalışan komutlar
+    """
+    executed = []
+    tables = sorted({table_name for table_name in Config.REQUIRED_DB_TABLES
+                     if any(f" ON {Config.get_full_table_name(table_name)} " in statement for statement in statements)})
+
+    with db_manager.get_engine().connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        for statement in statements:
+            print(f"[SQL] {statement}")
+            try:
+                connection.execute(text(statement))
+                executed.append(statement)
+            except SQLAlchemyError as e:
+                print(f"[HATA] Komut calistirilamadi: {e}")
+        for table_name in tables:
+            connection.execute(text(f"ANALYZE {Config.get_full_table_name(table_name)}"))
+    return executed
+
+
+def print_index_report(report: List[Dict[str, Any]]):
+    """İndeks durumunu tablo olarak yazdır."""
+    print_table(
+        [{**item, 'index': item['index'] or '-'} for item in report],
+        ['table', 'column', 'status', 'index', 'reason']
+    )
+    print()
+
+
+def print_query_report(before: Dict[str, Dict[str, Any]], after: Optional[Dict[str, Dict[str, Any]]] = None):
+    """Sorgu planlarını (ve varsa önce/sonra karşılaştırmasını) tablo olarak yazdır."""
+    def fmt_ms(value):
+        return "-" if value is None else f"{value:.1f}"
+
+    rows = []
+    for name, plan in before.items():
+        row = {
+            'sorgu': name,
+            'maliyet': f"{plan['cost']:.0f}",
+            'seq_scan': ", ".join(plan['seq_scans']) or "-",
+            'sure_ms': fmt_ms(plan['ms']),
+        }
+        if after is not None:
+            new = after.get(name, plan)
+            row.update({
+                'yeni_maliyet': f"{new['cost']:.0f}",
+                'yeni_seq_scan': ", ".join(new['seq_scans']) or "-",
+                'yeni_sure_ms': fmt_ms(new['ms']),
+                'hiz': f"{plan['ms'] / new['ms']:.2f}x" if plan['ms'] and new['ms'] else "-",
+            })
+        rows.append(row)
+
+    columns = ['sorgu', 'maliyet', 'seq_scan', 'sure_ms']
+    if after is not None:
+        columns += ['yeni_maliyet', 'yeni_seq_scan', 'yeni_sure_ms', 'hiz']
+    print_table(rows, columns)
+    print()
+
+
+def run_check(analyze: bool, repeat: int):
+    """
+    İndeksleri ve sorgu planlarını raporla, eksik indekslerin DDL'ini yazdır
+
+    Args:
+        analyze: Sorguları çalıştırıp süre ölç
+        repeat: Süre için tekrar sayısı
+    """
+    db_manager = get_database_manager()
+    report = check_indexes(db_manager)
+
+    print("[INDEKS] Gereken indeksler:\n")
+    print_index_report(report)
+
+    print(f"[PLAN] Uygulama sorgulari{' (EXPLAIN ANALYZE)' if analyze else ''}:\n")
+    print_query_report(measure_queries(db_manager, app_queries(EnergyDataProcessor()), analyze, repeat))
+
+    statements = index_statements(report)
+    if statements:
+        print("[ONERI] Eksik indeksler (python index_advisor.py create ile olusturulur):")
+        for statement in statements:
+            print(f"  {statement};")
+    else:
+        print("[OK] Tum gereken indeksler mevcut!")
+
+
+def run_create(dry_run: bool, repeat: int, output: str):
+    """
+    Eksik indeksleri oluştur; öncesi ve sonrası sorgu sürelerini ölçüp JSON'a kaydet
+
+    Args:
+        dry_run: Sadece komutları yazdır
+        repeat: Süre için tekrar sayısı
+        output: Sürelerin yazılacağı JSON dosyası
+    """
+    db_manager = get_database_manager()
+    report = check_indexes(db_manager)
+    statements = index_statements(report)
+
+    print("[INDEKS] Gereken indeksler:\n")
+    print_index_report(report)
+
+    if not statements:
+        print("[OK] Tum gereken indeksler mevcut, olusturulacak indeks yok!")
+        return
+    if dry_run:
+        for statement in statements:
+            print(f"  {statement};")
+        return
+
+    queries = app_queries(EnergyDataProcessor())
+    print(f"[OLCUM] Indeksler olusturulmadan once sorgular olculuyor (tekrar: {repeat})...")
+    before = measure_queries(db_manager, queries, True, repeat)
+
+    executed = create_indexes(db_manager, statements)
+
+    print(f"[OLCUM] Indeksler olusturulduktan sonra sorgular olculuyor (tekrar: {repeat})...\n")
+    after = measure_queries(db_manager, queries, True, repeat)
+    print_query_report(before, after)
+
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'statements': executed,
+            'indexes': check_indexes(db_manager),
+            'queries': {name: {'before': before[name], 'after': after[name]} for name in queries},
+        }, f, ensure_ascii=False, indent=2, default=str)
+
+    print(f"[OK] {len(executed)}/{len(statements)} komut calisti, sureler kaydedildi: {output}")
+
+
+def main():
+    """Komut satırı girişi"""
+    parser = argparse.ArgumentParser(description="Enerji Analiz Sistemi indeks danismani")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    check_parser = subparsers.add_parser('check', help="Eksik indeksleri ve sorgu planlarini raporla")
+    check_parser.add_argument('--analyze', action='store_true', help="Sorgulari calistirip sure olc (EXPLAIN ANALYZE)")
+    check_parser.add_argument('--repeat', type=int, default=1)
+
+    create_parser = subparsers.add_parser('create', help="Eksik indeksleri CREATE INDEX CONCURRENTLY ile olustur")
+    create_parser.add_argument('--dry-run', action='store_true', help="Sadece komutlari yazdir")
+    create_parser.add_argument('--repeat', type=int, default=3)
+    create_parser.add_argument('--output', default='index_timings.json')
+
+    args = parser.parse_args()
+
+    if args.command == 'check':
+        run_check(args.analyze, args.repeat)
+    elif args.command == 'create':
+        run_create(args.dry_run, args.repeat, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+"""
+Performans Ölçüm Modülü
+Veri işleme aşamalarının süre, CPU zamanı, bellek ve kayıt sayısı ölçümlerini toplar
+ve her ölçümü JSON satırı olarak log dosyasına (Config.LOG_FILE) yazar.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import pandas as pd
+
+from config import Config
+
+# psutil import (opsiyonel - yüklü değilse RSS /proc/self/statm'den okunur)
+try:
+    import psutil  # type: ignore
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+PROFILE_LOGGER_NAME = 'enerji_analiz.profile'
+
+# Tam yükleme/yenileme ölçümlerinin en dış aşamaları (uygulamada gösterilen çalıştırma)
+PIPELINE_ROOT_STAGES = ('load_and_process', 'refresh_data')
+
+
+def get_log_path() -> Path:
+    """Config.LOG_FILE'ın mutlak yolu (göreli ise proje kök dizinine göre)."""
+    path = Path(Config.LOG_FILE)
+    return path if path.is_absolute() else Config.BASE_DIR / path
+
+
+def get_profile_logger() -> logging.Logger:
+    """
+    Ölçümleri JSON satırları olarak Config.LOG_FILE'a yazan logger.
+    Dosya Config.LOG_MAX_BYTES boyutuna ulaşınca döndürülür (Config.LOG_BACKUP_COUNT yedek).
+
+    Returns:
+        logging.Logger
+    """
+    logger = logging.getLogger(PROFILE_LOGGER_NAME)
+    if not logger.handlers:
+        handler = RotatingFileHandler(
+            get_log_path(),
+            maxBytes=Config.LOG_MAX_BYTES,
+            backupCount=Config.LOG_BACKUP_COUNT,
+            encoding='utf-8'
+        )
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        # Diğer log çıktılarına (konsol) karışmasın
+        logger.propagate = False
+    return logger
+
+
+def current_rss_bytes() -> Optional[int]:
+    """
+    Sürecin güncel fiziksel bellek kullanımı (RSS)
+
+    Returns:
+        Bayt cinsinden RSS veya None (ölçülemiyor)
+    """
+    if PSUTIL_AVAILABLE:
+        return psutil.Process().memory_info().rss
+
+    try:
+        with open('/proc/self/statm', encoding='ascii') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class PipelineProfiler:
+    """
+    Aşama bazında duvar saati süresi, CPU zamanı, bellek ve kayıt sayısı ölçer.
+
+    stage() bağlam yöneticisi iç içe kullanılabilir; en dıştaki aşama yeni bir
+    çalıştırma (run_id) başlatır. Ölçümler records listesine eklenir ve JSON satırı
+    olarak Config.LOG_FILE'a yazılır.
+
+    Bellek ölçümü (Config.PROFILE_MEMORY):
+    - 'rss': aşama sonundaki RSS'in başlangıca göre farkı (ucuz, production için)
+    - 'tracemalloc': aşama sırasındaki Python/NumPy ayırmalarının tepe değeri (yavaşlatır)
+    - 'off': ölçülmez
+
+    Paralel tablo yüklemelerinde bellek değerleri süreç geneli olduğu için birbirine
+    karışır; CPU zamanı ise aşamayı çalıştıran thread'e aittir.
+    """
+
+    MEMORY_MODES = ('rss', 'tracemalloc', 'off')
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        memory_mode: Optional[str] = None,
+        write_log: bool = True,
+        max_records: int = 2000
+    ):
+        """
+        Profiler'ı başlat
+
+        Args:
+            enabled: Ölçüm açık mı (varsayılan: Config.PROFILE_ENABLED)
+            memory_mode: 'rss', 'tracemalloc' veya 'off' (varsayılan: Config.PROFILE_MEMORY)
+            write_log: Ölçümler log dosyasına yazılsın mı
+            max_records: Bellekte tutulacak en fazla ölçüm sayısı (eskiler atılır)
+        """
+        self.enabled = Config.PROFILE_ENABLED if enabled is None else enabled
+        self.memory_mode = (memory_mode or Config.PROFILE_MEMORY).lower()
+        if self.memory_mode not in self.MEMORY_MODES:
+            self.memory_mode = 'rss'
+        self.write_log = write_log
+        self.max_records = max_records
+        self.records: List[Dict[str, Any]] = []
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._sequence = 0
+
+        # Açık çalıştırma; yükleme thread'leri kendi aşamalarını buna bağlar
+        self._run_id: Optional[str] = None
+        self._run_stack: List[Dict[str, Any]] = []
+        self._started_tracemalloc = False
+
+    def _stack(self) -> List[Dict[str, Any]]:
+        """Bu thread'de açık olan aşamalar."""
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def stage(self, name: str, **fields: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Bir aşamayı ölç
+
+        Kullanım:
+            with profiler.stage('load', table='bi_accruals') as info:
+                df = ...
+                info['rows'] = len(df)
+
+        Args:
+            name: Aşama adı
+            **fields: Ölçüme eklenecek ek alanlar (tablo, sütun, ...)
+
+        Yields:
+            Aşama içinde doldurulabilecek alanlar (rows ve diğerleri)
+        """
+        if not self.enabled:
+            yield {}
+            return
+
+        info: Dict[str, Any] = dict(fields)
+        stack = self._stack()
+
+        with self._lock:
+            self._sequence += 1
+            sequence = self._sequence
+            if stack:
+                run_id, parent, depth = self._run_id, stack[-1]['name'], len(stack)
+            elif self._run_id is not None and self._run_stack:
+                # Başka bir thread'in açtığı çalıştırmanın içinde (ör. paralel tablo yüklemesi)
+                run_id, parent, depth = self._run_id, self._run_stack[-1]['name'], len(self._run_stack)
+            else:
+                run_id, parent, depth = uuid.uuid4().hex[:12], None, 0
+                self._run_id, self._run_stack = run_id, stack
+                if self.memory_mode == 'tracemalloc' and not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    self._started_tracemalloc = True
+
+        frame = {'name': name, 'peak': 0}
+        if self.memory_mode == 'tracemalloc' and tracemalloc.is_tracing():
+            if stack:
+                stack[-1]['peak'] = max(stack[-1]['peak'], tracemalloc.get_traced_memory()[1])
+            frame['traced'] = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        elif self.memory_mode == 'rss':
+            frame['rss'] = current_rss_bytes()
+
+        stack.append(frame)
+        started_at = time.strftime('%Y-%m-%d %H:%M:%S')
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        status = 'ok'
+
+        try:
+            yield info
+        except BaseException as e:
+            status = 'error'
+            info['error'] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.thread_time() - cpu_start
+            stack.pop()
+
+            memory_mb = None
+            if 'traced' in frame and tracemalloc.is_tracing():
+                peak = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+                memory_mb = (peak - frame['traced']) / 1024 / 1024
+                if stack:
+                    stack[-1]['peak'] = max(stack[-1]['peak'], peak)
+                tracemalloc.reset_peak()
+            elif frame.get('rss') is not None:
+                rss = current_rss_bytes()
+                memory_mb = (rss - frame['rss']) / 1024 / 1024 if rss is not None else None
+
+            record = {
+                'run_id': run_id,
+                'seq': sequence,
+                'stage': name,
+                'parent': parent,
+                'depth': depth,
+                'started_at': started_at,
+                'wall_s': round(wall, 4),
+                'cpu_s': round(cpu, 4),
+                'memory_mb': None if memory_mb is None else round(memory_mb, 2),
+                'memory_mode': self.memory_mode,
+                'rows': info.pop('rows', None),
+                'status': status,
+                **info,
+            }
+            self._add_record(record)
+
+            if not stack and self._run_stack is stack:
+                with self._lock:
+                    self._run_id, self._run_stack = None, []
+                    if self._started_tracemalloc:
+                        tracemalloc.stop()
+                        self._started_tracemalloc = False
+
+    def _add_record(self, record: Dict[str, Any]):
+        """Ölçümü listeye ekle ve log dosyasına yaz."""
+        with self._lock:
+            self.records.append(record)
+            if len(self.records) > self.max_records:
+                del self.records[:len(self.records) - self.max_records]
+
+        if self.write_log:
+            try:
+                get_profile_logger().info(json.dumps(record, ensure_ascii=False, default=str))
+            except OSError:
+                pass
+
+    def last_run(self) -> List[Dict[str, Any]]:
+        """
+        Son yükleme/yenilemenin ve sonrasında hesaplanan aşamaların ölçümleri
+
+        Returns:
+            Ölçüm listesi (boş olabilir)
+        """
+        with self._lock:
+            records = list(self.records)
+        return _records_of_last_run(records)
+
+    def to_frame(self) -> pd.DataFrame:
+        """last_run() ölçümlerini tablo olarak döndür."""
+        return profile_frame(self.last_run())
+
+
+def _records_of_last_run(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Son yükleme/yenileme çalıştırmasının ve ondan sonra tembel hesaplanan aşamaların
+    ölçümleri (çalıştırma ve başlama sırasına göre). Yükleme kaydı yoksa son çalıştırma.
+    """
+    if not records:
+        return []
+
+    start = len(records) - 1
+    for i, record in enumerate(records):
+        if record.get('depth') == 0 and record.get('stage') in PIPELINE_ROOT_STAGES:
+            start = i
+    run_ids = {record.get('run_id') for record in records[start:]}
+
+    selected = [record for record in records if record.get('run_id') in run_ids]
+    run_order = {run_id: i for i, run_id in enumerate(dict.fromkeys(r.get('run_id') for r in selected))}
+    return sorted(selected, key=lambda r: (run_order[r.get('run_id')], r.get('seq', 0)))
+
+
+def read_last_run(path: Optional[Path] = None, tail_bytes: int = 512 * 1024) -> List[Dict[str, Any]]:
+    """
+    Log dosyasındaki son yükleme/yenilemenin (ve sonrasında hesaplanan aşamaların) ölçümlerini oku.
+    Ölçümü hangi süreç yapmış olursa olsun (ör. başka bir Streamlit süreci) görülebilir.
+
+    Args:
+        path: Log dosyası (varsayılan: Config.LOG_FILE)
+        tail_bytes: Dosyanın sonundan okunacak bayt sayısı
+
+    Returns:
+        Ölçüm listesi (boş olabilir)
+    """
+    path = Path(path or get_log_path())
+    try:
+        with open(path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - tail_bytes))
+            lines = f.read().decode('utf-8', errors='ignore').splitlines()
+    except OSError:
+        return []
+
+    records = []
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue  # Yarım kalan ilk satır ya da ölçüm dışı log satırı
+        if isinstance(record, dict) and 'stage' in record and 'run_id' in record:
+            records.append(record)
+
+    return _records_of_last_run(records)
+
+
+def profile_frame(records: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Ölçümleri gösterim için tabloya çevir (aşama adları derinliğe göre girintili)
+
+    Args:
+        records: Ölçüm listesi
+
+    Returns:
+        Aşama, süre, CPU, bellek ve kayıt sayısı sütunlarını içeren DataFrame
+    """
+    columns = ['stage', 'detail', 'wall_s', 'cpu_s', 'memory_mb', 'rows', 'status']
+    if not records:
+        return pd.DataFrame(columns=columns)
+
+    base = {'run_id', 'seq', 'stage', 'parent', 'depth', 'started_at', 'wall_s', 'cpu_s',
+            'memory_mb', 'memory_mode', 'rows', 'status'}
+    rows = []
+    for record in records:
+        detail = ', '.join(f"{key}={value}" for key, value in record.items() if key not in base)
+        rows.append({
+            'stage': '  ' * int(record.get('depth') or 0) + str(record.get('stage')),
+            'detail': detail,
+            'wall_s': record.get('wall_s'),
+            'cpu_s': record.get('cpu_s'),
+            'memory_mb': record.get('memory_mb'),
+            'rows': record.get('rows'),
+            'status': record.get('status'),
+        })
+    return pd.DataFrame(rows, columns=columns)
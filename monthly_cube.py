@@ -0,0 +1,89 @@
+"""
+Aylık Küp Modülü
+Yıl, ay, fee prefix ve kanal bazında önceden toplanmış veri küpü.
+Grafik ve tahmin modülleri küpü veritabanı/işleme katmanını yüklemeden kullanır;
+küp data_processor.build_monthly_cube ile oluşturulur.
+"""
+
+import pandas as pd
+from typing import Dict, List, Sequence
+from config import Config
+
+
+class MonthlyCube:
+    """
+    Yıl, ay, fee prefix ve kanal bazında önceden toplanmış veri küpü.
+
+    Her hücre o kırılımdaki satırların tüketim ve maliyet toplamlarını tutar;
+    hücrelerin yıl/ay toplamları term tablosundaki total_consumption ve
+    term_total_cost toplamlarına eşittir. Her term, df_merged'deki ilk satırının
+    hücresinde sayılır, böylece term_count da her kırılımda toplanabilir.
+    Grafikler ve raporlar milyonlarca satır yerine birkaç yüz hücreden hesaplanır.
+    """
+
+    DIMENSIONS: List[str] = ['year', 'month', 'fee_prefix', 'channel_key']
+    MEASURES: List[str] = ['consumption', 'cost', 'record_count', 'term_count']
+
+    def __init__(self, cells: pd.DataFrame):
+        """
+        Args:
+            cells: Hücre tablosu (DIMENSIONS + MEASURES sütunları)
+        """
+        self.cells = cells
+
+    @property
+    def empty(self) -> bool:
+        """Küpte hücre yok mu?"""
+        return self.cells.empty
+
+    def rollup(self, by: Sequence[str]) -> pd.DataFrame:
+        """
+        Küpü verilen boyutlara topla.
+        Boyutlar: year, month, quarter, season, fee_prefix, channel_key
+        Yılı veya ayı bilinmeyen hücreler yıl/ay/çeyrek/mevsim kırılımlarına katılmaz.
+
+        Args:
+            by: Gruplama boyutları
+
+        Returns:
+            Boyutlar + ölçüler (consumption, cost, record_count, term_count)
+        """
+        cells = self.cells
+        keys = []
+        for name in by:
+            if name == 'quarter':
+                keys.append(((cells['month'] - 1) // 3 + 1).rename('quarter'))
+            elif name == 'season':
+                # Config.SEASONS: 1=Kış (Ara-Oca-Şub), 2=İlkbahar, 3=Yaz, 4=Sonbahar
+                keys.append((cells['month'] % 12 // 3 + 1).rename('season'))
+            else:
+                keys.append(cells[name])
+
+        result = cells.groupby(keys, sort=True)[self.MEASURES].sum().reset_index()
+
+        for name in ('year', 'month', 'quarter', 'season'):
+            if name in result.columns:
+                result[name] = result[name].astype(int)
+        return result
+
+    def by_month(self) -> pd.DataFrame:
+        """Yıl-ay toplamları"""
+        return self.rollup(['year', 'month'])
+
+    def by_quarter(self) -> pd.DataFrame:
+        """Yıl-çeyrek toplamları"""
+        return self.rollup(['year', 'quarter'])
+
+    def by_year(self) -> pd.DataFrame:
+        """Yıllık toplamlar"""
+        return self.rollup(['year'])
+
+    def by_season(self) -> pd.DataFrame:
+        """Mevsim toplamları (season_name: Config.SEASONS)"""
+        seasonal = self.rollup(['season'])
+        seasonal['season_name'] = seasonal['season'].map(Config.SEASONS)
+        return seasonal
+
+    def totals(self) -> Dict[str, float]:
+        """Tüm hücrelerin toplamları (yılı bilinmeyen hücreler dahil)"""
+        return {name: self.cells[name].sum() for name in self.MEASURES}
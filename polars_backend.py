@@ -0,0 +1,180 @@
+"""
+Polars İşleme Motoru
+Birleştirme ve term toplamlarını Polars ile (tembel ve çok iş parçacıklı) hesaplar.
+
+Polars'a sadece anahtar ve ölçü sütunları aktarılır; birleştirilmiş verinin sütunları
+satır numaralarıyla pandas tablolarından toplanır. Böylece sonuç, pandas merge ile
+aynı sütun adlarına, sırasına ve veri tiplerine sahip bir pandas DataFrame'dir.
+"""
+
+import re
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Polars import (opsiyonel - yüklü değilse pandas motoru kullanılır)
+try:
+    import polars as pl  # type: ignore
+    POLARS_AVAILABLE = True
+except ImportError:
+    POLARS_AVAILABLE = False
+
+# join(nulls_equal=..., maintain_order=...) için gereken en düşük sürüm (requirements-optional.txt)
+POLARS_MIN_VERSION: Tuple[int, int, int] = (1, 24, 0)
+
+
+def _parse_version(version: str) -> Tuple[int, ...]:
+    """'1.24.0' / '2.0.0b1' gibi sürüm metninin sayısal kısmı."""
+    return tuple(int(part) for part in re.findall(r"\d+", version)[:3])
+
+
+POLARS_VERSION: Tuple[int, ...] = _parse_version(pl.__version__) if POLARS_AVAILABLE else ()
+# Yüklü ve yeterince yeni mi? Değilse işleyici pandas motoruna düşer
+POLARS_SUPPORTED = POLARS_AVAILABLE and POLARS_VERSION >= POLARS_MIN_VERSION
+
+
+def _key(series: pd.Series) -> "pl.Series":
+    """Birleştirme anahtarını ortak tipe (Int64) çevir; tablolarda küçültülmüş tipler farklı olabilir."""
+    return pl.from_pandas(series, nan_to_null=True).cast(pl.Int64)
+
+
+def _measure(series: pd.Series) -> "pl.Series":
+    """Ölçü sütununu Float64'e çevir (NaN -> null, pandas toplamı gibi atlanır)."""
+    return pl.from_pandas(series.astype('float64'), nan_to_null=True)
+
+
+def _term_total_exprs(term: str) -> List["pl.Expr"]:
+    """Term bazında toplam tüketim ve faturalanabilir fee maliyeti ifadeleri."""
+    return [
+        pl.col('_consumption').sum().over(term).alias('total_consumption'),
+        pl.when(pl.col('_billable')).then(pl.col('_amount')).sum().over(term).alias('term_total_cost'),
+    ]
+
+
+def _totals(frame: "pl.DataFrame") -> Dict[str, np.ndarray]:
+    """Toplam sütunlarını float64 NumPy dizileri olarak döndür."""
+    return {
+        name: frame[name].to_numpy().astype('float64', copy=False)
+        for name in ('total_consumption', 'term_total_cost')
+    }
+
+
+def _take(df: pd.DataFrame, rows: np.ndarray, allow_fill: bool) -> Dict[str, object]:
+    """
+    DataFrame'in satırlarını sütun sütun topla (-1 = eşleşme yok, eksik değer).
+    Eksik değerli tam sayı sütunları pandas merge'deki gibi float64 olur.
+    """
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        values = series.array if isinstance(series.dtype, pd.api.extensions.ExtensionDtype) else series.to_numpy()
+        columns[col] = pd.api.extensions.take(values, rows, allow_fill=allow_fill)
+    return columns
+
+
+def _add_columns(merged: Dict[str, object], right: Dict[str, object], suffix: str):
+    """Sağ tablonun sütunlarını ekle; çakışan adlar pandas merge gibi suffix alır."""
+    for col, values in right.items():
+        merged[f"{col}{suffix}" if col in merged else col] = values
+
+
+def merge_tables(
+    df_accruals: pd.DataFrame,
+    df_terms: pd.DataFrame,
+    df_fees: pd.DataFrame,
+    df_consumptions: pd.DataFrame,
+    billable: pd.Series
+) -> Tuple[pd.DataFrame, Dict[str, np.ndarray]]:
+    """
+    Dört tabloyu birleştir ve term toplamlarını hesapla (tek bir tembel Polars planı).
+    Sonuç data_processor.join_tables ile aynıdır (satır sırası dahil).
+
+    Args:
+        df_accruals: Accruals tablosu
+        df_terms: Terms tablosu
+        df_fees: Fees tablosu
+        df_consumptions: Consumptions tablosu
+        billable: Fees tablosu için faturalanabilir fee maskesi (billable_fee_mask)
+
+    Returns:
+        (Birleştirilmiş ham DataFrame, {'total_consumption', 'term_total_cost'} dizileri)
+
+    Raises:
+        ValueError: Polars yoksa ya da POLARS_MIN_VERSION'dan eskiyse
+    """
+    if not POLARS_SUPPORTED:
+        raise ValueError(
+            f"Polars motoru icin polars>={'.'.join(map(str, POLARS_MIN_VERSION))} gerekli "
+            f"(yuklu: {pl.__version__ if POLARS_AVAILABLE else 'yok'})"
+        )
+
+    accruals = pl.LazyFrame({
+        '_a': np.arange(len(df_accruals), dtype=np.int64),
+        '_a_id': _key(df_accruals['id']),
+    })
+    terms = pl.LazyFrame({
+        '_t': np.arange(len(df_terms), dtype=np.int64),
+        '_t_accrual_id': _key(df_terms['accrual_id']),
+        '_t_id': _key(df_terms['id']),
+    })
+    fees = pl.LazyFrame({
+        '_f': np.arange(len(df_fees), dtype=np.int64),
+        '_f_term_id': _key(df_fees['accrual_term_id']),
+        '_f_id': _key(df_fees['id']),
+        '_consumption': _measure(df_fees['consumption']),
+        '_amount': _measure(df_fees['amount']),
+        '_billable': billable.to_numpy(dtype=bool),
+    })
+    if 'accrual_fee_id' in df_consumptions.columns:
+        fee_ids = _key(df_consumptions['accrual_fee_id'])
+    else:
+        fee_ids = pl.Series(dtype=pl.Int64)
+    consumptions = pl.LazyFrame({
+        '_c': np.arange(len(fee_ids), dtype=np.int64),
+        '_c_fee_id': fee_ids,
+    })
+
+    # pandas merge (sort=False) sırası: sol satır sırası, eşleşmelerde sağ satır sırası
+    join = {'nulls_equal': True, 'maintain_order': 'left_right'}
+    plan = (
+        accruals
+        .join(terms, left_on='_a_id', right_on='_t_accrual_id', how='inner', **join)
+        .join(fees, left_on='_t_id', right_on='_f_term_id', how='inner', coalesce=False, **join)
+        .join(consumptions, left_on='_f_id', right_on='_c_fee_id', how='left', **join)
+        .with_columns(_term_total_exprs('_f_term_id'))
+        .select(['_a', '_t', '_f', '_c', 'total_consumption', 'term_total_cost'])
+    )
+    result = plan.collect()
+
+    merged: Dict[str, object] = {}
+    _add_columns(merged, _take(df_accruals, result['_a'].to_numpy(), False), '')
+    _add_columns(merged, _take(df_terms, result['_t'].to_numpy(), False), '_term')
+    _add_columns(merged, _take(df_fees, result['_f'].to_numpy(), False), '_fee')
+    _add_columns(
+        merged,
+        _take(df_consumptions, result['_c'].fill_null(-1).to_numpy(), True),
+        '_consumption'
+    )
+
+    return pd.DataFrame(merged), _totals(result)
+
+
+def term_totals(df_merged: pd.DataFrame, billable: pd.Series) -> Dict[str, np.ndarray]:
+    """
+    Birleştirilmiş veride term bazında toplam tüketim ve maliyeti hesapla
+
+    Args:
+        df_merged: Birleştirilmiş veri (accrual_term_id, consumption, amount)
+        billable: Satır bazında faturalanabilir fee maskesi (billable_fee_mask)
+
+    Returns:
+        {'total_consumption', 'term_total_cost'} dizileri (satır sırasıyla)
+    """
+    frame = pl.LazyFrame({
+        '_term': _key(df_merged['accrual_term_id']),
+        '_consumption': _measure(df_merged['consumption']),
+        '_amount': _measure(df_merged['amount']),
+        '_billable': billable.to_numpy(dtype=bool),
+    })
+    return _totals(frame.select(_term_total_exprs('_term')).collect())
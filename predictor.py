@@ -12,7 +12,8 @@ from sklearn.metrics import mean_absolute_error, r2_score, mean_absolute_percent
 from sklearn.preprocessing import StandardScaler
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
-from typing import Dict
+from typing import Dict, Optional
+from monthly_cube import MonthlyCube
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -98,24 +99,21 @@ class EnergyPredictor:
 
         visualizer.py ile aynı mantığı kullan:
         - Tüketim: Direkt sum()
-        - Maliyet: Unique term bazında sum() (tekrarları önle)
+        - Maliyet: Direkt sum() (term tablosunda tekrar yok)
 
         Args:
-            df: Ham veri (merged DataFrame)
+            df: Term tablosu (her term için tek satır)
 
         Returns:
             Ortalama birim fiyat (TL/kWh)
         """
         try:
-            # ÖNEMLİ: Her iki hesaplama da UNIQUE term bazında yapılmalı
-            df_unique = df.drop_duplicates(subset=['accrual_term_id'])
-
-            # Tüketim: Unique term bazında
-            total_consumption = df_unique['total_consumption'].sum()
+            # Term tablosunda her term tek satır, toplamlar doğrudan alınır
+            total_consumption = df['total_consumption'].sum()
 
-            # Maliyet: Unique term bazında
-            cost_column = 'term_total_cost' if 'term_total_cost' in df_unique.columns else 'amount'
-            total_cost = df_unique[cost_column].sum()
+            # Maliyet: term toplam maliyeti (yoksa amount)
+            cost_column = 'term_total_cost' if 'term_total_cost' in df.columns else 'amount'
+            total_cost = df[cost_column].sum()
 
             # Birim fiyat hesapla
             if total_consumption > 0:
@@ -337,25 +335,31 @@ class EnergyPredictor:
             'best_model_name': best_model_name
         }
 
-    def train_models(self, df: pd.DataFrame) -> Dict:
+    def train_models(
+        self,
+        df: pd.DataFrame,
+        df_terms: pd.DataFrame,
+        cube: Optional[MonthlyCube] = None
+    ) -> Dict:
         """
         Tüketim ve maliyet tahmin modellerini eğit
 
         Args:
-            df: Eğitim verisi
+            df: Eğitim verisi (merged DataFrame, kategori dağılımı için)
+            df_terms: Term tablosu (her term için tek satır, bkz. build_term_table)
+            cube: Aylık küp (verilirse yıl-ay toplamları term tablosu yerine küpten alınır)
 
         Returns:
             Model performans metrikleri
         """
         print("[ML] Machine Learning modelleri egitiliyor...")
 
-        # ÖNEMLİ: Ortalama birim fiyat hesaplama için RAW veriyi sakla
+        # ÖNEMLİ: Kategori dağılımı için RAW veriyi sakla
         raw_df = df.copy()
 
-        # Duplikatları temizle - Her term bir kez
-        if 'accrual_term_id' in df.columns:
-            df = df.drop_duplicates(subset=['accrual_term_id'])
-            print(f"  [INFO] Unique term sayisi: {len(df)}")
+        # Her term bir kez: yıl-ay toplamları term tablosundan hesaplanır
+        df = df_terms
+        print(f"  [INFO] Unique term sayisi: {len(df)}")
 
         # Özellikleri hazırla
         df = self.prepare_features(df)
@@ -364,17 +368,23 @@ class EnergyPredictor:
         # Her ay için toplam tüketim ve maliyet hesapla
         print(f"  [INFO] Yil-ay bazinda aggregate ediliyor...")
 
-        # Doğru maliyet kolonunu belirle (term_total_cost veya amount)
-        cost_column = 'term_total_cost' if 'term_total_cost' in df.columns else 'amount'
+        if cube is not None:
+            # Küpün yıl-ay toplamları term tablosundaki toplamlarla aynıdır
+            monthly_agg = cube.by_month()[['year', 'month', 'consumption', 'cost']].rename(
+                columns={'consumption': 'total_consumption', 'cost': 'grand_total'}
+            )
+        else:
+            # Doğru maliyet kolonunu belirle (term_total_cost veya amount)
+            cost_column = 'term_total_cost' if 'term_total_cost' in df.columns else 'amount'
 
-        monthly_agg = df.groupby(['year', 'month']).agg({
-            'total_consumption': 'sum',
-            cost_column: 'sum'
-        }).reset_index()
+            monthly_agg = df.groupby(['year', 'month']).agg({
+                'total_consumption': 'sum',
+                cost_column: 'sum'
+            }).reset_index()
 
-        # Kolon ismini standartlaştır (ileride kullanım için)
-        if cost_column == 'term_total_cost':
-            monthly_agg = monthly_agg.rename(columns={'term_total_cost': 'grand_total'})
+            # Kolon ismini standartlaştır (ileride kullanım için)
+            if cost_column == 'term_total_cost':
+                monthly_agg = monthly_agg.rename(columns={'term_total_cost': 'grand_total'})
 
         # OUTLIER TEMİZLİĞİ: IQR metodu ile SADECE AŞIRI UÇ DEĞERLERİ temizle
         # 5.0 katsayı = Çok yumuşak filtreleme, sadece gerçekten aşırı olanları atar
@@ -471,8 +481,10 @@ class EnergyPredictor:
         print(f"    - R2 Score: {r2_consumption:.3f}")
 
         # Ortalama birim fiyatı hesapla (DOĞRU YÖNTEM - visualizer.py ile aynı)
-        # ÖNEMLİ: raw_df kullan (aggregated değil!)
-        self.avg_unit_price = self._calculate_avg_unit_price(raw_df)
+        # ÖNEMLİ: term tablosunu kullan (aggregated değil!)
+        self.avg_unit_price = self._calculate_avg_unit_price(
+            df_terms if df_terms is not None else raw_df
+        )
         print(f"  [OK] Ortalama birim fiyat hesaplandi:")
         print(f"    - {self.avg_unit_price:.2f} TL/kWh")
 
@@ -0,0 +1,578 @@
+"""
+Yerel Snapshot Modülü
+İşlenmiş verileri sütunsal formatta (Parquet/Feather) diske yazar ve
+kaynak tablolar değişmediği sürece yeniden kullanır.
+"""
+
+import json
+import os
+import shutil
+import time
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from config import Config
+
+# PyArrow import (opsiyonel - yüklü değilse snapshot devre dışı kalır)
+try:
+    import pyarrow  # type: ignore  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+    print("[UYARI] PyArrow yüklü değil. 'pip install pyarrow' ile yükleyebilirsiniz.")
+
+
+class SnapshotStore:
+    """
+    Sürümlü yerel snapshot deposu.
+
+    Her kayıt ayrı bir alt klasöre yazılır; CURRENT dosyası en son tamamlanan
+    sürümü gösterir ve atomik olarak değiştirilir. Böylece okuyucular hiçbir
+    zaman yarım yazılmış bir snapshot görmez.
+    """
+
+    META_FILE = "meta.json"
+    CURRENT_FILE = "CURRENT"
+
+    def __init__(self, directory: Optional[Path] = None, file_format: Optional[str] = None):
+        """
+        Snapshot deposunu başlat
+
+        Args:
+            directory: Snapshot klasörü (varsayılan: Config.SNAPSHOT_DIR)
+            file_format: 'parquet' veya 'feather' (varsayılan: Config.SNAPSHOT_FORMAT)
+        """
+        self.directory = Path(directory or Config.SNAPSHOT_DIR)
+        self.file_format = (file_format or Config.SNAPSHOT_FORMAT).lower()
+
+    @property
+    def available(self) -> bool:
+        """Snapshot için gerekli kütüphaneler yüklü mü?"""
+        return PYARROW_AVAILABLE
+
+    def _current_version_dir(self) -> Optional[Path]:
+        """CURRENT dosyasının gösterdiği sürüm klasörü (yoksa None)."""
+        current_file = self.directory / self.CURRENT_FILE
+        if not current_file.exists():
+            return None
+
+        version_dir = self.directory / current_file.read_text(encoding='utf-8').strip()
+        return version_dir if version_dir.is_dir() else None
+
+    def read_meta(self) -> Optional[Dict[str, Any]]:
+        """
+        Güncel snapshot'ın meta bilgisini oku
+
+        Returns:
+            Meta bilgisi (fingerprint, tablolar, ek bilgiler) veya None
+        """
+        version_dir = self._current_version_dir()
+        if version_dir is None:
+            return None
+
+        try:
+            with open(version_dir / self.META_FILE, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(
+        self,
+        frames: Dict[str, pd.DataFrame],
+        fingerprint: Dict[str, Any],
+        extra: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """
+        DataFrame'leri yeni bir snapshot sürümü olarak kaydet
+
+        Args:
+            frames: İsim -> DataFrame
+            fingerprint: Kaynak tabloların parmak izi
+            extra: Meta bilgisine eklenecek JSON uyumlu ek bilgiler
+
+        Returns:
+            bool: Kayıt başarılıysa True
+        """
+        if not self.available:
+            return False
+
+        version = f"v{time.time_ns()}"
+        version_dir = self.directory / version
+
+        try:
+            version_dir.mkdir(parents=True, exist_ok=False)
+
+            for name, df in frames.items():
+                path = version_dir / f"{name}.{self.file_format}"
+                if self.file_format == 'feather':
+                    df.reset_index(drop=True).to_feather(path)
+                else:
+                    df.to_parquet(path, index=False)
+
+            meta = {
+                'version': version,
+                'created_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'format': self.file_format,
+                'fingerprint': fingerprint,
+                'frames': list(frames),
+                'extra': extra or {},
+            }
+            with open(version_dir / self.META_FILE, 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False, default=str)
+
+            # CURRENT dosyasını atomik olarak değiştir
+            tmp_current = self.directory / f".{self.CURRENT_FILE}.{version}"
+            tmp_current.write_text(version, encoding='utf-8')
+            os.replace(tmp_current, self.directory / self.CURRENT_FILE)
+
+            self._remove_old_versions()
+            return True
+
+        except Exception as e:
+            print(f"[HATA] Snapshot kaydedilemedi: {e}")
+            shutil.rmtree(version_dir, ignore_errors=True)
+            return False
+
+    def load(
+        self,
+        fingerprint: Dict[str, Any]
+    ) -> Optional[Tuple[Dict[str, pd.DataFrame], Dict[str, Any]]]:
+        """
+        Parmak izi eşleşiyorsa güncel snapshot'ı yükle
+
+        Args:
+            fingerprint: Kaynak tabloların güncel parmak izi
+
+        Returns:
+            (İsim -> DataFrame, meta bilgisi) veya None (snapshot yok/eski/okunamıyor)
+        """
+        opened = self.open(fingerprint)
+        if opened is None:
+            return None
+
+        loaders, meta = opened
+        try:
+            return {name: load() for name, load in loaders.items()}, meta
+
+        except Exception as e:
+            print(f"[HATA] Snapshot okunamadi: {e}")
+            return None
+
+    def open(
+        self,
+        fingerprint: Dict[str, Any]
+    ) -> Optional[Tuple[Dict[str, Callable[[], pd.DataFrame]], Dict[str, Any]]]:
+        """
+        Parmak izi eşleşiyorsa güncel snapshot'ın çerçevelerini okuyan fonksiyonları döndür.
+        Dosyalar fonksiyon çağrılınca okunur; sadece ihtiyaç duyulan çerçeveler diske erişir.
+
+        Args:
+            fingerprint: Kaynak tabloların güncel parmak izi
+
+        Returns:
+            (İsim -> okuma fonksiyonu, meta bilgisi) veya None (snapshot yok/eski)
+        """
+        if not self.available:
+            return None
+
+        meta = self.read_meta()
+        if meta is None or meta.get('fingerprint') != fingerprint:
+            return None
+
+        version_dir = self.directory / meta['version']
+        loaders = {
+            name: partial(self._read_frame, version_dir / f"{name}.{meta['format']}", meta['format'])
+            for name in meta['frames']
+        }
+        return loaders, meta
+
+    @staticmethod
+    def _read_frame(path: Path, file_format: str) -> pd.DataFrame:
+        """Tek bir snapshot çerçevesini oku."""
+        if file_format == 'feather':
+            return pd.read_feather(path)
+        return pd.read_parquet(path)
+
+    def _remove_old_versions(self, keep: int = 2):
+        """
+        En yeni `keep` sürüm dışındaki snapshot klasörlerini sil.
+        Bir önceki sürüm, onu okumakta olan süreçler için korunur.
+
+        Args:
+            keep: Korunacak sürüm sayısı
+        """
+        versions = sorted(
+            (path for path in self.directory.iterdir() if path.is_dir() and path.name.startswith('v')),
+            key=lambda path: path.name
+        )
+        for path in versions[:-keep]:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+class SharedDataset:
+    """
+    Süreçler arasında paylaşılan, memory-map ile açılan Arrow IPC veri dosyası.
+
+    Yayınlayan süreç dosyayı geçici bir isimle yazar ve os.replace ile atomik
+    olarak yerine koyar; okuyucular dosyayı kopyalamadan (zero-copy) açar.
+    Eski dosyayı açmış okuyucular, kapatana kadar eski sürümü görmeye devam eder.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Paylaşılan veri dosyasını başlat
+
+        Args:
+            path: Arrow IPC dosya yolu (varsayılan: Config.SHARED_DATASET_PATH)
+        """
+        self.path = Path(path or Config.SHARED_DATASET_PATH)
+
+    @property
+    def available(self) -> bool:
+        """Paylaşılan veri için gerekli kütüphaneler yüklü mü?"""
+        return PYARROW_AVAILABLE
+
+    def version(self) -> Optional[Tuple[int, int, int]]:
+        """
+        Yayınlanmış dosyanın sürüm anahtarı (inode, mtime, boyut)
+
+        Returns:
+            Sürüm anahtarı veya None (henüz yayınlanmamış)
+        """
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    FINGERPRINT_KEY = b'enerji_analiz.fingerprint'
+
+    def publish(self, df: pd.DataFrame, fingerprint: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        DataFrame'i Arrow IPC dosyası olarak yayınla (atomik değiştirme)
+
+        Args:
+            df: Yayınlanacak veri
+            fingerprint: Verinin yüklendiği andaki kaynak parmak izi (şema meta bilgisine yazılır)
+
+        Returns:
+            bool: Yayınlama başarılıysa True
+        """
+        if not self.available:
+            return False
+
+        import pyarrow as pa  # type: ignore
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.{time.time_ns()}")
+
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+
+            # NaN değerleri null yerine NaN olarak saklanır; null bitmap'i olan
+            # ondalık sütunlar okunurken NaN ile doldurulmak için kopyalanır
+            for i, name in enumerate(table.column_names):
+                if pa.types.is_floating(table.schema.field(i).type) and table.column(i).null_count:
+                    table = table.set_column(
+                        i, table.schema.field(i), pa.array(df[name].to_numpy(), from_pandas=False)
+                    )
+
+            if fingerprint is not None:
+                table = table.replace_schema_metadata({
+                    **(table.schema.metadata or {}),
+                    self.FINGERPRINT_KEY: json.dumps(fingerprint, default=str).encode('utf-8'),
+                })
+
+            # Sıkıştırma kullanılmaz; sıkıştırılmış buffer'lar okurken kopyalanmak zorunda kalır
+            with pa.OSFile(str(tmp_path), 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+
+            with open(tmp_path, 'rb') as f:
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            return True
+
+        except Exception as e:
+            print(f"[HATA] Paylasilan veri yayinlanamadi: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return False
+
+    def read_fingerprint(self) -> Optional[Dict[str, Any]]:
+        """
+        Yayınlanmış dosyanın kaynak parmak izini oku (sadece şema okunur)
+
+        Returns:
+            Parmak izi veya None (dosya yok/parmak izi yok)
+        """
+        if not self.available or not self.path.exists():
+            return None
+
+        import pyarrow as pa  # type: ignore
+
+        try:
+            with pa.memory_map(str(self.path), 'r') as source:
+                metadata = pa.ipc.open_file(source).schema.metadata or {}
+            raw = metadata.get(self.FINGERPRINT_KEY)
+            # JSON gidiş-dönüşü, karşılaştırılan parmak iziyle aynı tipleri verir
+            return json.loads(raw) if raw else None
+        except Exception:
+            return None
+
+    def read(self) -> Optional[pd.DataFrame]:
+        """
+        Yayınlanmış veriyi memory-map ile kopyalamadan aç.
+
+        Sayısal ve tarih sütunları dosyadaki buffer'ları doğrudan kullanır (salt okunur),
+        metin sütunları Arrow destekli string tipinde açılır. Bellekteki sayfalar işletim
+        sisteminin sayfa önbelleğinden gelir ve tüm süreçler arasında paylaşılır.
+
+        Returns:
+            DataFrame veya None (dosya yok/okunamıyor)
+        """
+        if not self.available or not self.path.exists():
+            return None
+
+        import pyarrow as pa  # type: ignore
+
+        try:
+            source = pa.memory_map(str(self.path), 'r')
+            table = pa.ipc.open_file(source).read_all()
+
+            string_dtype = pd.StringDtype('pyarrow')
+            return table.to_pandas(
+                split_blocks=True,
+                types_mapper={pa.string(): string_dtype, pa.large_string(): string_dtype}.get
+            )
+
+        except Exception as e:
+            print(f"[HATA] Paylasilan veri okunamadi: {e}")
+            return None
+
+
+class FeeDetailStore:
+    """
+    Fee seviyesi birleştirilmiş verinin diskteki kopyası (out-of-core mod).
+
+    Veri parça parça Parquet dosyaları olarak yeni bir sürüm klasörüne yazılır;
+    commit() ile CURRENT dosyası atomik olarak yeni sürümü gösterir. Okuma,
+    istenen sütunlar ve filtrelerle yapılır; verinin tamamı belleğe alınmaz.
+    """
+
+    CURRENT_FILE = "CURRENT"
+    SCHEMA_FILE = "_common_metadata"
+
+    def __init__(self, directory: Optional[Path] = None):
+        """
+        Fee detay deposunu başlat
+
+        Args:
+            directory: Depo klasörü (varsayılan: Config.FEE_DETAIL_DIR)
+        """
+        self.directory = Path(directory or Config.FEE_DETAIL_DIR)
+        self._writing: Optional[Path] = None
+        self._schemas: List[Any] = []
+
+    @property
+    def available(self) -> bool:
+        """Fee detay deposu için gerekli kütüphaneler yüklü mü?"""
+        return PYARROW_AVAILABLE
+
+    def version(self) -> Optional[str]:
+        """
+        Güncel sürümün adı
+
+        Returns:
+            Sürüm adı veya None (henüz yazılmamış)
+        """
+        current_file = self.directory / self.CURRENT_FILE
+        if not current_file.exists():
+            return None
+
+        version = current_file.read_text(encoding='utf-8').strip()
+        return version if (self.directory / version).is_dir() else None
+
+    def begin(self):
+        """Yeni bir sürüm yazmaya başla (yarım kalan yazım varsa silinir)."""
+        self.abort()
+        self._writing = self.directory / f"v{time.time_ns()}"
+        self._writing.mkdir(parents=True, exist_ok=False)
+        self._schemas = []
+
+    def append(self, df: pd.DataFrame):
+        """
+        Bir parçayı yazılmakta olan sürüme ekle.
+        category sütunları değer tiplerine çevrilir; parçaların sütun tipleri
+        farklı olabilir (commit'te ortak şemaya genişletilir).
+
+        Args:
+            df: Birleştirilmiş veri parçası
+        """
+        import pyarrow as pa  # type: ignore
+        import pyarrow.parquet as pq  # type: ignore
+
+        if self._writing is None:
+            raise RuntimeError("Fee detay yazimi baslatilmadi (begin)")
+
+        columns = {
+            col: df[col].astype(df[col].cat.categories.dtype) if isinstance(df[col].dtype, pd.CategoricalDtype)
+            else df[col]
+            for col in df.columns
+        }
+        table = pa.Table.from_pandas(pd.DataFrame(columns), preserve_index=False)
+        table = table.replace_schema_metadata(None)
+
+        pq.write_table(table, self._writing / f"part-{len(self._schemas):05d}.parquet")
+        self._schemas.append(table.schema)
+
+    def commit(self) -> Optional[str]:
+        """
+        Yazılan sürümü güncel sürüm yap
+
+        Returns:
+            Sürüm adı veya None (yazım başlatılmamış)
+        """
+        import pyarrow as pa  # type: ignore
+        import pyarrow.parquet as pq  # type: ignore
+
+        if self._writing is None:
+            return None
+
+        # Parçalarda farklı küçültülmüş tipler ortak (geniş) tipe yükseltilir
+        schema = pa.unify_schemas(self._schemas, promote_options='permissive') if self._schemas else pa.schema([])
+        pq.write_metadata(schema, self._writing / self.SCHEMA_FILE)
+
+        version = self._writing.name
+        tmp_current = self.directory / f".{self.CURRENT_FILE}.{version}"
+        tmp_current.write_text(version, encoding='utf-8')
+        os.replace(tmp_current, self.directory / self.CURRENT_FILE)
+
+        self._writing = None
+        self._remove_old_versions()
+        return version
+
+    def abort(self):
+        """Yazılmakta olan sürümü sil."""
+        if self._writing is not None:
+            shutil.rmtree(self._writing, ignore_errors=True)
+            self._writing = None
+
+    def read(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        where: Optional[Dict[str, Sequence[Any]]] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Güncel sürümden istenen sütunları ve satırları oku
+
+        Args:
+            columns: Okunacak sütunlar (varsayılan: tümü; olmayanlar atlanır)
+            where: Sütun -> izin verilen değerler (ör. {'year': [2024, 2025]})
+
+        Returns:
+            DataFrame veya None (sürüm yok/okunamıyor)
+        """
+        try:
+            scan = self._scan(columns, where)
+            if scan is None:
+                return None
+            dataset, columns, condition = scan
+            return dataset.to_table(columns=columns, filter=condition).to_pandas()
+
+        except Exception as e:
+            print(f"[HATA] Fee detay verisi okunamadi: {e}")
+            return None
+
+    def iter_batches(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        where: Optional[Dict[str, Sequence[Any]]] = None,
+        date_range: Optional[Tuple[str, Any, Any]] = None,
+        batch_rows: int = 100_000
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Güncel sürümü parça parça oku (dışa aktarma gibi verinin tamamını gezen işler için).
+        Bellekte aynı anda sadece bir parça bulunur.
+
+        Args:
+            columns: Okunacak sütunlar (varsayılan: tümü; olmayanlar atlanır)
+            where: Sütun -> izin verilen değerler
+            date_range: (sütun, başlangıç, bitiş) - başlangıç <= sütun < bitiş (uçlar None olabilir)
+            batch_rows: Parça başına en fazla kayıt sayısı
+
+        Yields:
+            DataFrame parçaları (sürüm yoksa hiç parça üretilmez)
+        """
+        scan = self._scan(columns, where, date_range)
+        if scan is None:
+            return
+        dataset, columns, condition = scan
+        for batch in dataset.to_batches(columns=columns, filter=condition, batch_size=batch_rows):
+            if batch.num_rows:
+                yield batch.to_pandas()
+
+    def schema(self, columns: Optional[Sequence[str]] = None):
+        """
+        Güncel sürümün (istenen sütunlara indirgenmiş) Arrow şeması
+
+        Args:
+            columns: Sütunlar (varsayılan: tümü; olmayanlar atlanır)
+
+        Returns:
+            pyarrow.Schema veya None (sürüm yok)
+        """
+        scan = self._scan(columns)
+        if scan is None:
+            return None
+        dataset, columns, _ = scan
+        schema = dataset.schema
+        return schema if columns is None else pyarrow.schema([schema.field(col) for col in columns])
+
+    def _scan(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        where: Optional[Dict[str, Sequence[Any]]] = None,
+        date_range: Optional[Tuple[str, Any, Any]] = None
+    ):
+        """
+        Güncel sürümün dataset'ini, mevcut sütunlara indirgenmiş sütun listesini ve
+        filtre ifadesini hazırla (sürüm yoksa None).
+        """
+        version = self.version() if self.available else None
+        if version is None:
+            return None
+
+        import pyarrow.dataset as ds  # type: ignore
+        import pyarrow.parquet as pq  # type: ignore
+
+        version_dir = self.directory / version
+        schema = pq.read_schema(version_dir / self.SCHEMA_FILE)
+        dataset = ds.dataset(version_dir, schema=schema, format='parquet')
+
+        if columns is not None:
+            columns = [col for col in columns if col in schema.names]
+
+        expressions = [ds.field(col).isin(list(values)) for col, values in (where or {}).items()]
+        if date_range is not None:
+            col, start, end = date_range
+            if start is not None:
+                expressions.append(ds.field(col) >= pd.Timestamp(start))
+            if end is not None:
+                expressions.append(ds.field(col) < pd.Timestamp(end))
+
+        condition = None
+        for expression in expressions:
+            condition = expression if condition is None else condition & expression
+        return dataset, columns, condition
+
+    def _remove_old_versions(self, keep: int = 2):
+        """En yeni `keep` sürüm dışındaki klasörleri sil (bkz. SnapshotStore._remove_old_versions)."""
+        versions = sorted(
+            (path for path in self.directory.iterdir() if path.is_dir() and path.name.startswith('v')),
+            key=lambda path: path.name
+        )
+        for path in versions[:-keep]:
+            shutil.rmtree(path, ignore_errors=True)
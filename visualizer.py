@@ -7,7 +7,8 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
-from typing import Dict
+from typing import Dict, Optional
+from monthly_cube import MonthlyCube
 
 
 class EnergyVisualizer:
@@ -27,25 +28,19 @@ class EnergyVisualizer:
             'info': '#17a2b8'
         }
     
-    def plot_consumption_trend(self, df: pd.DataFrame) -> go.Figure:
+    def plot_consumption_trend(self, cube: MonthlyCube) -> go.Figure:
         """
         Aylık tüketim trend grafiği oluştur
 
         Args:
-            df: Tüketim verilerini içeren DataFrame
+            cube: Aylık küp (EnergyDataProcessor.get_monthly_cube())
 
         Returns:
             Plotly Figure objesi
         """
-        # Aylık bazda gruplama - accrual_term_id bazında unique toplam
-        df_unique = df.drop_duplicates(subset=['accrual_term_id'])
-
-        # NaN ve null değerleri temizle
-        df_unique = df_unique[df_unique['total_consumption'].notna()]
-        df_unique = df_unique[df_unique['year'].notna()]
-        df_unique = df_unique[df_unique['month'].notna()]
-
-        monthly = df_unique.groupby(['year', 'month'])['total_consumption'].sum().reset_index()
+        # Aylık toplamlar küpten gelir (yılı/ayı bilinmeyen term'ler hariç)
+        monthly = cube.by_month()[['year', 'month', 'consumption']]
+        monthly = monthly.rename(columns={'consumption': 'total_consumption'})
 
         # Negatif ve sıfır değerleri filtrele
         monthly = monthly[monthly['total_consumption'] > 0]
@@ -124,49 +119,19 @@ class EnergyVisualizer:
 
         return fig
     
-    def plot_cost_analysis(self, df: pd.DataFrame) -> go.Figure:
+    def plot_cost_analysis(self, cube: MonthlyCube) -> go.Figure:
         """
         Maliyet analizi grafiği oluştur
 
         Args:
-            df: Maliyet verilerini içeren DataFrame
+            cube: Aylık küp (EnergyDataProcessor.get_monthly_cube())
 
         Returns:
             Plotly Figure objesi
         """
-        # Aylık bazda gruplama - accrual_term_id bazında unique toplam
-        df_unique = df.drop_duplicates(subset=['accrual_term_id'])
-
-        # NaN değerleri temizle
-        df_unique = df_unique[df_unique['year'].notna()]
-        df_unique = df_unique[df_unique['month'].notna()]
-
-        # term_total_cost varsa onu kullan
-        cost_column = 'term_total_cost' if 'term_total_cost' in df_unique.columns else 'amount'
-
-        # Gerekli sütunların varlığını kontrol et
-        if cost_column not in df_unique.columns:
-            # Boş grafik döndür
-            fig = go.Figure()
-            fig.add_annotation(
-                text=f"Gerekli sütun bulunamadı: {cost_column}",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False,
-                font=dict(size=16, color="red")
-            )
-            fig.update_layout(
-                title='Aylık Maliyet Analizi',
-                template='plotly_white',
-                height=500
-            )
-            return fig
-
-        monthly = df_unique.groupby(['year', 'month']).agg({
-            cost_column: 'sum'
-        }).reset_index()
-
-        # Sütun isimlerini standardize et
-        monthly.rename(columns={cost_column: 'total_cost'}, inplace=True)
+        # Aylık maliyet toplamları küpten gelir (sadece tüketimi olan fee'ler, KDV'siz)
+        monthly = cube.by_month()[['year', 'month', 'cost']]
+        monthly = monthly.rename(columns={'cost': 'total_cost'})
 
         # Negatif değerleri 0'a çek
         monthly['total_cost'] = monthly['total_cost'].clip(lower=0)
@@ -233,52 +198,19 @@ class EnergyVisualizer:
 
         return fig
 
-    def plot_yearly_comparison(self, df: pd.DataFrame) -> go.Figure:
+    def plot_yearly_comparison(self, cube: MonthlyCube) -> go.Figure:
         """
         Yıllık karşılaştırma grafiği
 
         Args:
-            df: Yıllık verileri içeren DataFrame
+            cube: Aylık küp (EnergyDataProcessor.get_monthly_cube())
 
         Returns:
             Plotly Figure objesi
         """
-        # Yıllık toplam tüketim ve maliyet - unique term bazında
-        df_unique = df.drop_duplicates(subset=['accrual_term_id'])
-
-        # NaN değerleri temizle
-        df_unique = df_unique[df_unique['year'].notna()]
-
-        # term_total_cost varsa onu kullan, yoksa amount kullan
-        cost_column = 'term_total_cost' if 'term_total_cost' in df_unique.columns else 'amount'
-
-        # DEBUG: Hangi sütun kullanılıyor?
-        print(f"[GRAFIK DEBUG] Kullanilan maliyet sutunu: {cost_column}")
-        print(f"[GRAFIK DEBUG] Mevcut sutunlar: {df_unique.columns.tolist()}")
-
-        # Gerekli sütunları kontrol et
-        if 'total_consumption' not in df_unique.columns or cost_column not in df_unique.columns:
-            fig = go.Figure()
-            fig.add_annotation(
-                text="Gerekli veri sütunları bulunamadı",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False,
-                font=dict(size=16, color="red")
-            )
-            fig.update_layout(
-                title='Yıllık Tüketim ve Maliyet Karşılaştırması',
-                template='plotly_white',
-                height=500
-            )
-            return fig
-
-        yearly = df_unique.groupby('year').agg({
-            'total_consumption': 'sum',
-            cost_column: 'sum'
-        }).reset_index()
-
-        # Sütun isimlerini standardize et
-        yearly.rename(columns={cost_column: 'total_cost'}, inplace=True)
+        # Yıllık toplam tüketim ve maliyet - küpün yıl kırılımı
+        yearly = cube.by_year()[['year', 'consumption', 'cost']]
+        yearly = yearly.rename(columns={'consumption': 'total_consumption', 'cost': 'total_cost'})
 
         # Negatif değerleri temizle
         yearly['total_consumption'] = yearly['total_consumption'].clip(lower=0)
@@ -373,20 +305,19 @@ class EnergyVisualizer:
 
         return fig
     
-    def plot_monthly_heatmap(self, df: pd.DataFrame) -> go.Figure:
+    def plot_monthly_heatmap(self, cube: MonthlyCube) -> go.Figure:
         """
         Aylık tüketim ısı haritası
 
         Args:
-            df: Aylık verileri içeren DataFrame
+            cube: Aylık küp (EnergyDataProcessor.get_monthly_cube())
 
         Returns:
             Plotly Figure objesi
         """
-        # Unique term bazında pivot tablo oluştur (yıl x ay)
-        df_unique = df.drop_duplicates(subset=['accrual_term_id'])
-        pivot = df_unique.pivot_table(
-            values='total_consumption',
+        # Küpün yıl-ay toplamlarından pivot tablo oluştur (yıl x ay)
+        pivot = cube.by_month().pivot_table(
+            values='consumption',
             index='year',
             columns='month',
             aggfunc='sum',
@@ -545,7 +476,7 @@ class EnergyVisualizer:
         Mevsimsel analiz grafiği
 
         Args:
-            df: Mevsimsel verileri içeren DataFrame
+            df: Term tablosu (her term için tek satır, EnergyDataProcessor.get_term_table())
 
         Returns:
             Plotly Figure objesi
@@ -586,11 +517,8 @@ class EnergyVisualizer:
 
         df_seasonal['season'] = df_seasonal['month'].apply(get_season)
 
-        # Unique term bazında hesapla
-        df_unique = df_seasonal.drop_duplicates(subset=['accrual_term_id'])
-
-        # Mevsimsel istatistikler
-        seasonal = df_unique.groupby('season')['total_consumption'].agg(['mean', 'sum', 'count']).reset_index()
+        # Mevsimsel istatistikler (term bazında)
+        seasonal = df_seasonal.groupby('season')['total_consumption'].agg(['mean', 'sum', 'count']).reset_index()
         seasonal.columns = ['season', 'avg_consumption', 'total_consumption', 'count']
 
         # Mevsim sıralaması
@@ -655,48 +583,24 @@ class EnergyVisualizer:
 
         return fig
     
-    def create_summary_metrics(self, df: pd.DataFrame) -> Dict:
+    def create_summary_metrics(self, cube: MonthlyCube) -> Dict:
         """
         Özet metrikler oluştur
 
         Args:
-            df: Veri DataFrame'i
+            cube: Aylık küp (EnergyDataProcessor.get_monthly_cube())
 
         Returns:
             Metrikler dictionary'si
         """
-        # Unique term bazında hesaplama yap - GROUPBY ile doğru toplama
-        # Her accrual_term_id için toplam tüketim ve maliyeti hesapla
-        cost_column = 'term_total_cost' if 'term_total_cost' in df.columns else 'amount'
-
-        # ÖNEML İ: Her iki hesaplama da UNIQUE term bazında yapılmalı
-        # Çünkü total_consumption ve cost her term'in tüm satırlarında aynı değeri içeriyor
-        df_unique = df.drop_duplicates(subset=['accrual_term_id'])
-
-        # TÜKETİM: Unique term bazında
-        total_consumption = df_unique['total_consumption'].sum()
-
-        # MALİYET: Unique term bazında
-        total_cost = df_unique[cost_column].sum()
-
-        # Aylık hesaplama için unique term bazında çalış
-        df_grouped = df.groupby('accrual_term_id').agg({
-            'total_consumption': 'first',
-            cost_column: 'first',
-            'year': 'first',
-            'month': 'first'
-        }).reset_index()
-
-        df_unique = df_grouped  # Geriye dönük uyumluluk için
+        # Küp toplamları term bazındaki toplamlarla aynıdır (her term bir kez sayılır)
+        totals = cube.totals()
+        total_consumption = totals['consumption']
+        total_cost = totals['cost']
 
         # Aylık gruplamalar
-        monthly_data = df_unique.groupby(['year', 'month']).agg({
-            'total_consumption': 'sum',
-            cost_column: 'sum'
-        }).reset_index()
-
-        # Sütun isimlerini standardize et
-        monthly_data.rename(columns={cost_column: 'total_cost'}, inplace=True)
+        monthly_data = cube.by_month()[['year', 'month', 'consumption', 'cost']]
+        monthly_data = monthly_data.rename(columns={'consumption': 'total_consumption', 'cost': 'total_cost'})
 
         # Boş değerleri filtrele
         monthly_data_filtered = monthly_data[monthly_data['total_consumption'] > 0]
@@ -836,17 +740,43 @@ class EnergyVisualizer:
 
         return fig
 
-    def plot_tariff_categories_pie(self, df: pd.DataFrame) -> go.Figure:
+    def tariff_category_costs(self, df_terms: pd.DataFrame) -> pd.Series:
+        """
+        Tarife kategorilerine (fee code prefix'i) göre term maliyetleri.
+        Her term bir kez, ilk satırının kategorisinde sayılır.
+
+        Args:
+            df_terms: Term tablosu (her term için tek satır, tariff_category sütunuyla)
+
+        Returns:
+            Kategori -> toplam maliyet (tariff_category yoksa boş)
+        """
+        if 'tariff_category' not in df_terms.columns:
+            return pd.Series(dtype='float64')
+
+        # Kategorilere göre term maliyetlerini topla
+        return df_terms['term_total_cost'].groupby(df_terms['tariff_category'], observed=True).sum()
+
+    def plot_tariff_categories_pie(
+        self,
+        df_terms: Optional[pd.DataFrame] = None,
+        category_costs: Optional[pd.Series] = None
+    ) -> go.Figure:
         """
         Tarife kategorilerine göre maliyet dağılımı pasta grafiği
 
         Args:
-            df: Veri DataFrame'i
+            df_terms: Term tablosu (category_costs verilmediyse kullanılır)
+            category_costs: Önceden hesaplanmış kategori maliyetleri
+                (tariff_category_costs() veya SnapshotAnalytics.tariff_costs())
 
         Returns:
             Plotly Figure objesi
         """
-        if 'fee_code' not in df.columns:
+        if category_costs is None:
+            category_costs = self.tariff_category_costs(df_terms if df_terms is not None else pd.DataFrame())
+
+        if category_costs.empty:
             fig = go.Figure()
             fig.add_annotation(
                 text="Tarife kategorisi verisi bulunamadı",
@@ -855,19 +785,6 @@ class EnergyVisualizer:
             )
             return fig
 
-        # Fee code'dan kategori belirle
-        df_analysis = df.copy()
-        df_analysis['tariff_category'] = df_analysis['fee_code'].str.split('_').str[0]
-
-        # Unique term bazında maliyet hesapla (her term bir kez)
-        df_unique = df_analysis.drop_duplicates(subset=['accrual_term_id'])
-
-        # term_total_cost varsa onu kullan
-        cost_column = 'term_total_cost' if 'term_total_cost' in df_unique.columns else 'amount'
-
-        # Kategorilere göre maliyet topla
-        category_costs = df_unique.groupby('tariff_category')[cost_column].sum()
-
         # Ana kategoriler ve isimleri
         pie_data = []
         pie_labels = []